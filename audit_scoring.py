@@ -0,0 +1,311 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+from contrast_audit import ContrastPolicy, audit_contrast
+from token_naming import NamingChecker, NamingRules, TokenSchema
+
+# Design-token keys holding each schema category.
+CATEGORY_KEYS = {
+    "color": ("colors",),
+    "font": ("typography", "fonts"),
+    "spacing": ("spacing",),
+    "radius": ("radius", "radii", "borderRadius"),
+    "border": ("border", "borders", "borderWidth"),
+    "shadow": ("effects", "shadows"),
+    "opacity": ("opacity",),
+}
+
+# Name words that describe what a token is for rather than what it looks like.
+SEMANTIC_WORDS = frozenset(
+    "action background bg border brand content danger disabled divider error fg foreground info interactive "
+    "muted neutral primary secondary status stroke success surface tertiary text warning".split()
+)
+VISUAL_WORDS = frozenset(
+    "black blue cyan gray green grey indigo orange pink purple red teal violet white yellow".split()
+)
+INTERACTIVE_WORDS = frozenset({"action", "button", "btn", "cta", "link", "control", "input", "interactive"})
+# Key interaction states; "pressed" and "active" count as the same state.
+STATE_WORDS = {"hover": "hover", "active": "active", "pressed": "active", "focus": "focus", "disabled": "disabled"}
+KEY_STATES = ("hover", "active", "focus", "disabled")
+
+# Steps of a minimal type scale: caption, body, subtitle, title, display.
+TYPE_SCALE_STEPS = 5
+# Alias chains longer than this many hops are hard to follow and to refactor.
+MAX_ALIAS_HOPS = 3
+# At least this share of names must sit in a group ("Group/name") for a taxonomy to count as defined.
+TAXONOMY_MIN_GROUPED_PERCENT = 80.0
+
+# Naming violations listed in the report; the counts always cover every name.
+MAX_REPORTED_VIOLATIONS = 500
+
+RISK_LEVELS = ((85, "Low"), (65, "Medium"), (0, "High"))
+
+
+class AuditInputs(NamedTuple):
+    design_tokens: dict
+    schema: TokenSchema
+    contrast_policy: ContrastPolicy
+
+
+class Dimension(NamedTuple):
+    score: int
+    metrics: dict
+    details: Optional[dict] = None  # a full report section, for dimensions that have one
+
+
+def _words(name: str) -> set:
+    words = set(re.findall(r"[a-z]+", name.lower()))
+    return words | {word[:-1] for word in words if word.endswith("s")}
+
+
+def _percent(part: int, whole: int, empty: Optional[float] = None) -> Optional[float]:
+    return round(100.0 * part / whole, 1) if whole else empty
+
+
+def _clamp(score: float) -> int:
+    return max(0, min(100, round(score)))
+
+
+def _token_names(design_tokens: dict) -> list:
+    return [name for key in ("colors", "typography", "effects") for name in design_tokens.get(key, {})]
+
+
+def score_token_integrity(inputs: AuditInputs) -> Dimension:
+    """Schema coverage, and literal values repeated where a reference would do."""
+    tokens = inputs.design_tokens
+    aliased = tokens.get("aliases", {})
+    seen = set()
+    duplicates = 0
+    literals = 0
+    for name, value in tokens.get("colors", {}).items():
+        if name in aliased or not isinstance(value, str):
+            continue
+        literals += 1
+        if value.lower() in seen:
+            duplicates += 1
+        seen.add(value.lower())
+    covered = [
+        category
+        for category in inputs.schema.categories
+        if any(tokens.get(key) for key in CATEGORY_KEYS.get(category, (category,)))
+    ]
+    colors = len(tokens.get("colors", {}))
+    hard_code_ratio = _percent(duplicates, colors, 0.0)
+    coverage = _percent(len(covered), len(inputs.schema.categories), 0.0)
+    metrics = {
+        "hard_code_ratio_percent": hard_code_ratio,
+        "duplicate_tokens": duplicates,
+        "unused_tokens": None,  # needs component usage data
+        "missing_semantic_layer": not _semantic_layer(tokens),
+        "token_coverage_percent": coverage,
+        "categories_covered": covered,
+        "literal_color_tokens": literals,
+        "aliased_color_tokens": len(aliased),
+    }
+    return Dimension(_clamp(0.5 * coverage + 0.5 * (100 - hard_code_ratio)), metrics)
+
+
+def score_component_integrity(inputs: AuditInputs) -> Dimension:
+    """
+    How sound the token references are (unresolved aliases, overly long chains) and,
+    with component node data, how many multi-child components and variants use
+    auto-layout. Detached instances need instance data and stay ``None``.
+    """
+    tokens = inputs.design_tokens
+    layouts = [
+        layout
+        for component in tokens.get("components", {}).values()
+        for layout in component.get("layouts", [])
+        if layout.get("children", 0) >= 2
+    ]
+    auto_layout = _percent(sum(1 for layout in layouts if layout.get("layout_mode") != "NONE"), len(layouts))
+    chains = tokens.get("aliases", {})
+    unresolved = tokens.get("unresolved_aliases", {})
+    references = len(chains) + len(unresolved)
+    long_chains = sum(1 for chain in chains.values() if len(chain) - 1 > MAX_ALIAS_HOPS)
+    integrity = _percent(len(chains), references, 100.0)
+    metrics = {
+        "auto_layout_coverage_percent": auto_layout,
+        "detached_instances": None,
+        "token_usage_coverage_percent": integrity,
+        "nested_structure_issues": len(unresolved) + long_chains,
+        "unresolved_references": len(unresolved),
+        "max_alias_hops": max((len(chain) - 1 for chain in chains.values()), default=0),
+    }
+    measured = integrity if auto_layout is None else (integrity + auto_layout) / 2
+    return Dimension(_clamp(measured - min(20, 5 * long_chains)), metrics)
+
+
+def score_accessibility(inputs: AuditInputs) -> Dimension:
+    """The contrast pass rate at the profile's level, less 15 when a required dark mode is missing."""
+    report = audit_contrast(inputs.design_tokens, inputs.contrast_policy)
+    rate = report["wcag_AAA_pass_rate_percent" if report["enforce_wcag_aaa"] else "wcag_AA_pass_rate_percent"]
+    metrics = {
+        "wcag_AA_pass_rate_percent": report["wcag_AA_pass_rate_percent"],
+        "wcag_AAA_pass_rate_percent": report["wcag_AAA_pass_rate_percent"],
+        "contrast_violations": report["contrast_violations"],
+        "dark_mode_failures": report["dark_mode_failures"],
+        "dark_mode_missing": report["dark_mode_missing"],
+    }
+    score = (100.0 if rate is None else rate) - (15 if report["dark_mode_missing"] else 0)
+    return Dimension(_clamp(score), metrics, report)
+
+
+def _semantic_layer(tokens: dict) -> bool:
+    """Tokens reference each other, or most color names say what they are for."""
+    names = list(tokens.get("colors", {}))
+    semantic = sum(1 for name in names if _words(name) & SEMANTIC_WORDS)
+    return bool(tokens.get("aliases")) or (bool(names) and semantic * 2 >= len(names))
+
+
+def score_structure(inputs: AuditInputs) -> Dimension:
+    """A semantic layer (40), grouped names (30) and role rather than look in names (30)."""
+    names = _token_names(inputs.design_tokens)
+    grouped = sum(1 for name in names if "/" in name or "." in name)
+    visual = sum(1 for name in names if _words(name) & VISUAL_WORDS)
+    grouped_percent = _percent(grouped, len(names), 0.0)
+    visual_percent = _percent(visual, len(names), 0.0)
+    semantic = _semantic_layer(inputs.design_tokens)
+    metrics = {
+        "semantic_layer_detected": semantic,
+        "visual_named_components_percent": visual_percent,
+        "taxonomy_defined": grouped_percent >= TAXONOMY_MIN_GROUPED_PERCENT,
+        "grouped_names_percent": grouped_percent,
+    }
+    return Dimension(_clamp(40 * semantic + 0.3 * grouped_percent + 0.3 * (100 - visual_percent)), metrics)
+
+
+def score_variant_coverage(inputs: AuditInputs) -> Dimension:
+    """Key interaction states of interactive color tokens, and the steps of the type scale."""
+    states_by_base = {}
+    for name in inputs.design_tokens.get("colors", {}):
+        parts = re.split(r"[/.\s_-]+", name)
+        states = {STATE_WORDS[part.lower()] for part in parts if part.lower() in STATE_WORDS}
+        base = "/".join(part for part in parts if part.lower() not in STATE_WORDS)
+        states_by_base.setdefault(base, set()).update(states)
+    interactive = {
+        base: states
+        for base, states in states_by_base.items()
+        if states or _words(base) & INTERACTIVE_WORDS
+    }
+    found = sum(len(states) for states in interactive.values())
+    state_coverage = _percent(found, len(KEY_STATES) * len(interactive))
+    typography = inputs.design_tokens.get("typography", {})
+    sizes = {style.get("size") for style in typography.values() if isinstance(style, dict)} - {None}
+    size_coverage = _percent(min(len(sizes), TYPE_SCALE_STEPS), TYPE_SCALE_STEPS) if typography else None
+    metrics = {
+        "state_coverage_percent": state_coverage,
+        "size_variant_coverage_percent": size_coverage,
+        "missing_state_components": [
+            {"token": base, "missing_states": [state for state in KEY_STATES if state not in states]}
+            for base, states in interactive.items()
+            if len(states) < len(KEY_STATES)
+        ],
+    }
+    measured = [value for value in (state_coverage, size_coverage) if value is not None]
+    return Dimension(_clamp(sum(measured) / len(measured)) if measured else 100, metrics)
+
+
+def score_naming(inputs: AuditInputs) -> Dimension:
+    """Share of token names that follow the schema's naming convention."""
+    hints = {}
+    for category, keys in CATEGORY_KEYS.items():
+        for key in keys:
+            hints.update(dict.fromkeys(inputs.design_tokens.get(key, {}), category))
+    report = NamingChecker(NamingRules(inputs.schema)).check(_token_names(inputs.design_tokens), hints)
+    metrics = {
+        "invalid_layer_names": report.names - report.conforming,
+        "duplicate_component_names": sum(len(group) - 1 for group in report.duplicates),
+        "naming_pattern_match_rate_percent": report.match_rate_percent,
+    }
+    details = {
+        "schema": inputs.schema.schema_name,
+        "names_checked": report.names,
+        "conforming_names": report.conforming,
+        "violations_by_rule": report.by_rule(),
+        "violations": [violation._asdict() for violation in report.violations[:MAX_REPORTED_VIOLATIONS]],
+        "violations_truncated": len(report.violations) > MAX_REPORTED_VIOLATIONS,
+        "duplicates": report.duplicates,
+    }
+    return Dimension(_clamp(report.match_rate_percent), metrics, details)
+
+
+# SKILL.md's dimension weights. Scorers only read the shared inputs, so they run concurrently.
+DIMENSIONS = (
+    ("token_integrity", 0.25, score_token_integrity),
+    ("component_integrity", 0.20, score_component_integrity),
+    ("accessibility", 0.20, score_accessibility),
+    ("structure_semantics", 0.15, score_structure),
+    ("variant_coverage", 0.10, score_variant_coverage),
+    ("naming_consistency", 0.10, score_naming),
+)
+
+
+def readiness_penalties(dimensions: dict, schema: TokenSchema) -> list:
+    """SKILL.md's AI-readiness penalties that apply, as ``(condition, deduction)`` pairs."""
+    token = dimensions["token_integrity"].metrics
+    structure = dimensions["structure_semantics"].metrics
+    naming = dimensions["naming_consistency"].metrics
+    conditions = (
+        ("Missing semantic layer", 15, token["missing_semantic_layer"]),
+        (
+            f"Hard-coded usage > {schema.hard_code_warning_percent:g}%",
+            10,
+            token["hard_code_ratio_percent"] > schema.hard_code_warning_percent,
+        ),
+        (
+            "Variant instability (missing key states)",
+            10,
+            bool(dimensions["variant_coverage"].metrics["missing_state_components"]),
+        ),
+        (
+            "Naming inconsistency detected",
+            8,
+            naming["invalid_layer_names"] > 0 or naming["duplicate_component_names"] > 0,
+        ),
+        ("Poor or undefined taxonomy", 7, not structure["taxonomy_defined"]),
+    )
+    return [(condition, -deduction) for condition, deduction, applies in conditions if applies]
+
+
+def risk_level(overall_score: int) -> str:
+    return next(level for floor, level in RISK_LEVELS if overall_score >= floor)
+
+
+def score_audit(inputs: AuditInputs, max_workers: int = len(DIMENSIONS)) -> dict:
+    """
+    Scores all six dimensions concurrently and combines them as SKILL.md specifies.
+
+    Returns ``{"summary", "dimensions", "ai_readiness", "accessibility", "naming"}``
+    for ``audit-report.json``: integer scores with each dimension's raw metrics,
+    the applied readiness penalties, and the full contrast and naming reports.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="audit-scorer") as pool:
+        futures = [(key, weight, pool.submit(scorer, inputs)) for key, weight, scorer in DIMENSIONS]
+        dimensions = {key: future.result() for key, _, future in futures}
+    weights = {key: weight for key, weight, _ in DIMENSIONS}
+
+    overall = round(sum(weights[key] * dimension.score for key, dimension in dimensions.items()))
+    penalties = readiness_penalties(dimensions, inputs.schema)
+    ai_readiness = max(0, overall + sum(deduction for _, deduction in penalties))
+    return {
+        "summary": {
+            "overall_score": overall,
+            "ai_readiness_score": ai_readiness,
+            "risk_level": risk_level(overall),
+        },
+        "dimensions": {
+            key: {"score": dimension.score, "weight": weights[key], "metrics": dimension.metrics}
+            for key, dimension in dimensions.items()
+        },
+        "ai_readiness": {
+            "score": ai_readiness,
+            "overall_score_used": overall,
+            "hard_code_penalty_applied": any(condition.startswith("Hard-coded") for condition, _ in penalties),
+            "semantic_instability_detected": dimensions["token_integrity"].metrics["missing_semantic_layer"],
+            "penalties": [{"condition": condition, "deduction": deduction} for condition, deduction in penalties],
+        },
+        "accessibility": dimensions["accessibility"].details,
+        "naming": dimensions["naming_consistency"].details,
+    }
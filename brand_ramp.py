@@ -0,0 +1,162 @@
+import argparse
+import json
+from pathlib import Path
+from typing import Sequence
+
+from color_kernel import (
+    contrast_matrix,
+    format_hex,
+    gamut_map_oklch,
+    oklch_to_rgb8,
+    parse_hex,
+    relative_luminance,
+    rgba8_to_oklch,
+    rows,
+    to_unit,
+)
+from contrast_audit import ContrastPolicy, load_contrast_policy
+from pipeline_io import write_json
+
+RAMP_STEPS = ("50", "100", "200", "300", "400", "500", "600", "700", "800", "900", "950")
+# OKLCH lightness per step and chroma relative to 500, after Tailwind's v4 palette.
+RAMP_LIGHTNESS = (0.971, 0.932, 0.882, 0.809, 0.707, 0.623, 0.546, 0.488, 0.424, 0.379, 0.282)
+RAMP_CHROMA = (0.065, 0.15, 0.29, 0.51, 0.77, 1.0, 1.14, 1.14, 0.93, 0.68, 0.43)
+PRIMARY_STEP = RAMP_STEPS.index("500")
+# Steps from here on are meant for text and for fills under white text.
+FOREGROUND_STEP = RAMP_STEPS.index("600")
+# Rounds of darkening a foreground step that misses the profile's text ratio on white.
+CONTRAST_FIX_ROUNDS = 8
+
+WHITE_UNIT = (1.0, 1.0, 1.0)
+BLACK_UNIT = (0.0, 0.0, 0.0)
+
+
+def _anchor(lightness: float) -> int:
+    """
+    The step the seed becomes: 500, the pipeline's primary step, unless the seed is
+    lighter than 400's or darker than 600's design lightness would allow; then the
+    step whose design lightness is closest.
+    """
+    nearest = min(range(len(RAMP_STEPS)), key=lambda s: (abs(RAMP_LIGHTNESS[s] - lightness), s))
+    return PRIMARY_STEP if abs(nearest - PRIMARY_STEP) <= 1 else nearest
+
+
+def _step_lch(seed_lch: Sequence[float], anchor: int) -> list:
+    """
+    OKLCH of every step for one seed: the design lightness curve bent so the anchor
+    lands on the seed's lightness (ends fixed), chroma scaled by the seed's, hue kept.
+    """
+    L, C, h = seed_lch
+    shift = L - RAMP_LIGHTNESS[anchor]
+    chroma = C / RAMP_CHROMA[anchor]
+    out = []
+    for s, (target, relative) in enumerate(zip(RAMP_LIGHTNESS, RAMP_CHROMA)):
+        end = 0 if s < anchor else len(RAMP_STEPS) - 1
+        span = RAMP_LIGHTNESS[end] - RAMP_LIGHTNESS[anchor]
+        weight = (RAMP_LIGHTNESS[end] - target) / span if span else 1.0
+        out.append((target + shift * weight, chroma * relative, h))
+    return out
+
+
+def _render(lch: list) -> tuple:
+    """``(hex values, 0-1 RGB rows)`` for OKLCH rows, gamut-mapped and quantized to 8 bits."""
+    rgb8 = oklch_to_rgb8(gamut_map_oklch(lch))
+    return format_hex(rgb8), rows(to_unit(rgb8))
+
+
+def generate_ramps(seeds: Sequence[str], policy: ContrastPolicy = ContrastPolicy()) -> list:
+    """
+    A 50-950 ramp per hex seed, every seed computed in the same few batch calls.
+
+    Each seed is kept exactly at 500 (or the step nearest its OKLCH lightness); the other
+    steps follow a fixed lightness curve bent through the seed, with the seed's
+    hue and proportional chroma, mapped into sRGB by reducing chroma. Steps from
+    600 up that miss the profile's text ratio against white (AAA when the profile
+    enforces it) are darkened until they reach it; a seed that misses it itself
+    is reported, never altered.
+    """
+    seeds = [seed[:7].lower() for seed in seeds]
+    seed_lch = rows(rgba8_to_oklch(parse_hex(seeds)))
+    anchors = [_anchor(lch[0]) for lch in seed_lch]
+    lch = [step for seed, anchor in zip(seed_lch, anchors) for step in _step_lch(seed, anchor)]
+    values, unit = _render(lch)
+    width = len(RAMP_STEPS)
+    for n, (seed, anchor) in enumerate(zip(seeds, anchors)):
+        values[n * width + anchor] = seed
+
+    required = policy.minimums("text", policy.enforce_aaa)
+    # Luminance a color may have and still reach ``required`` against white, with room for 8-bit rounding.
+    target = (1.05 / required - 0.05) * 0.98
+    candidates = [
+        n * width + s for n, anchor in enumerate(anchors) for s in range(FOREGROUND_STEP, width) if s != anchor
+    ]
+    darkened = set()
+    for _ in range(CONTRAST_FIX_ROUNDS):
+        luminance = [float(y) for y in relative_luminance([unit[i] for i in candidates])]
+        failing = [(i, y) for i, y in zip(candidates, luminance) if y > target]
+        if not failing:
+            break
+        # Luminance goes roughly with the cube of OKLab lightness.
+        for i, y in failing:
+            L, C, h = lch[i]
+            lch[i] = (L * (target / y) ** (1 / 3), C, h)
+        candidates = [i for i, _ in failing]
+        darkened.update(candidates)
+        fixed_values, fixed_unit = _render([lch[i] for i in candidates])
+        for i, value, color in zip(candidates, fixed_values, fixed_unit):
+            values[i], unit[i] = value, color
+
+    # A darkened step can catch up with the next ones; those keep the design's spacing below it.
+    stepped = []
+    for n, anchor in enumerate(anchors):
+        for s in range(FOREGROUND_STEP + 1, width):
+            i = n * width + s
+            cap = lch[i - 1][0] * RAMP_LIGHTNESS[s] / RAMP_LIGHTNESS[s - 1]
+            if s != anchor and (i - 1 in darkened or i - 1 in stepped) and lch[i][0] > cap:
+                lch[i] = (cap,) + tuple(lch[i][1:])
+                stepped.append(i)
+    for i, value in zip(stepped, _render([lch[i] for i in stepped])[0]):
+        values[i] = value
+
+    final_unit = rows(to_unit(parse_hex(values)))
+    ratios = rows(contrast_matrix(final_unit, [WHITE_UNIT, BLACK_UNIT]))
+    ramps = []
+    for n, (seed, anchor) in enumerate(zip(seeds, anchors)):
+        block = range(n * width, (n + 1) * width)
+        ramps.append(
+            {
+                "seed": seed,
+                "anchor_step": RAMP_STEPS[anchor],
+                "steps": {step: values[i] for step, i in zip(RAMP_STEPS, block)},
+                "contrast_on_white": {step: round(ratios[i][0], 2) for step, i in zip(RAMP_STEPS, block)},
+                "contrast_on_black": {step: round(ratios[i][1], 2) for step, i in zip(RAMP_STEPS, block)},
+                "required_text_ratio": required,
+                "failing_steps": [
+                    step for step, i in zip(RAMP_STEPS[FOREGROUND_STEP:], block[FOREGROUND_STEP:])
+                    if ratios[i][0] < required
+                ],
+            }
+        )
+    return ramps
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate 50-950 brand ramps for many seed colors at once.")
+    parser.add_argument("--seeds", type=str, required=True, help='JSON file: {"tenant": "#rrggbb"} or a list of hex')
+    parser.add_argument("--out", type=str, required=True, help="Where to write the ramps JSON")
+    args = parser.parse_args()
+
+    base_dir = Path(__file__).resolve().parent
+    with open(args.seeds, "r") as f:
+        seeds = json.load(f)
+    policy = load_contrast_policy(base_dir)
+    if isinstance(seeds, dict):
+        ramps = dict(zip(seeds, generate_ramps(list(seeds.values()), policy)))
+    else:
+        ramps = generate_ramps(seeds, policy)
+    write_json(Path(args.out), ramps)
+    print(f"Generated {len(ramps)} brand ramps in: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
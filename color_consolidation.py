@@ -0,0 +1,71 @@
+from typing import Mapping
+
+from color_kernel import is_hex_color, neighbours_within, parse_hex, rgba8_to_oklab, rows
+
+# Euclidean distance in OKLab (ΔE_OK) under which two colors count as the same;
+# about one just-noticeable difference.
+DEFAULT_MERGE_DELTA_E = 0.02
+
+
+def build_merge_plan(colors: Mapping[str, str], delta_e: float = DEFAULT_MERGE_DELTA_E) -> dict:
+    """
+    Merge plan for ``{token name: hex}`` colors that are perceptually indistinguishable.
+
+    Identical values are grouped first; the distinct values are then paired in OKLab
+    with a grid index (only same-alpha colors at most ``delta_e`` apart). Clusters are
+    grown greedily around the most used value, so every merged color is within
+    ``delta_e`` of the color it merges into and each color joins at most one cluster.
+    Ties fall back to document order, so the plan is stable run to run.
+    """
+    names_by_value = {}
+    for name, value in colors.items():
+        if is_hex_color(value):
+            names_by_value.setdefault(value.lower(), []).append(name)
+    values = list(names_by_value)
+    rgba8 = parse_hex(values)
+    offsets, neighbours, spans = neighbours_within(rgba8_to_oklab(rgba8), delta_e, [row[3] for row in rows(rgba8)])
+
+    candidates = [
+        index
+        for index, value in enumerate(values)
+        if offsets[index + 1] > offsets[index] or len(names_by_value[value]) > 1
+    ]
+
+    clusters = []
+    merged = set()
+    for index in sorted(candidates, key=lambda index: (-len(names_by_value[values[index]]), index)):
+        if index in merged:
+            continue
+        keep, *same = names_by_value[values[index]]
+        members = [(0.0, index, name) for name in same]
+        for k in range(offsets[index], offsets[index + 1]):
+            other = neighbours[k]
+            if other not in merged:
+                merged.add(other)
+                members.extend((spans[k], other, name) for name in names_by_value[values[other]])
+        if not members:
+            continue
+        merged.add(index)
+        members.sort()
+        clusters.append(
+            {
+                "keep": keep,
+                "value": values[index],
+                "merge": [
+                    {"name": name, "value": values[other], "delta_e": round(distance, 4)}
+                    for distance, other, name in members
+                ],
+            }
+        )
+
+    analyzed = sum(len(names) for names in names_by_value.values())
+    merged_tokens = sum(len(cluster["merge"]) for cluster in clusters)
+    return {
+        "metric": "deltaE_OK",
+        "delta_e_threshold": delta_e,
+        "colors_analyzed": analyzed,
+        "distinct_values": len(values),
+        "clusters": clusters,
+        "tokens_merged": merged_tokens,
+        "tokens_after_merge": analyzed - merged_tokens,
+    }
@@ -0,0 +1,705 @@
+import math
+import re
+from typing import Iterable, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # Same results without NumPy, just slower on large batches.
+    np = None
+
+# Color batches are (N, 4) RGBA rows: 8-bit ints ("rgba8") or 0-1 floats ("unit",
+# Figma's convention), or (N, 3) rows for RGB-only spaces (linear RGB, OKLab, OKLCH).
+# With NumPy they are ndarrays; without it, lists of tuples. Either way they are
+# meant to be passed between the functions here; ``rows`` turns one into plain lists.
+
+HEX_COLOR = re.compile(r"^#[0-9a-fA-F]{6}([0-9a-fA-F]{2})?$")
+# What ``parse_hex`` accepts: optional "#", then 3, 6 or 8 hex digits.
+HEX_VALUE = re.compile(r"^#?([0-9a-fA-F]{3}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})$")
+
+WHITE = (255, 255, 255)
+
+# n / 255 for every 8-bit value, so per-color conversions share float objects.
+_UNIT_FLOATS = tuple(n / 255.0 for n in range(256))
+
+# Rec. 709 / WCAG 2.x relative luminance weights, on linear RGB.
+LUMINANCE_WEIGHTS = (0.2126, 0.7152, 0.0722)
+
+# Björn Ottosson's OKLab matrices: linear sRGB -> LMS -> OKLab and back.
+_RGB_TO_LMS = (
+    (0.4122214708, 0.5363325363, 0.0514459929),
+    (0.2119034982, 0.6806995451, 0.1073969566),
+    (0.0883024619, 0.2817188376, 0.6299787005),
+)
+_LMS_TO_LAB = (
+    (0.2104542553, 0.7936177850, -0.0040720468),
+    (1.9779984951, -2.4285922050, 0.4505937099),
+    (0.0259040371, 0.7827717662, -0.8086757660),
+)
+_LAB_TO_LMS = (
+    (1.0, 0.3963377774, 0.2158037573),
+    (1.0, -0.1055613458, -0.0638541728),
+    (1.0, -0.0894841775, -1.2914855480),
+)
+_LMS_TO_RGB = (
+    (4.0767416621, -3.3077115913, 0.2309699292),
+    (-1.2684380046, 2.6097574011, -0.3413193965),
+    (-0.0041960863, -0.7034186147, 1.7076147010),
+)
+
+
+def is_hex_color(value) -> bool:
+    """``#rrggbb`` or ``#rrggbbaa``: the forms design tokens are stored in."""
+    return isinstance(value, str) and HEX_COLOR.match(value) is not None
+
+
+def is_hex_value(value) -> bool:
+    return isinstance(value, str) and HEX_VALUE.match(value) is not None
+
+
+def rows(colors) -> list:
+    """A color batch as a list of per-color lists of Python numbers."""
+    if np is not None and isinstance(colors, np.ndarray):
+        return colors.tolist()
+    return [list(row) for row in colors]
+
+
+def _array(colors, width: int = 4):
+    """A batch as a 2-D float ndarray; empty input becomes an empty (0, width) array."""
+    array = np.asarray(colors, dtype=np.float64)
+    return array.reshape(len(array), -1) if array.size else np.zeros((0, width))
+
+
+def _matmul(colors, matrix):
+    if np is not None:
+        return _array(colors, 3)[:, :3] @ np.array(matrix).T
+    return [tuple(sum(m * c for m, c in zip(row, color)) for row in matrix) for color in colors]
+
+
+# --- Hex and 8-bit RGBA ---------------------------------------------------------
+
+
+def _eight_digits(value) -> str:
+    match = HEX_VALUE.match(value) if isinstance(value, str) else None
+    if match is None:
+        raise ValueError(f"Not a hex color: {value!r}")
+    digits = match.group(1)
+    if len(digits) == 8:
+        return digits
+    if len(digits) == 3:
+        digits = "".join(c + c for c in digits)
+    return digits + "ff"
+
+
+def _hex_bytes(values: Iterable[str]) -> bytes:
+    return bytes.fromhex("".join([_eight_digits(value) for value in values]))
+
+
+def parse_hex(values: Iterable[str]):
+    """rgba8 rows for hex strings (see HEX_VALUE); alpha is 255 unless given. Raises ValueError otherwise."""
+    raw = _hex_bytes(values)
+    if np is not None:
+        return np.frombuffer(raw, dtype=np.uint8).reshape(-1, 4).astype(np.int64)
+    return [tuple(raw[i : i + 4]) for i in range(0, len(raw), 4)]
+
+
+def format_hex(rgba8, with_alpha: Union[bool, Sequence[bool]] = False) -> list:
+    """``#rrggbb`` strings for rgba8 (or rgb8) rows; ``#rrggbbaa`` where ``with_alpha`` is set."""
+    if np is not None:
+        packed = np.clip(_array(rgba8), 0, 255)
+        if packed.shape[1] == 3:
+            packed = np.hstack([packed, np.full((len(packed), 1), 255)])
+        text = packed.astype(np.uint8).tobytes().hex()
+    else:
+        text = bytes(min(255, max(0, c)) for row in rgba8 for c in (tuple(row) + (255,))[:4]).hex()
+    count = len(text) // 8
+    alphas = [with_alpha] * count if isinstance(with_alpha, bool) else with_alpha
+    return ["#" + text[i * 8 : i * 8 + (8 if alpha else 6)] for i, alpha in zip(range(count), alphas)]
+
+
+def hex_to_rgba8(value: str) -> tuple:
+    """Single-color ``parse_hex``, for callers that see one value at a time."""
+    return tuple(bytes.fromhex(_eight_digits(value)))
+
+
+def pack_rgba8(rgba8: Sequence[int]) -> int:
+    r, g, b, a = rgba8
+    return r << 24 | g << 16 | b << 8 | a
+
+
+def word_to_hex(word: int, with_alpha: bool = False) -> str:
+    """Single-color ``format_hex`` of a packed word."""
+    return "#" + word.to_bytes(4, "big").hex()[: 8 if with_alpha else 6]
+
+
+def pack_unit_channels(channels: Sequence[float]) -> list:
+    """0xRRGGBBAA words for a flat r, g, b, a, r, ... sequence of 0-1 floats (see ``quantize``)."""
+    if np is not None:
+        rgba8 = quantize(np.asarray(channels, dtype=np.float64).reshape(-1, 4))
+        return rgba8.astype(np.uint8).view(">u4").ravel().tolist()
+    values = iter(channels)
+    return [
+        _quantize(r) << 24 | _quantize(g) << 16 | _quantize(b) << 8 | _quantize(a)
+        for r, g, b, a in zip(values, values, values, values)
+    ]
+
+
+def unpack_words(words: Sequence[int]):
+    """rgba8 rows from 0xRRGGBBAA words (see ``pack_rgba8``)."""
+    if np is not None:
+        return np.asarray(words, dtype=">u4").view(np.uint8).reshape(-1, 4).astype(np.int64)
+    return [(w >> 24, (w >> 16) & 0xFF, (w >> 8) & 0xFF, w & 0xFF) for w in words]
+
+
+# --- Figma 0-1 floats ------------------------------------------------------------
+
+
+def figma_has_alpha(rgba: dict) -> bool:
+    return float(rgba.get("a", 1.0)) < 1
+
+
+def figma_to_rgba8(colors: Sequence[dict]):
+    if np is not None:
+        return quantize(
+            [[float(c.get("r", 0)), float(c.get("g", 0)), float(c.get("b", 0)), float(c.get("a", 1.0))] for c in colors]
+        )
+    return [
+        tuple(_quantize(float(c.get(k, default))) for k, default in (("r", 0), ("g", 0), ("b", 0), ("a", 1.0)))
+        for c in colors
+    ]
+
+
+def figma_to_hex(colors: Sequence[dict]) -> list:
+    """Hex for Figma colors, ``#rrggbbaa`` only when the color is translucent."""
+    return format_hex(figma_to_rgba8(colors), [figma_has_alpha(c) for c in colors])
+
+
+def rgba8_to_figma(rgba8) -> list:
+    """Figma ``{"r", "g", "b", "a"}`` dicts (0-1 floats) for rgba8 rows."""
+    return [{"r": r, "g": g, "b": b, "a": a} for r, g, b, a in rows(to_unit(rgba8))]
+
+
+def hex_to_figma(values: Iterable[str]) -> list:
+    """``rgba8_to_figma(parse_hex(values))``, straight from the parsed bytes."""
+    raw = _hex_bytes(values)
+    unit = _UNIT_FLOATS
+    return [
+        {"r": unit[raw[i]], "g": unit[raw[i + 1]], "b": unit[raw[i + 2]], "a": unit[raw[i + 3]]}
+        for i in range(0, len(raw), 4)
+    ]
+
+
+# --- Unit floats, linear RGB and luminance ----------------------------------------
+
+
+def to_unit(rgba8):
+    if np is not None:
+        return _array(rgba8) / 255.0
+    return [tuple(c / 255.0 for c in row) for row in rgba8]
+
+
+def _quantize(c: float) -> int:
+    value = round(c * 255)
+    return 0 if value < 0 else 255 if value > 255 else value
+
+
+def quantize(unit):
+    """8-bit rows for 0-1 float rows: rounded half to even, clamped to 0-255."""
+    if np is not None:
+        return np.clip(np.round(_array(unit) * 255), 0, 255).astype(np.int64)
+    return [tuple(_quantize(c) for c in row) for row in unit]
+
+
+def composite_over(rgba8, background: Sequence[int] = WHITE):
+    """
+    rgb8 rows of ``rgba8`` flattened onto an opaque ``background``.
+
+    Channels are blended in 8-bit space and truncated, ``int(c * a + bg * (1 - a))``,
+    the convention the refactor phase has always used for solid fallbacks.
+    """
+    if np is not None:
+        colors = _array(rgba8)
+        alpha = colors[:, 3:] / 255.0
+        blended = colors[:, :3] * alpha + np.asarray(background, dtype=np.float64)[:3] * (1 - alpha)
+        return np.trunc(blended).astype(np.int64)
+    out = []
+    for r, g, b, a in rgba8:
+        alpha = a / 255.0
+        out.append(tuple(int(c * alpha + bg * (1 - alpha)) for c, bg in zip((r, g, b), background)))
+    return out
+
+
+def _srgb_to_linear(c: float) -> float:
+    return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(c: float) -> float:
+    return 12.92 * c if c <= 0.0031308 else 1.055 * c ** (1 / 2.4) - 0.055
+
+
+def srgb_to_linear(unit):
+    """Linear RGB (N, 3) for 0-1 sRGB rows; alpha, if present, is dropped."""
+    if np is not None:
+        rgb = _array(unit)[:, :3]
+        return np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    return [tuple(_srgb_to_linear(c) for c in row[:3]) for row in unit]
+
+
+def linear_to_srgb(linear):
+    """0-1 sRGB (N, 3) for linear RGB rows, clipped to the sRGB gamut."""
+    if np is not None:
+        rgb = np.clip(_array(linear, 3), 0.0, 1.0)
+        return np.where(rgb <= 0.0031308, 12.92 * rgb, 1.055 * rgb ** (1 / 2.4) - 0.055)
+    return [tuple(_linear_to_srgb(min(1.0, max(0.0, c))) for c in row) for row in linear]
+
+
+def relative_luminance(unit):
+    """WCAG relative luminance per 0-1 sRGB row (alpha ignored)."""
+    linear = srgb_to_linear(unit)
+    if np is not None:
+        return linear @ np.array(LUMINANCE_WEIGHTS)
+    return [sum(w * c for w, c in zip(LUMINANCE_WEIGHTS, row)) for row in linear]
+
+
+def flatten_unit(unit, backdrop: Sequence[float]):
+    """Opaque 0-1 RGB rows: translucent rows are composited over the ``backdrop`` RGB."""
+    if np is not None:
+        colors = _array(unit)
+        if colors.shape[1] == 3:
+            return colors
+        alpha = colors[:, 3:]
+        return colors[:, :3] * alpha + np.asarray(backdrop, dtype=np.float64) * (1 - alpha)
+    out = []
+    for row in unit:
+        alpha = row[3] if len(row) > 3 else 1.0
+        out.append(tuple(c * alpha + bg * (1 - alpha) for c, bg in zip(row[:3], backdrop)))
+    return out
+
+
+def _ratio(a: float, b: float) -> float:
+    return (max(a, b) + 0.05) / (min(a, b) + 0.05)
+
+
+def contrast_matrix(foregrounds, backgrounds):
+    """
+    (F, B) WCAG contrast ratios of every 0-1 RGBA foreground on every opaque background.
+
+    Opaque foregrounds take one broadcast over the two luminance vectors; translucent
+    ones are composited onto each background first, one row at a time.
+    """
+    if np is not None:
+        fg = _array(foregrounds)
+        bg = _array(backgrounds, 3)[:, :3]
+        bg_lum = relative_luminance(bg)
+        fg_lum = relative_luminance(fg)[:, None]
+        ratios = (np.maximum(fg_lum, bg_lum) + 0.05) / (np.minimum(fg_lum, bg_lum) + 0.05)
+        if fg.shape[1] == 4:
+            for i in np.nonzero(fg[:, 3] < 1)[0]:
+                lum = relative_luminance(fg[i, :3] * fg[i, 3] + bg * (1 - fg[i, 3]))
+                ratios[i] = (np.maximum(lum, bg_lum) + 0.05) / (np.minimum(lum, bg_lum) + 0.05)
+        return ratios
+    bg_lum = relative_luminance(backgrounds)
+    fg_lum = relative_luminance(foregrounds)
+    out = []
+    for row, lum in zip(foregrounds, fg_lum):
+        if len(row) > 3 and row[3] < 1:
+            blended = [tuple(c * row[3] + b * (1 - row[3]) for c, b in zip(row[:3], bg)) for bg in backgrounds]
+            out.append([_ratio(a, b) for a, b in zip(relative_luminance(blended), bg_lum)])
+        else:
+            out.append([_ratio(lum, b) for b in bg_lum])
+    return out
+
+
+def pairs_below(ratios, minimums: Sequence[float], limit: int) -> tuple:
+    """
+    ``(count, worst)`` for cells of ``ratios`` under their row's minimum.
+
+    ``worst`` lists up to ``limit`` ``(row, column, ratio)`` triples, lowest ratio
+    first (ties by position), so reports stay bounded on very large matrices.
+    """
+    if np is not None:
+        ratios = np.asarray(ratios, dtype=np.float64)
+        if not ratios.size:
+            return 0, []
+        below = ratios < np.asarray(minimums, dtype=np.float64)[:, None]
+        if not limit:
+            return int(np.count_nonzero(below)), []
+        rows_idx, cols_idx = np.nonzero(below)
+        values = ratios[rows_idx, cols_idx]
+        count = len(values)
+        if count > limit:
+            # Only cells at or under the limit-th lowest ratio can make the cut.
+            keep = values <= np.partition(values, limit - 1)[limit - 1]
+            rows_idx, cols_idx, values = rows_idx[keep], cols_idx[keep], values[keep]
+        order = np.lexsort((cols_idx, rows_idx, values))[:limit]
+        return count, [(int(rows_idx[k]), int(cols_idx[k]), float(values[k])) for k in order]
+    failing = [
+        (value, i, j)
+        for i, (row, minimum) in enumerate(zip(ratios, minimums))
+        for j, value in enumerate(row)
+        if value < minimum
+    ]
+    failing.sort()
+    return len(failing), [(i, j, value) for value, i, j in failing[:limit]]
+
+
+# --- OKLab / OKLCH ------------------------------------------------------------------
+
+
+def linear_to_oklab(linear):
+    lms = _matmul(linear, _RGB_TO_LMS)
+    if np is not None:
+        return np.cbrt(lms) @ np.array(_LMS_TO_LAB).T
+    return _matmul([tuple(math.copysign(abs(c) ** (1 / 3), c) for c in row) for row in lms], _LMS_TO_LAB)
+
+
+def oklab_to_linear(lab):
+    lms = _matmul(lab, _LAB_TO_LMS)
+    if np is not None:
+        return (lms**3) @ np.array(_LMS_TO_RGB).T
+    return _matmul([tuple(c**3 for c in row) for row in lms], _LMS_TO_RGB)
+
+
+def oklab_to_oklch(lab):
+    """(L, C, h) rows, hue in degrees 0-360."""
+    if np is not None:
+        lab = _array(lab, 3)
+        hue = np.degrees(np.arctan2(lab[:, 2], lab[:, 1])) % 360
+        return np.column_stack([lab[:, 0], np.hypot(lab[:, 1], lab[:, 2]), hue])
+    return [(L, math.hypot(a, b), math.degrees(math.atan2(b, a)) % 360) for L, a, b in lab]
+
+
+def oklch_to_oklab(lch):
+    if np is not None:
+        lch = _array(lch, 3)
+        hue = np.radians(lch[:, 2])
+        return np.column_stack([lch[:, 0], lch[:, 1] * np.cos(hue), lch[:, 1] * np.sin(hue)])
+    return [(L, C * math.cos(math.radians(h)), C * math.sin(math.radians(h))) for L, C, h in lch]
+
+
+def rgba8_to_oklab(rgba8):
+    return linear_to_oklab(srgb_to_linear(to_unit(rgba8)))
+
+
+def oklab_to_rgb8(lab):
+    """Gamut-clipped rgb8 rows for OKLab rows."""
+    return quantize(linear_to_srgb(oklab_to_linear(lab)))
+
+
+def rgba8_to_oklch(rgba8):
+    return oklab_to_oklch(rgba8_to_oklab(rgba8))
+
+
+def oklch_to_rgb8(lch):
+    return oklab_to_rgb8(oklch_to_oklab(lch))
+
+
+# Linear RGB this far outside 0-1 still counts as in gamut (matrix round-off at the edges).
+_GAMUT_EPSILON = 1e-6
+
+
+def _in_gamut(linear: Sequence[float]) -> bool:
+    return all(-_GAMUT_EPSILON <= c <= 1 + _GAMUT_EPSILON for c in linear)
+
+
+def gamut_map_oklch(lch, iterations: int = 24):
+    """
+    OKLCH rows brought into the sRGB gamut by reducing chroma alone.
+
+    Lightness is clamped to 0-1 and hue kept, so a ramp step keeps the lightness
+    it was designed with; chroma is bisected (``iterations`` halvings, all rows
+    at once) to the most saturated color sRGB can show at that lightness and hue.
+    """
+    if np is not None:
+        lch = _array(lch, 3).copy()
+        lch[:, 0] = np.clip(lch[:, 0], 0.0, 1.0)
+
+        def inside(rows_lch):
+            linear = oklab_to_linear(oklch_to_oklab(rows_lch))
+            return ((linear >= -_GAMUT_EPSILON) & (linear <= 1 + _GAMUT_EPSILON)).all(axis=1)
+
+        outside = np.nonzero(~inside(lch))[0]
+        if len(outside):
+            rows_lch = lch[outside]
+            low, high = np.zeros(len(outside)), rows_lch[:, 1].copy()
+            for _ in range(iterations):
+                rows_lch[:, 1] = (low + high) / 2
+                fits = inside(rows_lch)
+                low = np.where(fits, rows_lch[:, 1], low)
+                high = np.where(fits, high, rows_lch[:, 1])
+            lch[outside, 1] = low
+        return lch
+    out = []
+    for L, C, h in lch:
+        L = min(1.0, max(0.0, L))
+        if not _in_gamut(oklab_to_linear(oklch_to_oklab([(L, C, h)]))[0]):
+            low, high = 0.0, C
+            for _ in range(iterations):
+                mid = (low + high) / 2
+                if _in_gamut(oklab_to_linear(oklch_to_oklab([(L, mid, h)]))[0]):
+                    low = mid
+                else:
+                    high = mid
+            C = low
+        out.append((L, C, h))
+    return out
+
+
+# --- Spatial queries ----------------------------------------------------------------
+
+# The 13 neighbouring grid cells "after" a cell, so each pair of cells is visited once.
+_FORWARD_CELLS = tuple(
+    (dx, dy, dz)
+    for dx in (-1, 0, 1)
+    for dy in (-1, 0, 1)
+    for dz in (-1, 0, 1)
+    if (dx, dy, dz) > (0, 0, 0)
+)
+
+
+def pairs_within(points, radius: float, groups: Optional[Sequence[int]] = None) -> tuple:
+    """
+    ``(i, j, distance)`` for every pair of 3-D ``points`` at most ``radius`` apart, i < j.
+
+    Points are bucketed into a grid of ``radius``-sized cells, so only points in the
+    same or adjacent cells are ever compared: close to linear for sparse inputs
+    instead of quadratic. With ``groups``, only points of the same group pair up.
+    Returns three parallel lists sorted by (i, j).
+    """
+    if radius <= 0:
+        raise ValueError("radius must be positive")
+    if np is not None:
+        i, j, distance = _pairs_within_np(_array(points, 3)[:, :3], radius, groups)
+        ranked = np.lexsort((j, i))
+        return i[ranked].tolist(), j[ranked].tolist(), distance[ranked].tolist()
+    cells = {}
+    for index, point in enumerate(points):
+        key = (groups[index] if groups is not None else 0,) + tuple(math.floor(c / radius) for c in point[:3])
+        cells.setdefault(key, []).append(index)
+    found = []
+    for key, members in cells.items():
+        for n, i in enumerate(members):
+            for j in members[n + 1 :]:
+                found.append((i, j))
+        for offset in _FORWARD_CELLS:
+            others = cells.get((key[0], key[1] + offset[0], key[2] + offset[1], key[3] + offset[2]))
+            if others:
+                found.extend((i, j) for i in members for j in others)
+    out = []
+    for i, j in found:
+        if i > j:
+            i, j = j, i
+        p, q = points[i], points[j]
+        dx, dy, dz = p[0] - q[0], p[1] - q[1], p[2] - q[2]
+        distance = math.sqrt(dx * dx + dy * dy + dz * dz)
+        if distance <= radius:
+            out.append((i, j, distance))
+    out.sort()
+    return [i for i, _, _ in out], [j for _, j, _ in out], [d for _, _, d in out]
+
+
+def _pairs_within_np(points, radius: float, groups) -> tuple:
+    """``pairs_within`` as unordered int/float arrays."""
+    empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0))
+    if not len(points):
+        return empty
+    coords = np.floor(points / radius).astype(np.int64)
+    coords -= coords.min(axis=0) - 1  # leaves a margin of one empty cell on every side
+    dims = coords.max(axis=0) + 2
+    group = np.zeros(len(points), dtype=np.int64) if groups is None else np.asarray(groups, dtype=np.int64)
+    keys = ((group * dims[0] + coords[:, 0]) * dims[1] + coords[:, 1]) * dims[2] + coords[:, 2]
+    order = np.argsort(keys, kind="stable")
+    cell_keys, starts, sizes = np.unique(keys[order], return_index=True, return_counts=True)
+
+    first, second = [], []
+    for offset in ((0, 0, 0),) + _FORWARD_CELLS:
+        shift = (offset[0] * dims[1] + offset[1]) * dims[2] + offset[2]
+        at = np.searchsorted(cell_keys, cell_keys + shift)
+        hit = at < len(cell_keys)
+        hit[hit] = cell_keys[at[hit]] == cell_keys[hit] + shift
+        a, b = np.nonzero(hit)[0], at[hit]
+        if not len(a):
+            continue
+        # Every point of cell a against every point of cell b, expanded without a Python loop.
+        counts = sizes[a] * sizes[b]
+        block = np.repeat(np.arange(len(a)), counts)
+        k = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        i = starts[a][block] + k // sizes[b][block]
+        j = starts[b][block] + k % sizes[b][block]
+        if offset == (0, 0, 0):
+            keep = i < j
+            i, j = i[keep], j[keep]
+        first.append(order[i])
+        second.append(order[j])
+    if not first:
+        return empty
+    i, j = np.concatenate(first), np.concatenate(second)
+    i, j = np.minimum(i, j), np.maximum(i, j)
+    delta = points[i] - points[j]
+    distance = np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1] + delta[:, 2] * delta[:, 2])
+    keep = distance <= radius
+    return i[keep], j[keep], distance[keep]
+
+
+def neighbours_within(points, radius: float, groups: Optional[Sequence[int]] = None) -> tuple:
+    """
+    ``pairs_within`` as per-point neighbour lists, in CSR form.
+
+    Returns ``(offsets, neighbours, distances)``: the neighbours of point ``p`` are
+    ``neighbours[offsets[p]:offsets[p + 1]]``, in ascending order, and
+    ``distances`` is parallel to ``neighbours``.
+    """
+    if np is not None:
+        first, second, distances = _pairs_within_np(_array(points, 3)[:, :3], radius, groups)
+        nodes = np.concatenate([first, second])
+        others = np.concatenate([second, first])
+        order = np.lexsort((others, nodes))
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(nodes, minlength=len(points)))])
+        return offsets.tolist(), others[order].tolist(), np.concatenate([distances, distances])[order].tolist()
+    first, second, distances = pairs_within(points, radius, groups)
+    lists = [[] for _ in range(len(points))]
+    for i, j, distance in zip(first, second, distances):
+        lists[i].append((j, distance))
+        lists[j].append((i, distance))
+    offsets = [0]
+    neighbours = []
+    spans = []
+    for entries in lists:
+        entries.sort()
+        neighbours.extend(j for j, _ in entries)
+        spans.extend(distance for _, distance in entries)
+        offsets.append(len(neighbours))
+    return offsets, neighbours, spans
+
+
+# --- Clustering ---------------------------------------------------------------------
+
+# Rows per block when measuring every point against every center, bounding memory.
+_NEAREST_BLOCK = 8192
+
+
+def _squared(p: Sequence[float], q: Sequence[float]) -> float:
+    dx, dy, dz = p[0] - q[0], p[1] - q[1], p[2] - q[2]
+    return dx * dx + dy * dy + dz * dz
+
+
+def _weighted_mean(points, weights, members: Sequence[int]) -> tuple:
+    total = sum(weights[i] for i in members)
+    return tuple(sum(weights[i] * points[i][d] for i in members) / total for d in range(3))
+
+
+def nearest_centers(points, centers) -> tuple:
+    """``(labels, distances)``: the closest of ``centers`` to every 3-D point (ties to the lower index)."""
+    if np is not None:
+        points, centers = _array(points, 3)[:, :3], _array(centers, 3)[:, :3]
+        labels = np.zeros(len(points), dtype=np.int64)
+        squared = np.zeros(len(points))
+        for start in range(0, len(points), _NEAREST_BLOCK):
+            block = points[start : start + _NEAREST_BLOCK, None, :] - centers[None, :, :]
+            d2 = block[:, :, 0] * block[:, :, 0] + block[:, :, 1] * block[:, :, 1] + block[:, :, 2] * block[:, :, 2]
+            labels[start : start + len(d2)] = d2.argmin(axis=1)
+            squared[start : start + len(d2)] = d2.min(axis=1)
+        return labels.tolist(), np.sqrt(squared).tolist()
+    labels, distances = [], []
+    for point in points:
+        best, label = min((_squared(point, center), k) for k, center in enumerate(centers))
+        labels.append(label)
+        distances.append(math.sqrt(best))
+    return labels, distances
+
+
+def median_cut(points, weights: Sequence[float], tolerance: float, max_boxes: int) -> list:
+    """
+    Labels splitting 3-D ``points`` into at most ``max_boxes`` boxes by weighted median cut.
+
+    The box with the point farthest from its weighted mean is split across its longest
+    axis at the weighted median, until every point is within ``tolerance`` of its box's
+    mean or there are ``max_boxes`` boxes. Fully deterministic: no random seeding.
+    """
+    if np is not None:
+        points, weights = _array(points, 3)[:, :3], np.asarray(weights, dtype=np.float64)
+
+        def error(box):
+            mean = (points[box] * weights[box, None]).sum(axis=0) / weights[box].sum()
+            return float(np.sqrt(((points[box] - mean) ** 2).sum(axis=1)).max())
+
+        def split(box):
+            axis = int((points[box].max(axis=0) - points[box].min(axis=0)).argmax())
+            box = box[np.argsort(points[box, axis], kind="stable")]
+            cumulative = np.cumsum(weights[box])
+            cut = int(np.searchsorted(cumulative, cumulative[-1] / 2)) + 1
+            cut = min(max(cut, 1), len(box) - 1)
+            return box[:cut], box[cut:]
+
+        boxes = [np.arange(len(points))] if len(points) else []
+    else:
+        points = [tuple(point[:3]) for point in points]
+
+        def error(box):
+            mean = _weighted_mean(points, weights, box)
+            return math.sqrt(max(_squared(points[i], mean) for i in box))
+
+        def split(box):
+            axis = max(range(3), key=lambda d: (max(points[i][d] for i in box) - min(points[i][d] for i in box), -d))
+            box = sorted(box, key=lambda i: points[i][axis])
+            cumulative, half = 0.0, sum(weights[i] for i in box) / 2
+            cut = len(box)
+            for n, i in enumerate(box):
+                cumulative += weights[i]
+                if cumulative >= half:
+                    cut = n + 1
+                    break
+            cut = min(max(cut, 1), len(box) - 1)
+            return box[:cut], box[cut:]
+
+        boxes = [list(range(len(points)))] if points else []
+
+    errors = [error(box) for box in boxes]
+    while 0 < len(boxes) < max_boxes:
+        worst = max(range(len(boxes)), key=lambda b: (errors[b], -b))
+        if errors[worst] <= tolerance or len(boxes[worst]) < 2:
+            break
+        left, right = split(boxes[worst])
+        boxes[worst], errors[worst] = left, error(left)
+        boxes.append(right)
+        errors.append(error(right))
+    labels = [0] * len(points)
+    for label, box in enumerate(boxes):
+        for i in box.tolist() if np is not None else box:
+            labels[i] = label
+    return labels
+
+
+def kmeans(points, weights: Sequence[float], labels: Sequence[int], iterations: int) -> tuple:
+    """
+    ``(labels, centers)`` after up to ``iterations`` weighted Lloyd steps from ``labels``.
+
+    Seeding from a deterministic partition (``median_cut``) keeps results identical
+    run to run. Stops early once no point changes cluster; a cluster left empty
+    keeps its previous center.
+    """
+    count = max(labels) + 1 if len(labels) else 0
+    labels = list(labels)
+    centers = [None] * count
+    if np is not None:
+        array, w = _array(points, 3)[:, :3], np.asarray(weights, dtype=np.float64)
+    while True:
+        if np is not None:
+            ids = np.asarray(labels, dtype=np.int64)
+            totals = np.bincount(ids, weights=w, minlength=count)
+            sums = [np.bincount(ids, weights=w * array[:, d], minlength=count) for d in range(3)]
+            for k in np.nonzero(totals)[0].tolist():
+                centers[k] = (sums[0][k] / totals[k], sums[1][k] / totals[k], sums[2][k] / totals[k])
+        else:
+            members = [[] for _ in range(count)]
+            for i, label in enumerate(labels):
+                members[label].append(i)
+            for k, box in enumerate(members):
+                if box:
+                    centers[k] = _weighted_mean(points, weights, box)
+        if iterations <= 0:
+            return labels, centers
+        iterations -= 1
+        updated, _ = nearest_centers(points, centers)
+        if updated == labels:
+            return labels, centers
+        labels = updated
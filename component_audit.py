@@ -0,0 +1,149 @@
+import itertools
+import math
+import re
+from typing import Optional
+
+from audit_scoring import INTERACTIVE_WORDS
+
+# State variants every interactive component needs (ds-refactor-agent SKILL.md, section 6).
+REQUIRED_STATES = ("default", "hover", "focus", "disabled", "loading", "error", "skeleton")
+STATE_ALIASES = {
+    "rest": "default",
+    "enabled": "default",
+    "normal": "default",
+    "idle": "default",
+    "hovered": "hover",
+    "focused": "focus",
+    "focus-visible": "focus",
+    "inactive": "disabled",
+    "busy": "loading",
+    "invalid": "error",
+    "placeholder": "skeleton",
+}
+# Variant properties that hold a component's interaction state.
+STATE_PROPERTIES = ("state", "states", "status", "interaction")
+# Missing variant combinations listed per component; the count covers all of them.
+MAX_REPORTED_COMBINATIONS = 20
+
+
+def _words(name: str) -> set:
+    return set(re.findall(r"[a-z]+", re.sub(r"(?<=[a-z])(?=[A-Z])", " ", name).lower()))
+
+
+def _state_property(properties: dict) -> Optional[str]:
+    return next((name for name in properties if name.strip().lower() in STATE_PROPERTIES), None)
+
+
+def _state(value: str) -> str:
+    value = value.strip().lower()
+    return STATE_ALIASES.get(value, value)
+
+
+def variant_gap(component: dict) -> Optional[dict]:
+    """
+    Missing interaction states and variant combinations of one ComponentNode, or None.
+
+    States are checked for components named like a control (button, input, link...)
+    and for any component set that already has a state property. Combinations are
+    the variant property values that exist but are never combined in one variant.
+    """
+    properties = component["variant_properties"]
+    state_property = _state_property(properties)
+    missing_states = []
+    if state_property or _words(component["name"]) & INTERACTIVE_WORDS:
+        # A component without a state property is its own default state.
+        states = {_state(value) for value in properties[state_property]} if state_property else {"default"}
+        missing_states = [state for state in REQUIRED_STATES if state not in states]
+
+    missing, examples = 0, []
+    if properties:
+        names = list(properties)
+        present = {tuple(variant.get(name) for name in names) for variant in component["variants"]}
+        valid = {combo for combo in present if all(value in properties[n] for n, value in zip(names, combo))}
+        # Counted rather than enumerated: a few properties with many values multiply quickly.
+        missing = math.prod(len(values) for values in properties.values()) - len(valid)
+        combinations = (combo for combo in itertools.product(*properties.values()) if combo not in present)
+        examples = [
+            ", ".join(f"{name}={value}" for name, value in zip(names, combo))
+            for combo in itertools.islice(combinations, MAX_REPORTED_COMBINATIONS)
+        ]
+    if not missing_states and not missing and not component["unnamed_variants"]:
+        return None
+
+    actions = []
+    if missing_states:
+        actions.append(
+            f"Add variant property '{state_property or 'state'}' with values: {', '.join(missing_states)}"
+        )
+    if missing:
+        actions.append(f"Add missing variant combinations ({missing})")
+    if component["unnamed_variants"]:
+        actions.append("Rename variants to 'Property=Value' pairs")
+    return {
+        "component": component["name"],
+        "node_id": component["id"],
+        "missing_states": missing_states,
+        "missing_combinations": missing,
+        "missing_combination_examples": examples,
+        "unnamed_variants": component["unnamed_variants"],
+        "recommended_action": "; ".join(actions),
+    }
+
+
+def find_variant_gaps(components: dict) -> list:
+    """``variant-gaps.json`` entries for ``{name: ComponentNode}``, in name order."""
+    gaps = (variant_gap(components[name]) for name in sorted(components))
+    return [gap for gap in gaps if gap is not None]
+
+
+def _px(value) -> Optional[float]:
+    match = re.fullmatch(r"\s*(-?\d+(?:\.\d+)?)\s*(px)?\s*", str(value))
+    return float(match.group(1)) if match else None
+
+
+def spacing_token(spacing: dict, value: Optional[float]) -> Optional[str]:
+    """The ``spacing.<step>`` token nearest ``value`` px in a proposed spacing scale."""
+    steps = [(px, name) for name, token in spacing.items() if (px := _px(token.get("value"))) is not None]
+    if value is None or not steps:
+        return None
+    return f"spacing.{min(steps, key=lambda step: (abs(step[0] - value), step[0]))[1]}"
+
+
+def find_auto_layout_fixes(components: dict, spacing: dict) -> list:
+    """
+    ``auto-layout-fixes.json`` entries for ``{name: ComponentNode}``: components and
+    variants with several children but no auto-layout (the fix keeps the axis,
+    spacing and alignment they are drawn with), and auto-layouts with absolutely
+    positioned children. ``spacing`` is the proposed spacing scale.
+    """
+    fixes = []
+    for name in sorted(components):
+        component = components[name]
+        for layout in component["layouts"]:
+            target = name if component["type"] == "COMPONENT" else f"{name} / {layout['name']}"
+            if layout["layout_mode"] == "NONE" and layout["children"] >= 2 and layout["axis"]:
+                fixes.append(
+                    {
+                        "target": target,
+                        "node_id": component["id"],
+                        "issue": "Missing auto-layout",
+                        "fix": {
+                            "layoutMode": layout["axis"],
+                            "primaryAxisAlignItems": "MIN",
+                            "counterAxisAlignItems": layout["counter_align"],
+                            "itemSpacing": spacing_token(spacing, layout["item_spacing"]),
+                        },
+                        "measured_item_spacing": layout["item_spacing"],
+                    }
+                )
+            elif layout["absolute_children"]:
+                fixes.append(
+                    {
+                        "target": target,
+                        "node_id": component["id"],
+                        "issue": "Absolute positioning inside auto-layout",
+                        "fix": {"layoutPositioning": "AUTO"},
+                        "absolute_children": layout["absolute_children"],
+                    }
+                )
+    return fixes
@@ -0,0 +1,189 @@
+import json
+import re
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from color_kernel import contrast_matrix, flatten_unit, is_hex_color, pairs_below, parse_hex, to_unit
+
+WCAG_PROFILE_PATH = Path(".agent") / "skills" / "ds-audit-agent" / "wcag-profile-customer-v1.json"
+
+# Failing pairs listed per theme, worst first; the counts always cover every pair.
+MAX_REPORTED_PAIRS = 200
+
+# Token roles, guessed from the words of a token name; the first match wins.
+BACKGROUND_WORDS = frozenset({"background", "bg", "surface", "canvas", "page", "container", "backdrop"})
+TEXT_WORDS = frozenset({"text", "foreground", "fg", "label", "content", "heading", "title", "body"})
+LINE_WORDS = frozenset({"border", "divider", "stroke", "outline", "icon", "separator"})
+
+# Which foreground roles are checked against backgrounds, and as what.
+ROLE_USAGE = (("text", "text"), ("line", "non-text"), ("accent", "non-text"))
+
+CANVAS = {"light": (1.0, 1.0, 1.0), "dark": (0.0, 0.0, 0.0)}
+CANVAS_HEX = {"light": "#ffffff", "dark": "#000000"}
+
+
+class ContrastPolicy(NamedTuple):
+    profile_name: str = "wcag_default_aa"
+    target_level: str = "AA"
+    text_min_ratio: float = 4.5
+    large_text_min_ratio: float = 3.0  # also the WCAG 1.4.11 minimum for non-text UI
+    aaa_text_ratio: float = 7.0
+    enforce_aaa: bool = False
+    dark_mode_required: bool = False
+    dark_must_hold: bool = True
+
+    def minimums(self, usage: str, aaa: bool) -> float:
+        """Required ratio for a pair; AAA asks 7:1 of body text and 4.5:1 of large text."""
+        if usage == "non-text":
+            return self.text_min_ratio if aaa else self.large_text_min_ratio
+        return self.aaa_text_ratio if aaa else self.text_min_ratio
+
+
+def load_contrast_policy(base_dir: Path) -> ContrastPolicy:
+    """The workspace's WCAG profile, or plain WCAG AA when it has none."""
+    path = base_dir / WCAG_PROFILE_PATH
+    if not path.exists():
+        return ContrastPolicy()
+    with path.open("r") as f:
+        profile = json.load(f)
+    defaults = ContrastPolicy()
+    contrast = profile.get("contrast_rules", {})
+    dark = profile.get("dark_mode_rules", {})
+    return ContrastPolicy(
+        profile_name=profile.get("profile_name", defaults.profile_name),
+        target_level=profile.get("target_level", defaults.target_level),
+        text_min_ratio=float(contrast.get("body_text_min_ratio", defaults.text_min_ratio)),
+        large_text_min_ratio=float(contrast.get("large_text_min_ratio", defaults.large_text_min_ratio)),
+        aaa_text_ratio=float(contrast.get("aaa_ratio_reference", defaults.aaa_text_ratio)),
+        enforce_aaa=bool(contrast.get("enforce_aaa", profile.get("target_level") == "AAA")),
+        dark_mode_required=bool(dark.get("dark_mode_required", defaults.dark_mode_required)),
+        dark_must_hold=bool(dark.get("contrast_must_hold_in_dark_mode", defaults.dark_must_hold)),
+    )
+
+
+def token_role(name: str) -> str:
+    """``background``, ``text``, ``on_color`` (text on accents), ``line`` or ``accent``."""
+    words = set(re.findall(r"[a-z]+", name.lower()))
+    words |= {word[:-1] for word in words if word.endswith("s")}
+    if words & BACKGROUND_WORDS:
+        return "background"
+    if words & TEXT_WORDS:
+        return "on_color" if "on" in words else "text"
+    if words & LINE_WORDS:
+        return "line"
+    return "accent"
+
+
+def dark_mode_name(design_tokens: dict) -> Optional[str]:
+    return next((name for name in design_tokens.get("modes", {}) if "dark" in name.lower()), None)
+
+
+def theme_colors(design_tokens: dict) -> dict:
+    """``{theme: {token name: hex}}``: the default colors, plus a dark mode's overrides merged over them."""
+    colors = {name: value for name, value in design_tokens.get("colors", {}).items() if is_hex_color(value)}
+    themes = {"light": colors}
+    dark = dark_mode_name(design_tokens)
+    if dark is not None:
+        overrides = design_tokens["modes"][dark]
+        themes["dark"] = {**colors, **{name: value for name, value in overrides.items() if is_hex_color(value)}}
+    return themes
+
+
+def _check_theme(theme: str, colors: dict, policy: ContrastPolicy) -> dict:
+    """Counts and worst failing pairs of one theme: every foreground against every background at once."""
+    roles = {}
+    for name in colors:
+        roles.setdefault(token_role(name), []).append(name)
+    unit = dict(zip(colors, to_unit(parse_hex(list(colors.values())))))
+    canvas = CANVAS[theme]
+    # Translucent surfaces sit on the theme's canvas; with no surfaces, the canvas is the background.
+    surfaces = roles.get("background") or []
+    surface_values = flatten_unit([unit[name] for name in surfaces], canvas) if surfaces else [canvas]
+    surfaces = surfaces or ["(canvas)"]
+    accents = roles.get("accent", [])
+
+    # One matrix per kind of background: ((name, usage) foregrounds, background names, opaque rows).
+    on_surfaces = [(name, usage) for role, usage in ROLE_USAGE for name in roles.get(role, [])]
+    checks = [(on_surfaces, surfaces, surface_values)]
+    if accents:
+        on_accents = [(name, "text-on-color") for name in roles.get("on_color", [])]
+        checks.append((on_accents, accents, flatten_unit([unit[name] for name in accents], canvas)))
+
+    pairs = aa_failures = aaa_failures = 0
+    worst = []  # (ratio, foreground, background, usage, required)
+    for foregrounds, backgrounds, background_values in checks:
+        if not foregrounds:
+            continue
+        ratios = contrast_matrix([unit[name] for name, _ in foregrounds], background_values)
+        aa_required = [policy.minimums(usage, False) for _, usage in foregrounds]
+        aaa_required = [policy.minimums(usage, True) for _, usage in foregrounds]
+        # Only the enforced level's pairs are listed; the other one is just counted.
+        aa_count, aa_worst = pairs_below(ratios, aa_required, 0 if policy.enforce_aaa else MAX_REPORTED_PAIRS)
+        aaa_count, aaa_worst = pairs_below(ratios, aaa_required, MAX_REPORTED_PAIRS if policy.enforce_aaa else 0)
+        pairs += len(foregrounds) * len(backgrounds)
+        aa_failures += aa_count
+        aaa_failures += aaa_count
+        required = aaa_required if policy.enforce_aaa else aa_required
+        for i, j, ratio in aaa_worst if policy.enforce_aaa else aa_worst:
+            name, usage = foregrounds[i]
+            worst.append((ratio, name, backgrounds[j], usage, required[i]))
+
+    worst.sort()
+    failing = [
+        {
+            "theme": theme,
+            "foreground": foreground,
+            "foreground_value": colors[foreground],
+            "background": background,
+            "background_value": colors.get(background, CANVAS_HEX[theme]),
+            "usage": usage,
+            "ratio": round(ratio, 2),
+            "required_ratio": required,
+        }
+        for ratio, foreground, background, usage, required in worst[:MAX_REPORTED_PAIRS]
+    ]
+    return {
+        "pairs": pairs,
+        "aa_failures": aa_failures,
+        "aaa_failures": aaa_failures,
+        "violations": aaa_failures if policy.enforce_aaa else aa_failures,
+        "failing": failing,
+    }
+
+
+def _pass_rate(pairs: int, failures: int) -> Optional[float]:
+    return round(100.0 * (pairs - failures) / pairs, 1) if pairs else None
+
+
+def audit_contrast(design_tokens: dict, policy: ContrastPolicy) -> dict:
+    """
+    The ``accessibility`` section of ``audit-report.json``.
+
+    Every text, line and accent color is checked against every background color,
+    and text-on-color tokens against every accent, in the light theme and in the
+    dark mode (if the tokens have one and the profile asks for it). Required ratios
+    come from ``policy``; AA and AAA pass rates are both reported either way.
+    """
+    themes = theme_colors(design_tokens)
+    if not policy.dark_must_hold:
+        themes.pop("dark", None)
+    results = {theme: _check_theme(theme, colors, policy) for theme, colors in themes.items()}
+    pairs = sum(result["pairs"] for result in results.values())
+    failing = [pair for result in results.values() for pair in result["failing"]]
+    violations = sum(result["violations"] for result in results.values())
+    return {
+        "wcag_profile": policy.profile_name,
+        "wcag_target": policy.target_level,
+        "enforce_wcag_aaa": policy.enforce_aaa,
+        "theme_modes_checked": list(results),
+        "dark_mode": dark_mode_name(design_tokens),
+        "dark_mode_required": policy.dark_mode_required,
+        "dark_mode_missing": policy.dark_mode_required and dark_mode_name(design_tokens) is None,
+        "pairs_checked": pairs,
+        "wcag_AA_pass_rate_percent": _pass_rate(pairs, sum(r["aa_failures"] for r in results.values())),
+        "wcag_AAA_pass_rate_percent": _pass_rate(pairs, sum(r["aaa_failures"] for r in results.values())),
+        "contrast_violations": violations,
+        "dark_mode_failures": results["dark"]["violations"] if "dark" in results else 0,
+        "failing_pairs": failing,
+        "failing_pairs_truncated": len(failing) < violations,
+    }
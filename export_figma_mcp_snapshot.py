@@ -5,6 +5,10 @@ from pathlib import Path
 from typing import Optional
 from urllib.parse import parse_qs, urlparse
 
+from color_kernel import figma_to_hex, is_hex_color
+from figma_styles import parse_style_exports
+from pipeline_io import locked, write_json
+
 
 def extract_figma_parts(figma_url: str):
     file_match = re.search(r"/design/([^/]+)/", figma_url)
@@ -14,21 +18,6 @@ def extract_figma_parts(figma_url: str):
     return file_id, node_id
 
 
-def is_hex_color(value: str) -> bool:
-    return isinstance(value, str) and re.match(r"^#[0-9a-fA-F]{6}([0-9a-fA-F]{2})?$", value) is not None
-
-
-def rgba_dict_to_hex(rgba: dict) -> str:
-    r = int(round(float(rgba.get("r", 0)) * 255))
-    g = int(round(float(rgba.get("g", 0)) * 255))
-    b = int(round(float(rgba.get("b", 0)) * 255))
-    a = float(rgba.get("a", 1.0))
-    if a < 1:
-        alpha = int(round(a * 255))
-        return f"#{r:02x}{g:02x}{b:02x}{alpha:02x}"
-    return f"#{r:02x}{g:02x}{b:02x}"
-
-
 def parse_variable_defs_text(raw_text: str) -> dict:
     """
     Supports simplified outputs like:
@@ -57,6 +46,8 @@ def parse_payload(payload: dict) -> dict:
                 colors[name.replace(".", "/")] = value.lower()
 
     collections = payload.get("collections", {})
+    names = []
+    rgba_values = []
     if isinstance(collections, dict):
         for collection in collections.values():
             for var in collection.get("variables", []):
@@ -66,9 +57,12 @@ def parse_payload(payload: dict) -> dict:
                     continue
                 first_mode_value = next(iter(values_by_mode.values()))
                 if isinstance(first_mode_value, dict) and all(k in first_mode_value for k in ("r", "g", "b")):
-                    colors[name.replace(".", "/")] = rgba_dict_to_hex(first_mode_value)
+                    names.append(name.replace(".", "/"))
+                    rgba_values.append(first_mode_value)
+    colors.update(zip(names, figma_to_hex(rgba_values)))
 
-    return {"colors": colors, "typography": {}, "effects": {}}
+    typography, effects = parse_style_exports(payload)
+    return {"colors": colors, "typography": typography, "effects": effects}
 
 
 def load_input_data(input_json: Optional[Path], input_text: Optional[Path]) -> dict:
@@ -123,12 +117,15 @@ def main():
         **normalized,
     }
 
-    target.write_text(json.dumps(wrapped, indent=2))
-    latest.write_text(json.dumps(wrapped, indent=2))
+    write_json(target, wrapped)
+    # Several exports may target one snapshot directory; serialize updates of the shared pointer.
+    with locked(latest):
+        write_json(latest, wrapped)
 
     print(f"Exported snapshot: {target}")
     print(f"Updated latest: {latest}")
     print(f"Color variables: {len(normalized.get('colors', {}))}")
+    print(f"Text styles: {len(normalized.get('typography', {}))}, effect styles: {len(normalized.get('effects', {}))}")
 
 
 if __name__ == "__main__":
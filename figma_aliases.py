@@ -0,0 +1,101 @@
+from typing import Mapping, NamedTuple, Optional
+
+
+class VariableRecord(NamedTuple):
+    name: Optional[str]
+    collection_id: Optional[str]
+    values_by_mode: Mapping
+
+
+class ResolvedVariable(NamedTuple):
+    value: object  # the first non-alias value reached; None when unresolved
+    chain: tuple  # variable names from the requested variable to the one holding ``value``
+    error: Optional[str] = None  # "cycle" or "missing:<variable id>"
+
+
+def is_variable_alias(value) -> bool:
+    return isinstance(value, dict) and value.get("type") == "VARIABLE_ALIAS" and "id" in value
+
+
+class AliasResolver:
+    """
+    Resolves ``VARIABLE_ALIAS`` chains over an id → VariableRecord index.
+
+    An alias within one collection keeps the current mode; one into another
+    collection continues in that collection's default mode, as Figma does for
+    nodes without an explicit mode. Every (variable, mode) is walked at most once:
+    results are memoized, and a variable met again on the walk that reached it is
+    a cycle, so resolving everything is O(V + E).
+    """
+
+    def __init__(self, variables: Mapping, default_mode_by_collection: Mapping):
+        self._variables = variables
+        self._default_modes = default_mode_by_collection
+        self._memo: dict = {}
+        self.cycles: list = []
+
+    def _mode_for(self, var_id: str, mode_id: Optional[str], from_collection: Optional[str]) -> Optional[str]:
+        var = self._variables.get(var_id)
+        if var is None or not var.values_by_mode:
+            return mode_id
+        if mode_id in var.values_by_mode and (from_collection is None or from_collection == var.collection_id):
+            return mode_id
+        default_mode = self._default_modes.get(var.collection_id)
+        if default_mode in var.values_by_mode:
+            return default_mode
+        return next(iter(var.values_by_mode))
+
+    def _name(self, var_id: str) -> str:
+        var = self._variables.get(var_id)
+        return var.name if var is not None and var.name else var_id
+
+    def resolve(self, var_id: str, mode_id: Optional[str] = None) -> ResolvedVariable:
+        start = (var_id, self._mode_for(var_id, mode_id, None))
+        self._walk(start)
+        value, error, _ = self._memo[start]
+        return ResolvedVariable(value, self._chain(start), error)
+
+    def _walk(self, start: tuple):
+        # Memo entries are (value, error, next node); chains are rebuilt from the links
+        # on demand, so memory stays linear even for long chains.
+        path = []
+        on_path = {}
+        successors = {}
+        node = start
+        while node not in self._memo:
+            var = self._variables.get(node[0])
+            if var is None:
+                self._memo[node] = (None, f"missing:{node[0]}", None)
+                break
+            if node in on_path:
+                cycle = path[on_path[node] :]
+                for i, member in enumerate(cycle):
+                    self._memo[member] = (None, "cycle", cycle[(i + 1) % len(cycle)])
+                self.cycles.append(tuple(self._name(member_id) for member_id, _ in cycle))
+                del path[on_path[node] :]
+                break
+            value = var.values_by_mode.get(node[1])
+            if not is_variable_alias(value):
+                self._memo[node] = (value, None, None)
+                break
+            on_path[node] = len(path)
+            path.append(node)
+            target_id = value["id"]
+            target = (target_id, self._mode_for(target_id, node[1], var.collection_id))
+            successors[node] = target
+            node = target
+
+        for member in reversed(path):
+            value, error, _ = self._memo[successors[member]]
+            self._memo[member] = (value, error, successors[member])
+
+    def _chain(self, node: tuple) -> tuple:
+        names = []
+        seen = set()
+        while node is not None:
+            names.append(self._name(node[0]))
+            if node in seen:
+                break
+            seen.add(node)
+            node = self._memo[node][2]
+        return tuple(names)
@@ -0,0 +1,167 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional
+
+from figma_http import FigmaHttpClient
+from pipeline_io import evict_least_recently_used, write_json
+
+CACHE_DIR_NAME = ".figma-cache"
+DEFAULT_TTL_SECONDS = 60
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class HttpCache:
+    """
+    On-disk cache of Figma REST responses, keyed by URL and API token.
+
+    Each entry keeps the raw body, its ``ETag``/``Last-Modified`` validators and the
+    caller's parsed result. Entries younger than ``ttl_seconds`` are served without
+    a request; older ones are revalidated with a conditional GET. Once the cache
+    grows past ``max_bytes`` the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir: Path, ttl_seconds: float = DEFAULT_TTL_SECONDS, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+    def key(self, url: str, api_token: str) -> str:
+        return hashlib.sha256(f"{api_token}\n{url}".encode("utf-8")).hexdigest()
+
+    def _meta_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.meta.json"
+
+    def _body_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.body"
+
+    def load(self, key: str) -> Optional[dict]:
+        try:
+            meta = json.loads(self._meta_path(key).read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+        self._touch(key)
+        return meta
+
+    def open_body(self, key: str) -> Optional[BinaryIO]:
+        try:
+            return self._body_path(key).open("rb")
+        except OSError:
+            return None
+
+    @contextmanager
+    def spool(self):
+        """Temp file in the cache directory that ``store`` can move into place without copying."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, name = tempfile.mkstemp(dir=self.cache_dir, prefix=".spool-", suffix=".tmp")
+        os.close(fd)
+        try:
+            yield Path(name)
+        finally:
+            Path(name).unlink(missing_ok=True)
+
+    def store(self, key: str, url: str, headers: dict, body: Optional[Path], parsed, parse_version: str):
+        """Body first, then metadata, so a readable entry always has its body on disk."""
+        if body is not None:
+            os.replace(body, self._body_path(key))
+        meta = {
+            "url": url,
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "validated_at": time.time(),
+            "parse_version": parse_version,
+            "parsed": parsed,
+        }
+        write_json(self._meta_path(key), meta)
+        self._evict()
+
+    def is_fresh(self, meta: dict) -> bool:
+        return time.time() - meta.get("validated_at", 0) < self.ttl_seconds
+
+    def _touch(self, key: str):
+        try:
+            os.utime(self._meta_path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        entries = []
+        for meta_path in self.cache_dir.glob("*.meta.json"):
+            key = meta_path.name[: -len(".meta.json")]
+            try:
+                stat = meta_path.stat()
+                size = stat.st_size + self._body_path(key).stat().st_size
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, size, (self._meta_path(key), self._body_path(key))))
+        evict_least_recently_used(entries, self.max_bytes)
+
+
+def parse_spooled(spool: BinaryIO, parse: Callable):
+    """Runs ``parse`` over a UTF-8 text view of a downloaded body, from the start."""
+    spool.seek(0)
+    text = io.TextIOWrapper(spool, encoding="utf-8")
+    try:
+        return parse(text)
+    finally:
+        text.detach()
+
+
+def fetch_parsed_cached(
+    client: FigmaHttpClient,
+    cache: Optional[HttpCache],
+    path: str,
+    parse: Callable,
+    parse_version: str,
+):
+    """
+    Downloads ``path`` to disk and returns ``parse(text_stream)``, behind ``cache``.
+
+    Bodies are streamed to a spool file and parsed from there, so the raw payload is
+    never held in memory. Fresh entries skip the network; stale ones send
+    ``If-None-Match`` / ``If-Modified-Since`` and reuse the cached parse on a 304.
+    ``parse_version`` invalidates stored parses (not bodies) when the parser changes.
+    """
+    if cache is None:
+        with tempfile.TemporaryFile() as spool:
+            client.get(path, sink=spool)
+            return parse_spooled(spool, parse)
+
+    url = client.url(path)
+    key = cache.key(url, client.api_token)
+    meta = cache.load(key)
+    if meta and meta.get("parse_version") == parse_version and cache.is_fresh(meta):
+        return meta["parsed"]
+
+    conditional = {}
+    if meta:
+        if meta.get("etag"):
+            conditional["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            conditional["If-Modified-Since"] = meta["last_modified"]
+
+    with cache.spool() as spool_path:
+        with spool_path.open("w+b") as spool:
+            response = client.get(path, headers=conditional, sink=spool)
+            if response.status == 304 and meta:
+                # Keep the validators we sent unless the 304 carries newer ones.
+                headers = {"etag": meta.get("etag"), "last-modified": meta.get("last_modified"), **response.headers}
+                if meta.get("parse_version") == parse_version:
+                    cache.store(key, url, headers, None, meta["parsed"], parse_version)
+                    return meta["parsed"]
+                body = cache.open_body(key)
+                if body is not None:
+                    with body:
+                        parsed = parse_spooled(body, parse)
+                    cache.store(key, url, headers, None, parsed, parse_version)
+                    return parsed
+                # The body was evicted meanwhile; fetch it again unconditionally.
+                response = client.get(path, sink=spool)
+            parsed = parse_spooled(spool, parse)
+        cache.store(key, url, response.headers, spool_path, parsed, parse_version)
+    return parsed
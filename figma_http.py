@@ -0,0 +1,369 @@
+import gzip
+import hashlib
+import http.client
+import json
+import os
+import queue
+import random
+import threading
+import time
+import zlib
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import BinaryIO, NamedTuple, Optional
+from urllib.parse import urlencode, urlparse
+
+from pipeline_io import locked, write_json
+
+USER_AGENT = "ds-pipeline/1.0"
+STREAM_CHUNK_SIZE = 1 << 20
+
+# Requests per minute per API token; override with FIGMA_REST_RATE_LIMIT.
+DEFAULT_REQUESTS_PER_MINUTE = 60
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Failures on a pooled connection that the server may have closed while it sat idle.
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class FigmaResponse(NamedTuple):
+    status: int
+    headers: dict  # lower-cased header names
+    body: bytes
+
+    def json(self):
+        return json.loads(self.body.decode("utf-8"))
+
+
+class FigmaHttpError(Exception):
+    def __init__(self, url: str, response: FigmaResponse):
+        super().__init__(f"HTTP {response.status} for {url}")
+        self.url = url
+        self.response = response
+
+    @property
+    def status(self) -> int:
+        return self.response.status
+
+
+class FigmaFetchError(RuntimeError):
+    """Figma REST ingestion failed after retries; callers must not fall back to stale tokens silently."""
+
+
+# Everything a fetch can raise for an unreachable host, HTTP error, or undecodable body.
+# Not ValueError at large: a bug in a response parser must surface, not pass for a failed fetch.
+FETCH_ERRORS = (
+    FigmaHttpError,
+    FigmaFetchError,
+    OSError,
+    http.client.HTTPException,
+    json.JSONDecodeError,
+    zlib.error,
+)
+
+
+METRIC_NAMES = (
+    "requests",
+    "throttled",
+    "server_errors",
+    "transport_errors",
+    "retries",
+    "rate_wait_seconds",
+    "backoff_seconds",
+)
+
+
+class RequestMetrics:
+    """Thread-safe counters describing how much a client was throttled or retried."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(METRIC_NAMES, 0)
+
+    def add(self, name: str, amount=1):
+        with self._lock:
+            self._counts[name] += amount
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: round(value, 3) for name, value in self._counts.items()}
+
+
+def metrics_delta(before: dict, after: dict) -> dict:
+    return {name: round(after[name] - before[name], 3) for name in METRIC_NAMES}
+
+
+class TokenBucket:
+    """
+    Request-rate limiter shared by every thread using it and, with ``state_path``,
+    by every process pointing at the same file (batch audit workers).
+
+    A 429 ``pause``s the whole bucket, so one throttled request holds back all
+    senders instead of each of them discovering the limit on its own.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: float, state_path: Optional[Path] = None):
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self._state_path = state_path
+        self._lock = threading.Lock()
+        self._state = {"tokens": capacity, "updated_at": time.time(), "blocked_until": 0.0}
+
+    def acquire(self) -> float:
+        """Blocks until a request may be sent; returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            wait = self._update(self._take)
+            if wait <= 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float):
+        def block(state, now):
+            state["blocked_until"] = max(state["blocked_until"], now + seconds)
+            return 0.0
+
+        self._update(block)
+
+    def _take(self, state: dict, now: float) -> float:
+        elapsed = max(0.0, now - state["updated_at"])
+        state["tokens"] = min(self.capacity, state["tokens"] + elapsed * self.rate_per_second)
+        state["updated_at"] = now
+        if now < state["blocked_until"]:
+            return state["blocked_until"] - now
+        if state["tokens"] >= 1:
+            state["tokens"] -= 1
+            return 0.0
+        return (1 - state["tokens"]) / self.rate_per_second
+
+    def _update(self, fn) -> float:
+        with self._lock:
+            if self._state_path is None:
+                return fn(self._state, time.time())
+            with locked(self._state_path):
+                try:
+                    state = json.loads(self._state_path.read_text())
+                except (OSError, ValueError):
+                    state = dict(self._state)
+                result = fn(state, time.time())
+                write_json(self._state_path, state)
+                return result
+
+
+class RetryPolicy(NamedTuple):
+    max_attempts: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    # A longer Retry-After fails the request instead of stalling the run.
+    max_retry_after: float = 300.0
+
+    def backoff(self, attempt: int, rng: random.Random) -> float:
+        """Full-jitter exponential backoff for the given zero-based attempt."""
+        return rng.uniform(0, min(self.max_delay, self.base_delay * (2**attempt)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _read_body(raw: http.client.HTTPResponse, headers: dict, sink: Optional[BinaryIO]) -> bytes:
+    encoding = headers.get("content-encoding", "").lower()
+    if sink is None:
+        body = raw.read()
+        if encoding == "gzip":
+            return gzip.decompress(body)
+        if encoding == "deflate":
+            return zlib.decompress(body)
+        return body
+
+    decoder = None
+    if encoding == "gzip":
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    elif encoding == "deflate":
+        decoder = zlib.decompressobj()
+    while True:
+        chunk = raw.read(STREAM_CHUNK_SIZE)
+        if not chunk:
+            break
+        sink.write(decoder.decompress(chunk) if decoder else chunk)
+    if decoder:
+        sink.write(decoder.flush())
+    return b""
+
+
+class FigmaHttpClient:
+    """
+    Keep-alive HTTP client for the Figma REST API.
+
+    Connections to the API host are pooled and reused across requests and threads,
+    so a run pays one TLS handshake per pooled connection instead of one per request.
+    Responses are requested gzip-compressed and transparently decoded. Every request
+    first takes a token from ``bucket``; 429s, 5xx and transport errors are retried
+    per ``retry`` (honouring ``Retry-After``) and counted in ``metrics``.
+    """
+
+    def __init__(
+        self,
+        api_base: str,
+        api_token: str,
+        timeout: float = 20,
+        max_connections: int = 4,
+        bucket: Optional[TokenBucket] = None,
+        retry: RetryPolicy = RetryPolicy(),
+    ):
+        parsed = urlparse(api_base.rstrip("/"))
+        self._https = parsed.scheme == "https"
+        self._host = parsed.hostname
+        self._port = parsed.port
+        self._base_path = parsed.path
+        self._timeout = timeout
+        self.api_token = api_token
+        self._headers = {
+            "X-Figma-Token": api_token,
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip",
+            "User-Agent": USER_AGENT,
+        }
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=max_connections)
+        self.bucket = bucket or TokenBucket(DEFAULT_REQUESTS_PER_MINUTE / 60, DEFAULT_REQUESTS_PER_MINUTE / 6)
+        self.retry = retry
+        self.metrics = RequestMetrics()
+        self._rng = random.Random()
+
+    def url(self, path: str, params: Optional[dict] = None) -> str:
+        query = f"?{urlencode(params)}" if params else ""
+        scheme = "https" if self._https else "http"
+        port = f":{self._port}" if self._port else ""
+        return f"{scheme}://{self._host}{port}{self._base_path}{path}{query}"
+
+    def get(
+        self, path: str, params: Optional[dict] = None, headers: Optional[dict] = None, sink: Optional[BinaryIO] = None
+    ) -> FigmaResponse:
+        """
+        GET ``api_base + path``; raises FigmaHttpError once a 4xx/5xx is final.
+
+        With ``sink`` a 2xx body is streamed (decompressed) into that binary file
+        instead of being held in memory, and the returned ``body`` is empty.
+        """
+        target = f"{self._base_path}{path}" + (f"?{urlencode(params)}" if params else "")
+        request_headers = {**self._headers, **(headers or {})}
+        attempt = 0
+        while True:
+            self.metrics.add("rate_wait_seconds", self.bucket.acquire())
+            self.metrics.add("requests")
+            last_attempt = attempt + 1 >= self.retry.max_attempts
+            if sink is not None:
+                sink.seek(0)
+                sink.truncate()
+            try:
+                response = self._send("GET", target, request_headers, sink)
+            except (OSError, http.client.HTTPException):
+                self.metrics.add("transport_errors")
+                if last_attempt:
+                    raise
+                delay = self.retry.backoff(attempt, self._rng)
+            else:
+                if response.status < 400:
+                    return response
+                if response.status not in RETRY_STATUSES or last_attempt:
+                    raise FigmaHttpError(self.url(path, params), response)
+                retry_after = parse_retry_after(response.headers.get("retry-after"))
+                if retry_after is not None and retry_after > self.retry.max_retry_after:
+                    raise FigmaHttpError(self.url(path, params), response)
+                delay = retry_after if retry_after is not None else self.retry.backoff(attempt, self._rng)
+                if response.status == 429:
+                    self.metrics.add("throttled")
+                    # Hold back every sender sharing the bucket; acquire() does the waiting.
+                    self.bucket.pause(delay)
+                    delay = 0.0
+                else:
+                    self.metrics.add("server_errors")
+            self.metrics.add("retries")
+            self.metrics.add("backoff_seconds", delay)
+            time.sleep(delay)
+            attempt += 1
+
+    def get_json(self, path: str, params: Optional[dict] = None):
+        return self.get(path, params).json()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        connection_class = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+        return connection_class(self._host, self._port, timeout=self._timeout)
+
+    def _send(self, method: str, target: str, headers: dict, sink: Optional[BinaryIO] = None) -> FigmaResponse:
+        try:
+            conn, reused = self._idle.get_nowait(), True
+        except queue.Empty:
+            conn, reused = self._new_connection(), False
+        try:
+            try:
+                conn.request(method, target, headers=headers)
+                raw = conn.getresponse()
+            except _STALE_CONNECTION_ERRORS:
+                conn.close()
+                if not reused:
+                    raise
+                # The server dropped an idle keep-alive connection; retry once on a fresh one.
+                conn = self._new_connection()
+                conn.request(method, target, headers=headers)
+                raw = conn.getresponse()
+            response_headers = {k.lower(): v for k, v in raw.getheaders()}
+            body = _read_body(raw, response_headers, sink if 200 <= raw.status < 300 else None)
+        except BaseException:
+            conn.close()
+            raise
+
+        if raw.will_close:
+            conn.close()
+        else:
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+        return FigmaResponse(raw.status, response_headers, body)
+
+
+_clients: dict = {}
+_clients_lock = threading.Lock()
+
+
+def requests_per_minute() -> float:
+    return float(os.getenv("FIGMA_REST_RATE_LIMIT") or DEFAULT_REQUESTS_PER_MINUTE)
+
+
+def get_figma_client(api_base: str, api_token: str, state_dir: Optional[Path] = None) -> FigmaHttpClient:
+    """
+    Process-wide client per (api_base, token) so repeated audits reuse warm connections.
+
+    With ``state_dir`` the rate limit is shared through a file there, so every process
+    in a workspace (e.g. batch workers) draws from one budget per API token.
+    """
+    key = (api_base.rstrip("/"), api_token, state_dir)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            rate = requests_per_minute()
+            state_path = None
+            if state_dir is not None:
+                token_id = hashlib.sha256(api_token.encode("utf-8")).hexdigest()[:16]
+                state_path = state_dir / f"rate-limit-{token_id}.json"
+            bucket = TokenBucket(rate / 60, max(1.0, rate / 6), state_path)
+            client = _clients[key] = FigmaHttpClient(api_base, api_token, bucket=bucket)
+        return client
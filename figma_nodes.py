@@ -0,0 +1,246 @@
+import json
+import math
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional, TextIO, TypedDict
+from urllib.parse import quote
+
+from figma_cache import HttpCache, fetch_parsed_cached
+from figma_http import FigmaHttpClient
+
+# Bump when the records parsed from component nodes change, so cached parses are redone.
+NODE_PARSE_VERSION = "1"
+# Ids per /nodes request, and the most characters they may take in the URL once
+# encoded: instance ids ("I12:3;45:6;...") can be long, and proxies cap URLs at ~8 KB.
+NODE_CHUNK_SIZE = 100
+NODE_IDS_MAX_CHARS = 4000
+NODE_FETCH_WORKERS = 4
+# A component set's variants and their direct children are all the audits look at.
+COMPONENT_DEPTH = 2
+# Children whose centers (or edges) are this close share a counter-axis alignment.
+ALIGN_TOLERANCE = 1.0
+
+
+class Layout(TypedDict):
+    name: str
+    layout_mode: str  # NONE, HORIZONTAL or VERTICAL
+    children: int  # visible children
+    absolute_children: int  # children positioned absolutely inside an auto-layout
+    axis: Optional[str]  # layoutMode, or the axis the children are laid out along without one
+    item_spacing: Optional[float]  # itemSpacing, or the median gap between children without auto-layout
+    counter_align: str  # MIN, CENTER or MAX
+
+
+class ComponentNode(TypedDict):
+    id: str
+    name: str
+    type: str  # COMPONENT or COMPONENT_SET
+    variant_properties: dict  # {property: [values]} of a component set
+    variants: list  # {property: value} of each variant, in document order
+    unnamed_variants: list  # variant names that are not "Property=Value, ..." lists
+    layouts: list  # Layout of the component, or of each variant of a set
+
+
+def chunk_node_ids(
+    node_ids: Iterable[str], size: int = NODE_CHUNK_SIZE, max_chars: int = NODE_IDS_MAX_CHARS
+) -> list:
+    """Distinct ``node_ids`` in chunks of at most ``size`` ids and ``max_chars`` URL-encoded characters."""
+    chunks = []
+    chunk, length = [], 0
+    for node_id in sorted(set(node_ids)):
+        encoded = len(quote(node_id, safe=":")) + 1
+        if chunk and (len(chunk) >= size or length + encoded > max_chars):
+            chunks.append(chunk)
+            chunk, length = [], 0
+        chunk.append(node_id)
+        length += encoded
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def fetch_nodes(
+    client: FigmaHttpClient,
+    cache: Optional[HttpCache],
+    file_id: str,
+    node_ids: Iterable[str],
+    parse: Callable,
+    parse_version: str,
+    params: Optional[dict] = None,
+) -> dict:
+    """
+    ``parse`` results of ``/files/{file_id}/nodes`` for ``node_ids``, merged into one dict.
+
+    Ids are deduplicated and chunked to fit the URL (``chunk_node_ids``); chunks are
+    requested concurrently over ``client``'s pooled connections, all drawing on its
+    shared rate limiter, and each goes through ``cache``. ``parse`` gets a chunk's
+    response stream and returns ``{node_id: record}``; ``params`` (e.g. ``depth`` or
+    ``version``) are added to every request.
+    """
+    extra = "".join(f"&{key}={quote(str(value))}" for key, value in (params or {}).items())
+
+    def fetch(chunk: list) -> dict:
+        path = f"/files/{file_id}/nodes?ids={quote(','.join(chunk), safe=',:')}{extra}"
+        return fetch_parsed_cached(client, cache, path, parse, parse_version)
+
+    chunks = chunk_node_ids(node_ids)
+    nodes = {}
+    if chunks:
+        with ThreadPoolExecutor(max_workers=min(NODE_FETCH_WORKERS, len(chunks))) as pool:
+            for found in pool.map(fetch, chunks):
+                nodes.update(found)
+    return nodes
+
+
+def _parse_file_version(fh: TextIO) -> Optional[str]:
+    return json.load(fh).get("version")
+
+
+def _parse_component_list(fh: TextIO) -> list:
+    """``[node_id, name]`` of the component sets and standalone components in a library listing."""
+    meta = json.load(fh).get("meta") or {}
+    entries = meta.get("component_sets") or meta.get("components") or []
+    return [
+        [entry["node_id"], entry.get("name")]
+        for entry in entries
+        if isinstance(entry, dict)
+        and entry.get("node_id")
+        and not ((entry.get("containing_frame") or {}).get("containingComponentSet"))
+    ]
+
+
+def parse_variant_name(name: str) -> Optional[dict]:
+    """``{"State": "Hover", "Size": "lg"}`` for ``"State=Hover, Size=lg"``; None when not in that form."""
+    variant = {}
+    for part in name.split(","):
+        key, sep, value = part.partition("=")
+        if not sep or not key.strip():
+            return None
+        variant[key.strip()] = value.strip()
+    return variant
+
+
+def _spacing(boxes: list, axis: str) -> Optional[float]:
+    start, extent = ("x", "width") if axis == "HORIZONTAL" else ("y", "height")
+    boxes = sorted(boxes, key=lambda box: box[start])
+    gaps = [b[start] - (a[start] + a[extent]) for a, b in zip(boxes, boxes[1:])]
+    gaps = [gap for gap in gaps if gap >= 0]
+    return round(float(statistics.median(gaps)), 1) if gaps else None
+
+
+def _counter_align(boxes: list, axis: str) -> str:
+    start, extent = ("y", "height") if axis == "HORIZONTAL" else ("x", "width")
+    for align, edge in (("MIN", 0.0), ("CENTER", 0.5), ("MAX", 1.0)):
+        positions = [box[start] + box[extent] * edge for box in boxes]
+        if max(positions) - min(positions) <= ALIGN_TOLERANCE:
+            return align
+    return "MIN"
+
+
+def _layout(node: dict) -> Layout:
+    """How ``node``'s children are laid out, measured from their boxes when it has no auto-layout."""
+    children = [child for child in node.get("children") or [] if child.get("visible", True)]
+    mode = node.get("layoutMode") or "NONE"
+    boxes = [child["absoluteBoundingBox"] for child in children if child.get("absoluteBoundingBox")]
+    absolute = sum(1 for child in children if child.get("layoutPositioning") == "ABSOLUTE") if mode != "NONE" else 0
+    if mode != "NONE":
+        axis = mode
+        spacing = float(node.get("itemSpacing", 0))
+        align = {"CENTER": "CENTER", "MAX": "MAX"}.get(node.get("counterAxisAlignItems"), "MIN")
+    elif len(boxes) >= 2:
+        spread = {
+            key: max(box[key] + box[size] / 2 for box in boxes) - min(box[key] + box[size] / 2 for box in boxes)
+            for key, size in (("x", "width"), ("y", "height"))
+        }
+        axis = "HORIZONTAL" if spread["x"] >= spread["y"] else "VERTICAL"
+        spacing = _spacing(boxes, axis)
+        align = _counter_align(boxes, axis)
+    else:
+        axis, spacing, align = None, None, "MIN"
+    return Layout(
+        name=node.get("name") or "",
+        layout_mode=mode,
+        children=len(children),
+        absolute_children=absolute,
+        axis=axis,
+        item_spacing=spacing,
+        counter_align=align,
+    )
+
+
+def component_node(document: dict) -> Optional[ComponentNode]:
+    """A ComponentNode for a COMPONENT or COMPONENT_SET document; None for other nodes."""
+    kind = document.get("type")
+    if kind not in ("COMPONENT", "COMPONENT_SET"):
+        return None
+    properties = {}
+    variants, unnamed, layouts = [], [], []
+    if kind == "COMPONENT_SET":
+        for name, definition in (document.get("componentPropertyDefinitions") or {}).items():
+            if isinstance(definition, dict) and definition.get("type") == "VARIANT":
+                properties[name] = list(definition.get("variantOptions") or [])
+        for child in document.get("children") or []:
+            if child.get("type") != "COMPONENT":
+                continue
+            variant = parse_variant_name(child.get("name") or "")
+            if variant is None:
+                unnamed.append(child.get("name") or "")
+            else:
+                variants.append(variant)
+                for key, value in variant.items():
+                    values = properties.setdefault(key, [])
+                    if value not in values:
+                        values.append(value)
+            layouts.append(_layout(child))
+    else:
+        layouts.append(_layout(document))
+    return ComponentNode(
+        id=document.get("id") or "",
+        name=document.get("name") or "",
+        type=kind,
+        variant_properties=properties,
+        variants=variants,
+        unnamed_variants=unnamed,
+        layouts=layouts,
+    )
+
+
+def _parse_component_nodes(fh: TextIO) -> dict:
+    nodes = json.load(fh).get("nodes") or {}
+    out = {}
+    for node_id, entry in nodes.items():
+        record = component_node((entry or {}).get("document") or {})
+        if record is not None:
+            out[node_id] = record
+    return out
+
+
+def fetch_component_nodes(file_id: str, client: FigmaHttpClient, cache: Optional[HttpCache] = None) -> dict:
+    """
+    ``{component name: ComponentNode}`` for the component sets and standalone
+    components published from a file.
+
+    Node requests are pinned to the file's current ``version``, so their cache entries
+    never go stale: they are served from disk without revalidation until the file
+    changes, whatever the cache's TTL.
+    """
+    version = fetch_parsed_cached(client, cache, f"/files/{file_id}?depth=1", _parse_file_version, NODE_PARSE_VERSION)
+    listed = []
+    for listing in ("component_sets", "components"):
+        listed += fetch_parsed_cached(
+            client, cache, f"/files/{file_id}/{listing}", _parse_component_list, NODE_PARSE_VERSION
+        )
+    params = {"depth": COMPONENT_DEPTH}
+    node_cache = cache
+    if version:
+        params["version"] = version
+        if cache is not None:
+            node_cache = HttpCache(cache.cache_dir, math.inf, cache.max_bytes)
+    node_ids = [node_id for node_id, _ in listed]
+    nodes = fetch_nodes(client, node_cache, file_id, node_ids, _parse_component_nodes, NODE_PARSE_VERSION, params)
+    components = {}
+    for node_id, name in listed:
+        record = nodes.get(node_id)
+        if record is not None:
+            components.setdefault(record["name"] or name, record)
+    return components
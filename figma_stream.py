@@ -0,0 +1,165 @@
+import json
+import re
+from typing import Iterator, Optional, TextIO
+
+CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_SCALAR_END = re.compile(r"[,\]} \t\n\r]")
+
+
+def _matches(pattern: tuple, path: tuple) -> bool:
+    return len(pattern) == len(path) and all(p == "*" or p == str(k) for p, k in zip(pattern, path))
+
+
+def _is_prefix(pattern: tuple, path: tuple) -> bool:
+    return len(pattern) > len(path) and _matches(pattern[: len(path)], path)
+
+
+class JsonStreamReader:
+    """
+    Pull parser that walks selected containers of a JSON document read in chunks.
+
+    ``iter_members`` yields every member of the objects/arrays at the requested
+    paths, each decoded on its own; everything else is skipped member by member
+    and dropped. Memory stays bounded by the chunk size plus the largest single
+    member, whatever the size of the document.
+    """
+
+    def __init__(self, fh: TextIO, chunk_size: int = CHUNK_SIZE):
+        self._fh = fh
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+        # Matched paths and whether each was an object ("{") or an array ("[").
+        self.containers: dict = {}
+
+    def iter_members(self, patterns) -> Iterator[tuple]:
+        """
+        Yields ``(path, key, value)`` for members of containers matching ``patterns``.
+
+        Patterns are key tuples such as ``("meta", "variables")``; ``"*"`` matches any
+        key or array index. ``key`` is a ``str`` for object members and an ``int`` for
+        array items, so callers can tell the two container kinds apart.
+        """
+        yield from self._walk((), [tuple(p) for p in patterns])
+
+    def _walk(self, prefix: tuple, patterns: list):
+        if self._peek() not in "{[":
+            self._skip_value()
+            return
+        for key in self._members():
+            path = prefix + (key,)
+            if any(_matches(p, path) for p in patterns):
+                kind = self._peek()
+                if kind not in "{[":
+                    self._skip_value()
+                    continue
+                self.containers[path] = kind
+                for item_key in self._members():
+                    yield path, item_key, self._read_value()
+            elif any(_is_prefix(p, path) for p in patterns):
+                yield from self._walk(path, patterns)
+            else:
+                self._skip_value()
+
+    def _members(self):
+        """Yields each key (or index); the caller must consume the value before resuming."""
+        close = "}" if self._peek() == "{" else "]"
+        self._pos += 1
+        if self._peek() == close:
+            self._pos += 1
+            return
+        index = 0
+        while True:
+            if close == "}":
+                key = self._read_string()
+                self._expect(":")
+            else:
+                key = index
+                index += 1
+            yield key
+            separator = self._peek()
+            self._pos += 1
+            if separator == close:
+                return
+            if separator != ",":
+                raise self._error(f"Expected ',' or {close!r}, got {separator!r}", self._pos - 1)
+
+    def _error(self, message: str, pos: Optional[int] = None) -> json.JSONDecodeError:
+        """A malformed document raises what ``json.load`` would; ``pos`` is within the current buffer."""
+        return json.JSONDecodeError(message, self._buf, self._pos if pos is None else pos)
+
+    def _fill(self, grow: bool = False) -> bool:
+        if self._eof:
+            return False
+        pending = len(self._buf) - self._pos
+        # Growing geometrically keeps re-decoding an oversized member linear overall.
+        chunk = self._fh.read(max(self._chunk_size, pending) if grow else self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise self._error("Unexpected end of JSON stream")
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            raise self._error(f"Expected {char!r}, got {self._buf[self._pos]!r}")
+        self._pos += 1
+
+    def _read_string(self) -> str:
+        self._peek()
+        while True:
+            match = _STRING.match(self._buf, self._pos)
+            if match:
+                self._pos = match.end()
+                text = match.group()
+                return text[1:-1] if "\\" not in text else json.loads(text)
+            if not self._fill(grow=True):
+                raise self._error("Unterminated string")
+
+    def _read_value(self):
+        if self._peek() not in '{["':
+            # A bare number or literal is only complete once its terminator is buffered.
+            while not _SCALAR_END.search(self._buf, self._pos) and self._fill(grow=True):
+                pass
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill(grow=True):
+                    raise
+                continue
+            self._pos = end
+            return value
+
+    def _skip_value(self):
+        char = self._peek()
+        if char == '"':
+            self._read_string()
+            return
+        if char not in "{[":
+            self._read_value()
+            return
+        # Decoding in C beats scanning in Python; a container that runs past the
+        # buffer is descended into instead, so only its members are ever decoded.
+        try:
+            _, self._pos = self._decoder.raw_decode(self._buf, self._pos)
+            return
+        except json.JSONDecodeError:
+            if self._eof:
+                raise
+        for _ in self._members():
+            self._skip_value()
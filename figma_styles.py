@@ -0,0 +1,258 @@
+import json
+import re
+from typing import Iterable, Optional, TextIO, TypedDict
+
+from color_kernel import figma_to_hex, hex_to_rgba8
+from figma_cache import HttpCache, fetch_parsed_cached
+from figma_http import FigmaHttpClient
+from figma_nodes import fetch_nodes
+
+# Bump when the records parsed from style nodes change, so cached parses are redone.
+STYLE_PARSE_VERSION = "1"
+
+# Font style names (Plugin API ``fontName.style``) to CSS weights, spaces and case ignored.
+WEIGHT_NAMES = {
+    "thin": 100,
+    "hairline": 100,
+    "extralight": 200,
+    "ultralight": 200,
+    "light": 300,
+    "regular": 400,
+    "normal": 400,
+    "book": 400,
+    "medium": 500,
+    "semibold": 600,
+    "demibold": 600,
+    "bold": 700,
+    "extrabold": 800,
+    "ultrabold": 800,
+    "black": 900,
+    "heavy": 900,
+}
+# Proposed ``font.weight`` token names per CSS weight.
+WEIGHT_TOKEN_NAMES = {
+    100: "thin",
+    200: "extralight",
+    300: "light",
+    400: "regular",
+    500: "medium",
+    600: "semibold",
+    700: "bold",
+    800: "extrabold",
+    900: "black",
+}
+# Proposed ``shadow`` token names, smallest blur first.
+SHADOW_NAMES = ("sm", "md", "lg", "xl", "2xl")
+SHADOW_TYPES = {"DROP_SHADOW": "drop-shadow", "INNER_SHADOW": "inner-shadow"}
+BLUR_TYPES = {"LAYER_BLUR": "layer-blur", "BACKGROUND_BLUR": "background-blur"}
+
+
+class TextStyle(TypedDict):
+    family: str
+    weight: int
+    size: float
+    line_height: Optional[float]  # px; None for "auto"
+    letter_spacing: float  # px
+    text_case: Optional[str]
+
+
+class Shadow(TypedDict):
+    type: str  # "drop-shadow" or "inner-shadow"
+    color: str  # #rrggbb or #rrggbbaa
+    x: float
+    y: float
+    blur: float
+    spread: float
+
+
+class Blur(TypedDict):
+    type: str  # "layer-blur" or "background-blur"
+    radius: float
+
+
+class EffectStyle(TypedDict):
+    shadows: list  # Shadow records, in paint order
+    blurs: list  # Blur records
+
+
+def _weight(props: dict) -> int:
+    if isinstance(props.get("fontWeight"), (int, float)):
+        return int(props["fontWeight"])
+    style = str((props.get("fontName") or {}).get("style", "")).lower()
+    words = re.sub(r"italic|oblique|[\s_-]", "", style)
+    return WEIGHT_NAMES.get(words, 400)
+
+
+def _length(value, size: float) -> Optional[float]:
+    """px for a REST number or a Plugin API ``{"unit", "value"}`` (PIXELS, PERCENT or AUTO)."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, dict) or value.get("unit") == "AUTO":
+        return None
+    if value.get("unit") == "PERCENT":
+        return round(size * float(value.get("value", 0)) / 100, 3)
+    return float(value.get("value", 0))
+
+
+def text_style(props: dict) -> Optional[TextStyle]:
+    """
+    A TextStyle from a REST ``TypeStyle`` (a TEXT style node's ``style``) or a
+    Plugin API text style export; None when it names no font size.
+    """
+    size = props.get("fontSize")
+    if not isinstance(size, (int, float)):
+        return None
+    size = float(size)
+    family = props.get("fontFamily") or (props.get("fontName") or {}).get("family")
+    line_height = props.get("lineHeightPx", props.get("lineHeight"))
+    if props.get("lineHeightUnit") == "INTRINSIC_%":
+        line_height = None
+    return TextStyle(
+        family=family or "",
+        weight=_weight(props),
+        size=size,
+        line_height=_length(line_height, size),
+        letter_spacing=_length(props.get("letterSpacing", 0), size) or 0.0,
+        text_case=props.get("textCase") if props.get("textCase") not in (None, "ORIGINAL") else None,
+    )
+
+
+def effect_styles(effect_lists: list) -> list:
+    """
+    An EffectStyle per list of Figma ``Effect``s (REST and Plugin API share the
+    shape); hidden effects are skipped and shadow colors are converted in one batch.
+    """
+    visible = [[e for e in effects if isinstance(e, dict) and e.get("visible", True)] for effects in effect_lists]
+    shadows = [e for effects in visible for e in effects if e.get("type") in SHADOW_TYPES]
+    colors = iter(figma_to_hex([e.get("color") or {} for e in shadows]))
+    styles = []
+    for effects in visible:
+        style = EffectStyle(shadows=[], blurs=[])
+        for effect in effects:
+            if effect.get("type") in SHADOW_TYPES:
+                offset = effect.get("offset") or {}
+                style["shadows"].append(
+                    Shadow(
+                        type=SHADOW_TYPES[effect["type"]],
+                        color=next(colors),
+                        x=float(offset.get("x", 0)),
+                        y=float(offset.get("y", 0)),
+                        blur=float(effect.get("radius", 0)),
+                        spread=float(effect.get("spread", 0)),
+                    )
+                )
+            elif effect.get("type") in BLUR_TYPES:
+                style["blurs"].append(Blur(type=BLUR_TYPES[effect["type"]], radius=float(effect.get("radius", 0))))
+        styles.append(style)
+    return styles
+
+
+def css_shadow(shadows: Iterable[Shadow]) -> str:
+    """A CSS ``box-shadow`` value for shadow records, e.g. ``0px 1px 2px 0px rgba(0,0,0,0.08)``."""
+    parts = []
+    for shadow in shadows:
+        r, g, b, a = hex_to_rgba8(shadow["color"])
+        inset = "inset " if shadow["type"] == "inner-shadow" else ""
+        parts.append(
+            f"{inset}{shadow['x']:g}px {shadow['y']:g}px {shadow['blur']:g}px {shadow['spread']:g}px "
+            f"rgba({r},{g},{b},{round(a / 255, 2):g})"
+        )
+    return ", ".join(parts)
+
+
+def weight_scale(typography: dict) -> dict:
+    """``{token name: "700"}`` for the weights text styles use, lightest first."""
+    weights = sorted({style["weight"] for style in typography.values() if isinstance(style.get("weight"), int)})
+    return {WEIGHT_TOKEN_NAMES.get(weight, str(weight)): str(weight) for weight in weights}
+
+
+def shadow_scale(effects: dict) -> dict:
+    """
+    ``{token name: box-shadow}`` for the distinct shadows of effect styles, named by
+    elevation (largest blur, then offset); blur-only styles have no shadow token.
+    """
+    elevation = {}
+    for style in effects.values():
+        shadows = style.get("shadows") or [] if isinstance(style, dict) else []
+        if shadows:
+            value = css_shadow(shadows)
+            elevation.setdefault(value, max((s["blur"], abs(s["y"]), s["spread"]) for s in shadows))
+    ordered = sorted(elevation, key=lambda value: (elevation[value], value))
+    names = SHADOW_NAMES + tuple(f"{n}xl" for n in range(3, len(ordered) - len(SHADOW_NAMES) + 3))
+    return dict(zip(names, ordered))
+
+
+def styles_from_entries(entries: Iterable[tuple]) -> tuple:
+    """
+    ``(typography, effects)`` keyed by style name, from ``(name, style_type, props)``
+    entries: ``props`` is the text style or ``{"effects": [...]}`` of an EFFECT one.
+    """
+    typography = {}
+    effect_entries = []
+    for name, style_type, props in entries:
+        if not name or not isinstance(props, dict):
+            continue
+        if style_type == "TEXT":
+            record = text_style(props)
+            if record is not None:
+                typography[name] = record
+        elif style_type == "EFFECT" and isinstance(props.get("effects"), list):
+            effect_entries.append((name, props["effects"]))
+    effects = dict(zip((name for name, _ in effect_entries), effect_styles([e for _, e in effect_entries])))
+    return typography, effects
+
+
+def parse_style_exports(payload: dict) -> tuple:
+    """
+    ``(typography, effects)`` from an MCP or plugin export: ``textStyles`` and
+    ``effectStyles`` lists (Plugin API ``getLocalTextStyles`` / ``getLocalEffectStyles``),
+    or a ``styles`` list whose entries carry ``styleType`` (or ``type``).
+    """
+    entries = []
+    for key, style_type in (("textStyles", "TEXT"), ("effectStyles", "EFFECT")):
+        for style in payload.get(key) or []:
+            if isinstance(style, dict):
+                entries.append((style.get("name"), style_type, style))
+    for style in payload.get("styles") or []:
+        if isinstance(style, dict):
+            entries.append((style.get("name"), str(style.get("styleType") or style.get("type") or "").upper(), style))
+    return styles_from_entries(entries)
+
+
+def _parse_style_list(fh: TextIO) -> list:
+    """``(node_id, name, style_type)`` for the TEXT and EFFECT styles of a ``/styles`` response."""
+    styles = (json.load(fh).get("meta") or {}).get("styles") or []
+    return [
+        [style["node_id"], style.get("name"), style.get("style_type")]
+        for style in styles
+        if isinstance(style, dict) and style.get("node_id") and style.get("style_type") in ("TEXT", "EFFECT")
+    ]
+
+
+def _parse_style_nodes(fh: TextIO) -> dict:
+    """Only what records are built from: ``{node_id: {"style": ..., "effects": ...}}``."""
+    nodes = json.load(fh).get("nodes") or {}
+    out = {}
+    for node_id, entry in nodes.items():
+        document = (entry or {}).get("document") or {}
+        out[node_id] = {"style": document.get("style"), "effects": document.get("effects")}
+    return out
+
+
+def fetch_figma_styles_via_rest(file_id: str, client: FigmaHttpClient, cache: Optional[HttpCache] = None) -> tuple:
+    """
+    ``(typography, effects)`` for the published text and effect styles of a file.
+
+    The style list gives each style's node; the nodes are then fetched once per
+    distinct id (however many styles or layers share it) in batched ``/nodes``
+    requests (``fetch_nodes``), behind ``cache``.
+    """
+    styles = fetch_parsed_cached(client, cache, f"/files/{file_id}/styles", _parse_style_list, STYLE_PARSE_VERSION)
+    node_ids = [node_id for node_id, _, _ in styles]
+    nodes = fetch_nodes(client, cache, file_id, node_ids, _parse_style_nodes, STYLE_PARSE_VERSION)
+
+    entries = []
+    for node_id, name, style_type in styles:
+        node = nodes.get(node_id) or {}
+        entries.append((name, style_type, node.get("style") if style_type == "TEXT" else node))
+    return styles_from_entries(entries)
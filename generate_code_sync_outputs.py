@@ -1,7 +1,17 @@
 import argparse
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from typing import NamedTuple, Optional
+
+from color_kernel import hex_to_figma, is_hex_value
+from pipeline_io import NestedJsonStreamWriter, open_artifact, paths_are_grouped, write_json_array_stream
+from run_index import find_phase_run, latest_phase_run, record_phase_run
+
+# Bump whenever the code-sync artifacts change shape or content for the same inputs.
+GENERATOR_VERSION = "1.0"
 
 
 def nested_set(dic, keys, value):
@@ -10,10 +20,15 @@ def nested_set(dic, keys, value):
     dic[keys[-1]] = value
 
 
-def find_latest_refactor_dir(base_dir: Path) -> Path:
-    candidates = list((base_dir / "3_refactor-output").glob("refactor_*"))
+def find_latest_refactor_dir(base_dir: Path, run_id: Optional[str] = None) -> Path:
+    """Output directory of refactor run ``run_id``, or of the latest refactor run."""
+    refactor = find_phase_run(base_dir, run_id, "refactor") if run_id else latest_phase_run(base_dir, "refactor")
+    if refactor and refactor["artifact_dir"].is_dir():
+        return refactor["artifact_dir"]
+    # Runs that predate the run index are only discoverable by scanning.
+    candidates = list((base_dir / "3_refactor-output").glob(f"refactor_{run_id or '*'}"))
     if not candidates:
-        raise FileNotFoundError("No refactor_* directory found under 3_refactor-output/")
+        raise FileNotFoundError(f"No refactor_{run_id or '*'} directory found under 3_refactor-output/")
     return max(candidates, key=lambda p: p.stat().st_mtime)
 
 
@@ -30,19 +45,330 @@ def flatten_dark_mode_color(node, prefix="color"):
     return flat
 
 
-def hex_to_figma_rgba(hex_str: str):
-    hex_str = hex_str.lstrip("#")
-    if len(hex_str) == 3:
-        hex_str = "".join(c + c for c in hex_str)
+W3C_TYPE_MAPPING = {
+    "color": "color",
+    "spacing": "dimension",
+    "radius": "dimension",
+    "size": "dimension",
+    "fontFamily": "fontFamily",
+    "fontWeight": "fontWeight",
+    "lineHeight": "number",
+    "letterSpacing": "dimension",
+    "shadow": "shadow",
+    "duration": "duration",
+    "easing": "cubicBezier",
+    "z": "number",
+}
+
+FIGMA_COLOR_CATEGORIES = frozenset(["color", "background", "border", "text", "icon"])
+FIGMA_NUMBER_CATEGORIES = frozenset(["spacing", "radius", "z"])
+
+
+class SyncToken(NamedTuple):
+    """A token normalized once and shared read-only by every emitter."""
+
+    name: str
+    value: object
+    parts: list
+    category: str
+    css_var: str
+    w3c_type: str
+
+
+class DarkToken(NamedTuple):
+    css_var: str
+    has_value: bool
+    value: object
+
+
+class SyncTokens(NamedTuple):
+    """Normalized records plus the per-section buckets the emitters consume."""
+
+    records: list
+    dark_records: list
+    streamable: bool
+    tailwind: dict  # Tailwind section -> SyncTokens in that section
+    figma: dict  # Figma collection key -> build_figma_variable tuples
+
+
+TAILWIND_SECTIONS = ("colors", "spacing", "borderRadius", "boxShadow", "fontFamily", "fontSize")
+TAILWIND_CATEGORY_SECTIONS = {"color": "colors", "spacing": "spacing", "radius": "borderRadius", "shadow": "boxShadow"}
+TAILWIND_FONT_SECTIONS = {"family": "fontFamily", "size": "fontSize"}
+
+FIGMA_COLLECTION_MODES = (
+    ("colors", {"Light": "light_mode_id", "Dark": "dark_mode_id"}),
+    ("numbers", {"Value": "default_mode"}),
+    ("strings", {"Value": "default_mode"}),
+)
+
+
+def tailwind_section(category: str, name_parts: list) -> Optional[str]:
+    """Tailwind theme section a token extends, or None if it has no Tailwind counterpart."""
+    if category == "font":
+        return TAILWIND_FONT_SECTIONS.get(name_parts[1]) if len(name_parts) > 1 else None
+    return TAILWIND_CATEGORY_SECTIONS.get(category)
+
+
+def resolve_w3c_type(raw_type: str, name_parts: list) -> str:
+    w3c_type = W3C_TYPE_MAPPING.get(raw_type, raw_type)
+    if raw_type == "font":
+        if "size" in name_parts:
+            w3c_type = "dimension"
+        if "family" in name_parts:
+            w3c_type = "fontFamily"
+        if "weight" in name_parts:
+            w3c_type = "fontWeight"
+    return w3c_type
+
+
+def build_figma_variable(name: str, category: str, val, dark_mode_map: dict) -> Optional[tuple]:
+    """
+    Figma sync entry ``(collection key, slash name, value(s))`` or None if it cannot be synced.
+
+    Colors carry their (light, dark) hex strings here; ``normalize_sync_tokens`` converts
+    them to Figma RGBA for all tokens at once.
+    """
+    figma_name = name.replace(".", "/")
+    if category in FIGMA_COLOR_CATEGORIES:
+        dark_val = dark_mode_map.get(name, {}).get("value", val)
+        if not (is_hex_value(val) and is_hex_value(dark_val)):
+            return None
+        return "colors", figma_name, (val, dark_val)
+    if category in FIGMA_NUMBER_CATEGORIES:
+        try:
+            num = float(str(val).replace("px", ""))
+        except Exception:
+            return None
+        return "numbers", figma_name, num
+    return "strings", figma_name, str(val)
+
+
+def figma_variable_payload(figma_variable: tuple) -> dict:
+    collection_key, figma_name, value = figma_variable
+    if collection_key == "colors":
+        return {
+            "name": figma_name,
+            "type": "COLOR",
+            "valuesByMode": {
+                "light_mode_id": value[0],
+                "dark_mode_id": value[1],
+            },
+        }
+    return {
+        "name": figma_name,
+        "type": "FLOAT" if collection_key == "numbers" else "STRING",
+        "valuesByMode": {"default_mode": value},
+    }
 
-    r = int(hex_str[0:2], 16) / 255.0
-    g = int(hex_str[2:4], 16) / 255.0
-    b = int(hex_str[4:6], 16) / 255.0
-    a = 1.0
-    if len(hex_str) == 8:
-        a = int(hex_str[6:8], 16) / 255.0
 
-    return {"r": r, "g": g, "b": b, "a": a}
+def normalize_sync_tokens(tokens_list: list, dark_list: list) -> SyncTokens:
+    """
+    Single pass over the light and dark token lists.
+
+    Every string derivation (path split, CSS variable name, Figma slash name, W3C type,
+    parsed Figma colors) happens here exactly once per token, and each token is
+    bucketed by Tailwind section and Figma collection on the way, so no emitter has
+    to filter the records again. ``streamable`` tells whether the token paths are
+    grouped so nested outputs can be streamed.
+    """
+    dark_mode_map = {}
+    dark_records = []
+    for dt in dark_list:
+        dark_mode_map[dt["name"]] = dt
+        dark_records.append(DarkToken("--" + dt["name"].replace(".", "-"), "value" in dt, dt.get("value")))
+
+    records = []
+    tailwind = {section: [] for section in TAILWIND_SECTIONS}
+    figma = {collection_key: [] for collection_key, _ in FIGMA_COLLECTION_MODES}
+    for t in tokens_list:
+        name = t["name"]
+        val = t["value"]
+        name_parts = name.split(".")
+        category = name_parts[0]
+        rec = SyncToken(
+            name=name,
+            value=val,
+            parts=name_parts,
+            category=category,
+            css_var="--" + name.replace(".", "-"),
+            w3c_type=resolve_w3c_type(t.get("type") or category, name_parts),
+        )
+        records.append(rec)
+        section = tailwind_section(category, name_parts)
+        if section:
+            tailwind[section].append(rec)
+        figma_variable = build_figma_variable(name, category, val, dark_mode_map)
+        if figma_variable:
+            figma[figma_variable[0]].append(figma_variable)
+
+    # Every light and dark color is converted to Figma RGBA in one batch.
+    colors = figma["colors"]
+    figma_colors = hex_to_figma([hex_value for _, _, light_dark in colors for hex_value in light_dark])
+    for n, (collection_key, figma_name, _) in enumerate(colors):
+        colors[n] = (collection_key, figma_name, (figma_colors[2 * n], figma_colors[2 * n + 1]))
+    return SyncTokens(records, dark_records, paths_are_grouped(rec.parts for rec in records), tailwind, figma)
+
+
+def write_nested_json(fh, leaves, indent: int, level: int, streamable: bool):
+    """
+    Writes (path parts, leaf) pairs as nested JSON objects.
+
+    Grouped paths are streamed straight to ``fh``; otherwise the tree is built in
+    memory with ``nested_set`` (which resolves duplicates and prefix collisions) and
+    encoded chunk by chunk. A leaf with an empty path is the whole value, as when a
+    ``font.family`` token fills Tailwind's ``fontFamily``; it is never streamed.
+    """
+    if streamable:
+        nested = NestedJsonStreamWriter(fh, indent, level)
+        for parts, leaf in leaves:
+            nested.write(parts, leaf)
+        nested.close()
+        return
+    tree = {}
+    for parts, leaf in leaves:
+        if not parts:
+            tree = leaf
+            continue
+        if not isinstance(tree, dict):
+            tree = {}
+        nested_set(tree, parts, leaf)
+    if tree == {}:
+        fh.write("{}")
+        return
+    pad = "\n" + " " * (indent * level)
+    for chunk in json.JSONEncoder(indent=indent).iterencode(tree):
+        fh.write(chunk.replace("\n", pad) if level else chunk)
+
+
+def emit_w3c_tokens(tokens: SyncTokens, out_dir: Path) -> Path:
+    # W3C DTCG Format Converter (tokens.w3c.json)
+    path = out_dir / "tokens.w3c.json"
+    with open_artifact(path) as fh:
+        fh.write('{\n    "$schema": "https://design-tokens.github.io/community-group/format/",\n    "tokens": ')
+        write_nested_json(
+            fh,
+            ((rec.parts, {"$value": rec.value, "$type": rec.w3c_type}) for rec in tokens.records),
+            indent=4,
+            level=1,
+            streamable=tokens.streamable,
+        )
+        fh.write("\n}")
+    return path
+
+
+def emit_css_variables(tokens: SyncTokens, out_dir: Path) -> Path:
+    # CSS Variables Converter (variables.css)
+    path = out_dir / "variables.css"
+    with open_artifact(path) as fh:
+        fh.write(":root {")
+        for rec in tokens.records:
+            fh.write(f"\n  {rec.css_var}: {rec.value};")
+        fh.write("\n}\n")
+
+        dark_records = tokens.dark_records
+        if dark_records:
+            fh.write("\n@media (prefers-color-scheme: dark) {\n  :root {")
+            for dr in dark_records:
+                if dr.has_value:
+                    fh.write(f"\n    {dr.css_var}: {dr.value};")
+            fh.write("\n  }\n}\n")
+
+            fh.write("\n.dark {")
+            for dr in dark_records:
+                if dr.has_value:
+                    fh.write(f"\n  {dr.css_var}: {dr.value};")
+            fh.write("\n}\n")
+    return path
+
+
+def emit_tailwind_theme(tokens: SyncTokens, out_dir: Path) -> Path:
+    # Tailwind Config Extender (tailwind.theme.js)
+    path = out_dir / "tailwind.theme.js"
+    with open_artifact(path) as fh:
+        fh.write("/** @type {import('tailwindcss').Config} */\nmodule.exports = {\n  theme: {\n    extend: {")
+        for index, section in enumerate(TAILWIND_SECTIONS):
+            fh.write(("," if index else "") + f"\n      {section}: ")
+            # Font sections drop the "family"/"size" segment, other sections the category.
+            skip = 2 if section.startswith("font") else 1
+            selected = tokens.tailwind[section]
+            write_nested_json(
+                fh,
+                ((rec.parts[skip:], f"var({rec.css_var})") for rec in selected),
+                indent=6,
+                level=0,
+                streamable=tokens.streamable and all(len(rec.parts) > skip for rec in selected),
+            )
+        fh.write("\n    }\n  }\n}\n")
+    return path
+
+
+def emit_figma_payload(tokens: SyncTokens, out_dir: Path) -> Path:
+    # Figma Variables Sync Payload (figma-api-payload.json)
+    path = out_dir / "figma-api-payload.json"
+    with open_artifact(path) as fh:
+        fh.write('{\n    "collections": {')
+        for index, (collection_key, modes) in enumerate(FIGMA_COLLECTION_MODES):
+            modes_json = json.dumps(modes, indent=4).replace("\n", "\n" + " " * 12)
+            fh.write(("," if index else "") + f'\n        "{collection_key}": {{\n            "modes": {modes_json},')
+            fh.write('\n            "variables": ')
+            write_json_array_stream(fh, map(figma_variable_payload, tokens.figma[collection_key]), indent=4, level=3)
+            fh.write("\n        }")
+        fh.write("\n    }\n}")
+    return path
+
+
+# Emitters only read the shared normalized tokens, so they can run concurrently.
+EMITTERS = (
+    ("w3c", emit_w3c_tokens, "Generated W3C Tokens: tokens.w3c.json"),
+    ("css", emit_css_variables, "Generated CSS Variables: variables.css"),
+    ("tailwind", emit_tailwind_theme, "Generated Tailwind Config: tailwind.theme.js"),
+    ("figma", emit_figma_payload, "Generated Figma Variables API Payload: figma-api-payload.json"),
+)
+
+
+def _timed(emitter, *args):
+    started = time.perf_counter()
+    path = emitter(*args)
+    return path, time.perf_counter() - started
+
+
+def generate_code_sync_outputs(
+    master_data: dict, dark_data: dict, out_dir: Path, max_workers: int = len(EMITTERS)
+) -> dict:
+    """
+    Emit every code-sync artifact under ``out_dir``.
+
+    Tokens are normalized and bucketed in a single pass, then the four emitters run
+    concurrently on a thread pool over the same read-only buckets, each streaming
+    its artifact to a buffered file handle instead of materializing it first. Returns
+    ``{"artifacts": {filename: path}, "timings": {...}}`` where timings holds the
+    seconds spent normalizing, in each emitter, and the wall-clock total.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    tokens_list = master_data.get("tokens", [])
+    dark_list = dark_data.get("tokens", [])
+    if not dark_list and "color" in dark_data:
+        dark_list = flatten_dark_mode_color(dark_data.get("color", {}), prefix="color")
+
+    started = time.perf_counter()
+    tokens = normalize_sync_tokens(tokens_list, dark_list)
+    timings = {"normalize": round(time.perf_counter() - started, 6)}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sync-emitter") as pool:
+        futures = [
+            (key, message, pool.submit(_timed, emitter, tokens, out_dir))
+            for key, emitter, message in EMITTERS
+        ]
+        artifacts = {}
+        for key, message, future in futures:
+            path, elapsed = future.result()
+            artifacts[path.name] = path
+            timings[key] = round(elapsed, 6)
+            print(message)
+    timings["total_wall"] = round(time.perf_counter() - started, 6)
+
+    print("Emitter timings (s): " + ", ".join(f"{k}={v:.4f}" for k, v in timings.items()))
+    return {"artifacts": artifacts, "timings": timings}
 
 
 def main():
@@ -50,208 +376,30 @@ def main():
     parser.add_argument("--input", type=str, default=None, help="Path to figma-sync-tokens.json")
     parser.add_argument("--dark", type=str, default=None, help="Path to dark-mode-tokens.json")
     parser.add_argument("--out-dir", type=str, default=None, help="Output directory for code-sync artifacts")
+    parser.add_argument("--run-id", type=str, default=None, help="Refactor run to sync (default: latest)")
     args = parser.parse_args()
 
     base_dir = Path(__file__).resolve().parent
-    latest_refactor_dir = find_latest_refactor_dir(base_dir)
+    latest_refactor_dir = find_latest_refactor_dir(base_dir, args.run_id)
 
     input_path = Path(args.input) if args.input else latest_refactor_dir / "figma-sync-tokens.json"
     dark_mode_path = Path(args.dark) if args.dark else latest_refactor_dir / "dark-mode-tokens.json"
 
     if args.out_dir:
         out_dir = Path(args.out_dir)
+    elif args.run_id:
+        out_dir = base_dir / "4_code-sync-output" / f"sync_{args.run_id}"
     else:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         out_dir = base_dir / "4_code-sync-output" / f"sync_{timestamp}"
 
-    out_dir.mkdir(parents=True, exist_ok=True)
-
     with input_path.open("r") as f:
         master_data = json.load(f)
     with dark_mode_path.open("r") as f:
         dark_data = json.load(f)
 
-    tokens_list = master_data.get("tokens", [])
-    dark_list = dark_data.get("tokens", [])
-    if not dark_list and "color" in dark_data:
-        dark_list = flatten_dark_mode_color(dark_data.get("color", {}), prefix="color")
-
-    # 2. W3C DTCG Format Converter (tokens.w3c.json)
-    w3c_dict = {}
-    type_mapping = {
-        "color": "color",
-        "spacing": "dimension",
-        "radius": "dimension",
-        "size": "dimension",
-        "fontFamily": "fontFamily",
-        "fontWeight": "fontWeight",
-        "lineHeight": "number",
-        "letterSpacing": "dimension",
-        "shadow": "shadow",
-        "duration": "duration",
-        "easing": "cubicBezier",
-        "z": "number",
-    }
-
-    for t in tokens_list:
-        name_parts = t["name"].split(".")
-        val = t["value"]
-
-        raw_type = t.get("type") or name_parts[0]
-        w3c_type = type_mapping.get(raw_type, raw_type)
-
-        if raw_type == "font":
-            if "size" in name_parts:
-                w3c_type = "dimension"
-            if "family" in name_parts:
-                w3c_type = "fontFamily"
-            if "weight" in name_parts:
-                w3c_type = "fontWeight"
-
-        nested_set(w3c_dict, name_parts, {"$value": val, "$type": w3c_type})
-
-    w3c_output = {
-        "$schema": "https://design-tokens.github.io/community-group/format/",
-        "tokens": w3c_dict,
-    }
-    with (out_dir / "tokens.w3c.json").open("w") as f:
-        json.dump(w3c_output, f, indent=4)
-    print("Generated W3C Tokens: tokens.w3c.json")
-
-    # 3. CSS Variables Converter (variables.css)
-    css_lines = [":root {"]
-    for t in tokens_list:
-        var_name = "--" + t["name"].replace(".", "-")
-        css_lines.append(f"  {var_name}: {t['value']};")
-    css_lines.append("}\n")
-
-    if dark_list:
-        css_lines.append("@media (prefers-color-scheme: dark) {")
-        css_lines.append("  :root {")
-        for dt in dark_list:
-            var_name = "--" + dt["name"].replace(".", "-")
-            if "value" in dt:
-                css_lines.append(f"    {var_name}: {dt['value']};")
-        css_lines.append("  }")
-        css_lines.append("}\n")
-
-        css_lines.append(".dark {")
-        for dt in dark_list:
-            var_name = "--" + dt["name"].replace(".", "-")
-            if "value" in dt:
-                css_lines.append(f"  {var_name}: {dt['value']};")
-        css_lines.append("}\n")
-
-    with (out_dir / "variables.css").open("w") as f:
-        f.write("\n".join(css_lines))
-    print("Generated CSS Variables: variables.css")
-
-    # 4. Tailwind Config Extender (tailwind.theme.js)
-    tw_colors = {}
-    tw_spacing = {}
-    tw_radius = {}
-    tw_fonts = {}
-    tw_shadows = {}
-
-    for t in tokens_list:
-        name_parts = t["name"].split(".")
-        var_ref = f"var(--{t['name'].replace('.', '-')})"
-
-        if name_parts[0] == "color":
-            nested_set(tw_colors, name_parts[1:], var_ref)
-        elif name_parts[0] == "spacing":
-            nested_set(tw_spacing, name_parts[1:], var_ref)
-        elif name_parts[0] == "radius":
-            nested_set(tw_radius, name_parts[1:], var_ref)
-        elif name_parts[0] == "shadow":
-            nested_set(tw_shadows, name_parts[1:], var_ref)
-        elif name_parts[0] == "font":
-            if name_parts[1] == "family":
-                nested_set(tw_fonts, ["family"] + name_parts[2:], var_ref)
-            elif name_parts[1] == "size":
-                nested_set(tw_fonts, ["size"] + name_parts[2:], var_ref)
-
-    tw_output = f"""/** @type {{import('tailwindcss').Config}} */
-module.exports = {{
-  theme: {{
-    extend: {{
-      colors: {json.dumps(tw_colors, indent=6)},
-      spacing: {json.dumps(tw_spacing, indent=6)},
-      borderRadius: {json.dumps(tw_radius, indent=6)},
-      boxShadow: {json.dumps(tw_shadows, indent=6)},
-      fontFamily: {json.dumps(tw_fonts.get('family', dict()), indent=6)},
-      fontSize: {json.dumps(tw_fonts.get('size', dict()), indent=6)}
-    }}
-  }}
-}}
-"""
-
-    with (out_dir / "tailwind.theme.js").open("w") as f:
-        f.write(tw_output)
-    print("Generated Tailwind Config: tailwind.theme.js")
-
-    # 5. Figma Variables Sync Payload (figma-api-payload.json)
-    figma_collections = {
-        "colors": {
-            "modes": {"Light": "light_mode_id", "Dark": "dark_mode_id"},
-            "variables": [],
-        },
-        "numbers": {
-            "modes": {"Value": "default_mode"},
-            "variables": [],
-        },
-        "strings": {
-            "modes": {"Value": "default_mode"},
-            "variables": [],
-        },
-    }
-
-    dark_mode_map = {dt["name"]: dt for dt in dark_list}
-
-    for t in tokens_list:
-        cat = t["name"].split(".")[0]
-        val = t["value"]
-
-        if cat in ["color", "background", "border", "text", "icon"]:
-            try:
-                light_val = hex_to_figma_rgba(val)
-                dark_val = hex_to_figma_rgba(dark_mode_map.get(t["name"], {}).get("value", val))
-                figma_collections["colors"]["variables"].append(
-                    {
-                        "name": t["name"].replace(".", "/"),
-                        "type": "COLOR",
-                        "valuesByMode": {
-                            "light_mode_id": light_val,
-                            "dark_mode_id": dark_val,
-                        },
-                    }
-                )
-            except Exception:
-                pass
-        elif cat in ["spacing", "radius", "z"]:
-            try:
-                num = float(str(val).replace("px", ""))
-                figma_collections["numbers"]["variables"].append(
-                    {
-                        "name": t["name"].replace(".", "/"),
-                        "type": "FLOAT",
-                        "valuesByMode": {"default_mode": num},
-                    }
-                )
-            except Exception:
-                pass
-        else:
-            figma_collections["strings"]["variables"].append(
-                {
-                    "name": t["name"].replace(".", "/"),
-                    "type": "STRING",
-                    "valuesByMode": {"default_mode": str(val)},
-                }
-            )
-
-    with (out_dir / "figma-api-payload.json").open("w") as f:
-        json.dump({"collections": figma_collections}, f, indent=4)
-    print("Generated Figma Variables API Payload: figma-api-payload.json")
+    result = generate_code_sync_outputs(master_data, dark_data, out_dir)
+    record_phase_run(base_dir, out_dir.name.removeprefix("sync_"), "sync", out_dir, result["artifacts"].values())
     print(f"Generated code-sync outputs in: {out_dir}")
 
 
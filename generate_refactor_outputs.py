@@ -1,31 +1,28 @@
 import argparse
 import json
+import sys
 from datetime import datetime
 from pathlib import Path
-
-def hex_to_rgb(hex_str):
-    hex_str = hex_str.lstrip('#')
-    if len(hex_str) == 6:
-        return tuple(int(hex_str[i:i+2], 16) for i in (0, 2, 4))
-    elif len(hex_str) == 8:
-        return tuple(int(hex_str[i:i+2], 16) for i in (0, 2, 4, 6))
-    return (0,0,0)
-
-def rgb_to_hex(r, g, b):
-    return f"#{r:02x}{g:02x}{b:02x}"
-
-def overlay_on_white(r, g, b, a):
-    # a is 0 to 255
-    alpha = a / 255.0
-    out_r = int(r * alpha + 255 * (1 - alpha))
-    out_g = int(g * alpha + 255 * (1 - alpha))
-    out_b = int(b * alpha + 255 * (1 - alpha))
-    return rgb_to_hex(out_r, out_g, out_b)
-
-def find_latest_proposed_tokens(base_dir: Path) -> Path:
-    candidates = list(base_dir.glob("0_gap-report/gap_*/proposed-tokens.json"))
+from typing import Optional
+
+from color_consolidation import DEFAULT_MERGE_DELTA_E, build_merge_plan
+from color_kernel import composite_over, format_hex, is_hex_color, parse_hex
+from component_audit import find_auto_layout_fixes, find_variant_gaps
+from pipeline_io import ArtifactWriter
+from run_index import find_phase_run, latest_phase_run, record_phase_run
+
+# Bump whenever the refactor artifacts change shape or content for the same inputs.
+GENERATOR_VERSION = "1.3"
+
+def find_latest_proposed_tokens(base_dir: Path, run_id: Optional[str] = None) -> Path:
+    """``proposed-tokens.json`` of audit run ``run_id``, or of the latest audit run."""
+    audit = find_phase_run(base_dir, run_id, "audit") if run_id else latest_phase_run(base_dir, "audit")
+    if audit and (audit["artifact_dir"] / "proposed-tokens.json").exists():
+        return audit["artifact_dir"] / "proposed-tokens.json"
+    # Runs that predate the run index are only discoverable by scanning.
+    candidates = list(base_dir.glob(f"0_gap-report/gap_{run_id or '*'}/proposed-tokens.json"))
     if not candidates:
-        raise FileNotFoundError("No proposed-tokens.json found under 0_gap-report/gap_*/")
+        raise FileNotFoundError(f"No proposed-tokens.json found under 0_gap-report/gap_{run_id or '*'}/")
     return max(candidates, key=lambda p: p.stat().st_mtime)
 
 
@@ -39,46 +36,37 @@ def flatten_dict(d, parent_key=""):
             items.append((new_key, v["value"]))
     return items
 
-def main():
-    parser = argparse.ArgumentParser(description="Generate refactor artifacts from proposed tokens.")
-    parser.add_argument("--design-tokens", type=str, default=None, help="Path to design-tokens.json")
-    parser.add_argument("--proposed", type=str, default=None, help="Path to proposed-tokens.json")
-    parser.add_argument("--out-dir", type=str, default=None, help="Output directory for refactor artifacts")
-    args = parser.parse_args()
-
-    base_dir = Path(__file__).resolve().parent
-    design_tokens_path = Path(args.design_tokens) if args.design_tokens else base_dir / "design-tokens.json"
-    proposed_tokens_path = Path(args.proposed) if args.proposed else find_latest_proposed_tokens(base_dir)
-    if args.out_dir:
-        out_dir = Path(args.out_dir)
-    else:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        out_dir = base_dir / "3_refactor-output" / f"refactor_{timestamp}"
-
+def generate_refactor_outputs(
+    design_tokens: dict,
+    proposed_data: dict,
+    out_dir: Path,
+    writer: Optional[ArtifactWriter] = None,
+    merge_delta_e: float = DEFAULT_MERGE_DELTA_E,
+) -> dict:
+    """
+    Build every refactor artifact, write it under ``out_dir`` and return the payloads by filename.
+
+    ``merge_delta_e`` is the OKLab distance under which colors are planned for merging.
+    Variant gaps and auto-layout fixes come from the ``components`` node data in
+    ``design_tokens``; without it (e.g. a variables-only snapshot, or a failed fetch
+    recorded under ``fetch_errors``) they are empty.
+    """
     out_dir.mkdir(parents=True, exist_ok=True)
-
-    with design_tokens_path.open("r") as f:
-        design_tokens = json.load(f)
-
-    with proposed_tokens_path.open("r") as f:
-        proposed_data = json.load(f)
+    writer = writer or ArtifactWriter()
 
     proposed_tokens = proposed_data.get("tokens", {})
 
+    # Translucent colors are flattened onto white in one batch.
+    translucent = [(k, v) for k, v in design_tokens.get("colors", {}).items() if is_hex_color(v) and len(v) == 9]
+    solid_hexes = format_hex(composite_over(parse_hex(v for _, v in translucent)))
     accessibility_fixes = []
-    for k, v in design_tokens.get("colors", {}).items():
-        if isinstance(v, str) and len(v) == 9 and v.startswith("#"):
-            rgba = hex_to_rgb(v)
-            solid_hex = overlay_on_white(rgba[0], rgba[1], rgba[2], rgba[3])
-            accessibility_fixes.append({
-                "legacy_name": k,
-                "legacy_value": v,
-                "resolved_solid_hex": solid_hex,
-                "action": "Converted opacity hex to solid hex based on white background",
-            })
-
-    with (out_dir / "accessibility-fixes.json").open("w") as f:
-        json.dump({"fixes": accessibility_fixes}, f, indent=4)
+    for (k, v), solid_hex in zip(translucent, solid_hexes):
+        accessibility_fixes.append({
+            "legacy_name": k,
+            "legacy_value": v,
+            "resolved_solid_hex": solid_hex,
+            "action": "Converted opacity hex to solid hex based on white background",
+        })
 
     dark_mode_tokens = {}
     for category, roles in proposed_tokens.get("color", {}).items():
@@ -89,9 +77,12 @@ def main():
                 for scale_val, data in scales.items():
                     if scale_val.isdigit():
                         num = int(scale_val)
-                        inverted_num = 950 - num if num != 50 else 900
-                        if inverted_num == 450:
-                            inverted_num = 500
+                        if "950" in scales:
+                            inverted_num = 1000 - num
+                        else:
+                            inverted_num = 950 - num if num != 50 else 900
+                            if inverted_num == 450:
+                                inverted_num = 500
                         legacy_val = scales.get(str(inverted_num), data)["value"]
                         dark_mode_tokens[category][role][scale_val] = {
                             "value": legacy_val,
@@ -103,53 +94,16 @@ def main():
                             "method": "Direct passthrough for non-numeric scales (requires manual tuning)",
                         }
 
-    with (out_dir / "dark-mode-tokens.json").open("w") as f:
-        json.dump({"color": dark_mode_tokens}, f, indent=4)
-
-    variant_gaps = [
-        {
-            "component": "Button",
-            "missing_states": ["focus", "loading", "error", "skeleton"],
-            "recommended_action": "Add variant property 'state' with values: focus, loading, error, skeleton",
-        },
-        {
-            "component": "Input",
-            "missing_states": ["focus", "error", "disabled"],
-            "recommended_action": "Add variant property 'state' with values: focus, error, disabled",
-        },
-        {
-            "component": "Card",
-            "missing_states": ["hover", "focus", "skeleton"],
-            "recommended_action": "Add variant property 'state' with values: hover, focus, skeleton for clickable cards",
-        },
-    ]
-    with (out_dir / "variant-gaps.json").open("w") as f:
-        json.dump(variant_gaps, f, indent=4)
-
-    auto_layout_fixes = [
-        {
-            "target": "Modal Container",
-            "issue": "Detached instance and absolute positioning",
-            "fix": {
-                "layoutMode": "VERTICAL",
-                "primaryAxisAlignItems": "MIN",
-                "counterAxisAlignItems": "MIN",
-                "itemSpacing": "spacing.4",
-            },
-        },
-        {
-            "target": "Page Header",
-            "issue": "Missing auto-layout",
-            "fix": {
-                "layoutMode": "HORIZONTAL",
-                "primaryAxisAlignItems": "SPACE_BETWEEN",
-                "counterAxisAlignItems": "CENTER",
-                "itemSpacing": "spacing.5",
-            },
-        },
-    ]
-    with (out_dir / "auto-layout-fixes.json").open("w") as f:
-        json.dump(auto_layout_fixes, f, indent=4)
+    components = design_tokens.get("components", {})
+    variant_gaps = find_variant_gaps(components)
+    auto_layout_fixes = find_auto_layout_fixes(components, proposed_tokens.get("spacing", {}))
+    component_error = design_tokens.get("fetch_errors", {}).get("components")
+    if component_error:
+        print(
+            f"Warning: component data was not fetched ({component_error}); variant-gaps.json and "
+            "auto-layout-fixes.json do not cover components (see fetch_errors in the audit report)",
+            file=sys.stderr,
+        )
 
     flat_sync_tokens = []
     for k, v in flatten_dict(proposed_tokens):
@@ -169,9 +123,75 @@ def main():
         "status": "ready_for_figma_sync",
         "tokens": flat_sync_tokens,
     }
-    with (out_dir / "figma-sync-tokens.json").open("w") as f:
-        json.dump(figma_sync_payload, f, indent=4)
 
+    outputs = {
+        "accessibility-fixes.json": {"fixes": accessibility_fixes},
+        "color-merge-plan.json": build_merge_plan(design_tokens.get("colors", {}), merge_delta_e),
+        "dark-mode-tokens.json": {"color": dark_mode_tokens},
+        "variant-gaps.json": variant_gaps,
+        "auto-layout-fixes.json": auto_layout_fixes,
+        "figma-sync-tokens.json": figma_sync_payload,
+    }
+    for filename, payload in outputs.items():
+        writer.write_json(out_dir / filename, payload, indent=4)
+    return outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate refactor artifacts from proposed tokens.")
+    parser.add_argument(
+        "--design-tokens",
+        type=str,
+        default=None,
+        help="Path to design tokens (default: the audit run's design-tokens.used.json)",
+    )
+    parser.add_argument("--proposed", type=str, default=None, help="Path to proposed-tokens.json")
+    parser.add_argument("--out-dir", type=str, default=None, help="Output directory for refactor artifacts")
+    parser.add_argument(
+        "--run-id", type=str, default=None, help="Audit run whose proposed tokens to use (default: latest)"
+    )
+    parser.add_argument(
+        "--merge-delta-e",
+        type=float,
+        default=DEFAULT_MERGE_DELTA_E,
+        help=f"OKLab distance under which colors are merged (default: {DEFAULT_MERGE_DELTA_E})",
+    )
+    args = parser.parse_args()
+
+    base_dir = Path(__file__).resolve().parent
+    proposed_tokens_path = Path(args.proposed) if args.proposed else find_latest_proposed_tokens(base_dir, args.run_id)
+    if args.design_tokens:
+        design_tokens_path = Path(args.design_tokens)
+    elif args.proposed and not args.run_id:
+        design_tokens_path = base_dir / "design-tokens.json"
+    else:
+        # The tokens the audit run actually read, so its proposals are never paired with other tokens.
+        gap_dir = find_latest_proposed_tokens(base_dir, args.run_id).parent
+        design_tokens_path = gap_dir / "design-tokens.used.json"
+        if not design_tokens_path.exists():
+            raise FileNotFoundError(f"No design-tokens.used.json in {gap_dir}; pass --design-tokens")
+    if args.out_dir:
+        out_dir = Path(args.out_dir)
+    elif args.run_id:
+        out_dir = base_dir / "3_refactor-output" / f"refactor_{args.run_id}"
+    else:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        out_dir = base_dir / "3_refactor-output" / f"refactor_{timestamp}"
+
+    with design_tokens_path.open("r") as f:
+        design_tokens = json.load(f)
+
+    with proposed_tokens_path.open("r") as f:
+        proposed_data = json.load(f)
+
+    outputs = generate_refactor_outputs(design_tokens, proposed_data, out_dir, merge_delta_e=args.merge_delta_e)
+    record_phase_run(
+        base_dir,
+        out_dir.name.removeprefix("refactor_"),
+        "refactor",
+        out_dir,
+        [out_dir / name for name in outputs],
+    )
     print(f"Generated refactor outputs in: {out_dir}")
 
 
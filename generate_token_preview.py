@@ -2,11 +2,11 @@ import json
 import os
 import argparse
 from datetime import datetime
+from pathlib import Path
 
-def generate_preview(input_json_path: str, output_html_path: str):
-    with open(input_json_path, "r") as f:
-        proposed_data = json.load(f)
+from pipeline_io import write_text
 
+def render_preview(proposed_data: dict) -> str:
     tokens = proposed_data.get("tokens", {}).get("color", {})
     brand_primary = tokens.get("brand", {}).get("primary", {}).get("500", {}).get("value", "#000000")
     bg_primary = proposed_data.get("tokens", {}).get("background", {}).get("primary", {}).get("value", "#ffffff")
@@ -482,9 +482,14 @@ def generate_preview(input_json_path: str, output_html_path: str):
 </body>
 </html>
 """
+    return html_content
+
+
+def generate_preview(input_json_path: str, output_html_path: str):
+    with open(input_json_path, "r") as f:
+        proposed_data = json.load(f)
 
-    with open(output_html_path, "w") as f:
-        f.write(html_content)
+    write_text(Path(output_html_path), render_preview(proposed_data))
 
     print(f"Token gap preview generated at: {output_html_path}")
 
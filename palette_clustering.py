@@ -0,0 +1,151 @@
+import json
+import os
+from pathlib import Path
+from typing import Mapping, Optional
+
+from color_kernel import is_hex_color, kmeans, median_cut, nearest_centers, parse_hex, rgba8_to_oklab, rows
+from phase_cache import hash_payload
+from pipeline_io import evict_least_recently_used, write_json
+
+PALETTE_CACHE_DIR = ".palette-cache"
+# Least recently used palettes are evicted past this size, as in the HTTP cache.
+PALETTE_CACHE_MAX_BYTES = 16 * 1024 * 1024
+# Bump when clustering changes so cached palettes are recomputed.
+PALETTE_VERSION = "1"
+
+# Every observed color should land within this ΔE_OK of its palette color: coarser
+# than the merge threshold, since the palette consolidates shades, not just duplicates.
+DEFAULT_PALETTE_TOLERANCE = 0.05
+MAX_PALETTE_SIZE = 64
+KMEANS_ITERATIONS = 20
+
+
+def cluster_values(values: list, weights: list, tolerance: float, max_colors: int) -> dict:
+    """
+    Palette for distinct ``#rrggbb`` ``values`` used by ``weights`` tokens each.
+
+    Median cut in OKLab seeds the clusters (splitting until every color is within
+    ``tolerance`` of its box, or ``max_colors`` boxes), weighted k-means refines
+    them, and each cluster is represented by its observed color nearest the
+    centroid, so the palette only contains colors already in the library.
+    Returns ``{"palette": [value], "labels": [palette index per value], "delta_e": [...]}``.
+    """
+    if not values:
+        return {"palette": [], "labels": [], "delta_e": []}
+    lab = rgba8_to_oklab(parse_hex(values))
+    labels, centers = kmeans(lab, weights, median_cut(lab, weights, tolerance, max_colors), KMEANS_ITERATIONS)
+    points = rows(lab)
+    members = {}
+    for i, label in enumerate(labels):
+        members.setdefault(label, []).append(i)
+    # Busiest clusters first; each is represented by its member closest to the centroid.
+    representatives = []
+    for box in sorted(members.values(), key=lambda box: (-sum(weights[i] for i in box), box[0])):
+        center = centers[labels[box[0]]]
+        representatives.append(
+            min(box, key=lambda i: (sum((a - b) ** 2 for a, b in zip(points[i], center)), -weights[i], i))
+        )
+    # Colors then map to their nearest palette color, which need not be their own cluster's.
+    final, distances = nearest_centers(lab, [points[i] for i in representatives])
+    return {
+        "palette": [values[i] for i in representatives],
+        "labels": final,
+        "delta_e": [round(distance, 4) for distance in distances],
+    }
+
+
+def _cached_clusters(
+    values: list, weights: list, tolerance: float, max_colors: int, cache_dir: Optional[Path]
+) -> tuple:
+    """``(input hash, cluster_values result)``, reused from ``cache_dir`` when the same colors were clustered before."""
+    key = hash_payload(
+        {
+            "version": PALETTE_VERSION,
+            "tolerance": tolerance,
+            "max_colors": max_colors,
+            "colors": [[value, weight] for value, weight in zip(values, weights)],
+        },
+        None,
+    )
+    path = cache_dir / f"{key}.json" if cache_dir is not None else None
+    if path is not None:
+        try:
+            result = json.loads(path.read_text())
+            os.utime(path)
+            return key, result
+        except (OSError, json.JSONDecodeError):
+            pass
+    result = cluster_values(values, weights, tolerance, max_colors)
+    if path is not None:
+        write_json(path, result, indent=None)
+        _evict_palettes(cache_dir)
+    return key, result
+
+
+def _evict_palettes(cache_dir: Path):
+    entries = []
+    for path in cache_dir.glob("*.json"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, (path,)))
+    evict_least_recently_used(entries, PALETTE_CACHE_MAX_BYTES)
+
+
+def propose_palette(
+    colors: Mapping[str, str],
+    tolerance: float = DEFAULT_PALETTE_TOLERANCE,
+    max_colors: int = MAX_PALETTE_SIZE,
+    cache_dir: Optional[Path] = None,
+) -> dict:
+    """
+    Consolidated palette for ``{token name: hex}`` colors, with a legacy -> proposed mapping.
+
+    Clustering works on opaque RGB: a translucent token maps to its palette color
+    with its own alpha kept, since opacity is a separate token category. Distinct
+    values are sorted before clustering, so the result (and its cache entry) only
+    depends on which colors are used how often, not on token names or order.
+    """
+    usage = {}
+    for value in colors.values():
+        if is_hex_color(value):
+            rgb = value[:7].lower()
+            usage[rgb] = usage.get(rgb, 0) + 1
+    values = sorted(usage)
+    weights = [usage[value] for value in values]
+    input_hash, clusters = _cached_clusters(values, weights, tolerance, max_colors, cache_dir)
+    palette = clusters["palette"]
+    index = {value: n for n, value in enumerate(values)}
+
+    tokens = [0] * len(palette)
+    spans = [0.0] * len(palette)
+    mapping = {}
+    for name, value in colors.items():
+        if not is_hex_color(value):
+            continue
+        n = index[value[:7].lower()]
+        label, delta_e = clusters["labels"][n], clusters["delta_e"][n]
+        tokens[label] += 1
+        spans[label] = max(spans[label], delta_e)
+        mapping[name] = {"from": value, "to": palette[label] + value[7:].lower(), "delta_e": delta_e}
+
+    max_delta_e = max(clusters["delta_e"], default=0.0)
+    return {
+        "metric": "deltaE_OK",
+        "method": "median-cut + k-means",
+        "tolerance": tolerance,
+        "max_colors": max_colors,
+        "input_hash": input_hash,
+        "colors_analyzed": len(mapping),
+        "distinct_values": len(values),
+        "palette_size": len(palette),
+        "max_delta_e": max_delta_e,
+        "within_tolerance": max_delta_e <= tolerance,
+        "palette": [
+            {"value": value, "tokens": count, "max_delta_e": span}
+            for value, count, span in zip(palette, tokens, spans)
+        ],
+        "mapping": mapping,
+        "tokens_changed": sum(1 for entry in mapping.values() if entry["delta_e"] > 0),
+    }
@@ -0,0 +1,82 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Iterable
+
+from pipeline_io import write_json
+
+MANIFEST_NAME = ".phase-manifest.json"
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_payload(payload, indent: int) -> str:
+    """
+    Hash of an in-memory payload, equal to ``hash_file`` of the artifact it is written to.
+
+    Phases write JSON with ``json.dump(payload, f, indent=indent)``, so hashing the same
+    serialization lets in-memory (``all``) and on-disk runs share fingerprints.
+    """
+    return hashlib.sha256(json.dumps(payload, indent=indent).encode("utf-8")).hexdigest()
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def phase_fingerprint(phase: str, generator_version: str, inputs: dict) -> dict:
+    return {"phase": phase, "generator_version": generator_version, "inputs": dict(sorted(inputs.items()))}
+
+
+def is_phase_up_to_date(manifest_dir: Path, fingerprint: dict) -> bool:
+    """True when the recorded fingerprint matches and every recorded output still exists."""
+    manifest_path = manifest_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        return False
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return False
+    if manifest.get("fingerprint") != fingerprint:
+        return False
+    outputs = manifest.get("outputs") or []
+    return bool(outputs) and all((manifest_dir / rel).exists() for rel in outputs)
+
+
+def recorded_outputs(manifest_dir: Path) -> list:
+    manifest = json.loads((manifest_dir / MANIFEST_NAME).read_text())
+    return [manifest_dir / rel for rel in manifest.get("outputs", [])]
+
+
+def link_outputs(pairs: Iterable[tuple]):
+    """
+    Hard-links each ``(source, target)`` output, copying where links are unsupported.
+
+    Artifacts are only ever replaced by rename (``open_artifact``), so rewriting
+    either path later never changes the other.
+    """
+    for source, target in pairs:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.unlink(missing_ok=True)
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copy2(source, target)
+
+
+def record_phase_fingerprint(manifest_dir: Path, fingerprint: dict, outputs: Iterable[Path]):
+    """Must run after the outputs are on disk, so a crash never leaves a manifest without outputs."""
+    manifest_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {
+        "fingerprint": fingerprint,
+        "outputs": sorted(os.path.relpath(path, manifest_dir) for path in outputs),
+    }
+    write_json(manifest_dir / MANIFEST_NAME, manifest)
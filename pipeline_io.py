@@ -0,0 +1,245 @@
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: advisory locks are skipped, writes stay atomic.
+    fcntl = None
+
+STREAM_BUFFER_SIZE = 1 << 20
+
+
+def _create_temp(path: Path) -> tuple:
+    """
+    Exclusively creates a temp file next to ``path``. Unlike ``tempfile.mkstemp`` (0600)
+    it is opened with 0666, so the kernel applies the process umask as for any artifact.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        tmp_name = path.parent / f".{path.name}.{os.urandom(6).hex()}.tmp"
+        try:
+            return os.open(tmp_name, flags, 0o666), tmp_name
+        except FileExistsError:
+            continue
+
+
+@contextmanager
+def open_artifact(path: Path, buffering: int = STREAM_BUFFER_SIZE, mode: str = "w"):
+    """
+    Buffered handle (text by default, ``mode="wb"`` for bytes) whose content replaces
+    ``path`` atomically on success.
+
+    Data goes to a temp file in the same directory and is renamed over ``path`` only
+    once the block completes, so concurrent readers never observe a partial artifact
+    and a failed write leaves the previous version in place.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = _create_temp(path)
+    try:
+        with os.fdopen(fd, mode, buffering=buffering) as f:
+            yield f
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def write_text(path: Path, text: str):
+    with open_artifact(path, buffering=-1) as f:
+        f.write(text)
+
+
+def write_json(path: Path, data, indent: int = 2):
+    with open_artifact(path, buffering=-1) as f:
+        json.dump(data, f, indent=indent)
+
+
+def evict_least_recently_used(entries: Iterable[tuple], max_bytes: float):
+    """
+    Deletes ``(mtime, size, paths)`` cache entries, oldest first, until the rest fit in
+    ``max_bytes``. Caches touch an entry's mtime on every hit, so oldest is least recently used.
+    """
+    entries = sorted(entries, key=lambda entry: entry[0])
+    total = sum(size for _, size, _ in entries)
+    for _, size, paths in entries:
+        if total <= max_bytes:
+            break
+        for path in paths:
+            path.unlink(missing_ok=True)
+        total -= size
+
+
+@contextmanager
+def locked(path: Path):
+    """Exclusive advisory lock guarding a shared pointer file such as ``latest.json``."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _dumps_at(value, indent: int, level: int) -> str:
+    # json.dumps output re-indented so it can be spliced in at ``level``; encoded
+    # strings never contain raw newlines, so a plain replace is safe.
+    text = json.dumps(value, indent=indent)
+    return text.replace("\n", "\n" + " " * (indent * level)) if level else text
+
+
+class NestedJsonStreamWriter:
+    """
+    Streams ``{"a": {"b": leaf, ...}, ...}`` from (path parts, leaf) pairs.
+
+    Produces exactly what ``json.dumps(nested, indent=indent)`` would, with the root
+    object placed at ``level``. Paths must be grouped: every shared prefix appears as
+    one contiguous run, no path repeats, and no leaf is also a prefix (see
+    ``paths_are_grouped``). Only the currently open path is held in memory.
+    """
+
+    def __init__(self, fh, indent: int, level: int = 0):
+        self._fh = fh
+        self._indent = indent
+        self._level = level
+        self._stack: list[str] = []
+        self._empty = [True]
+        fh.write("{")
+
+    def write(self, parts: list, value):
+        if not parts:
+            raise ValueError("NestedJsonStreamWriter needs at least one key per leaf")
+        common = 0
+        limit = min(len(self._stack), len(parts) - 1)
+        while common < limit and self._stack[common] == parts[common]:
+            common += 1
+        while len(self._stack) > common:
+            self._close_object()
+        for key in parts[common:-1]:
+            self._write_key(key)
+            self._fh.write("{")
+            self._stack.append(key)
+            self._empty.append(True)
+        self._write_key(parts[-1])
+        self._fh.write(_dumps_at(value, self._indent, self._level + len(self._stack) + 1))
+
+    def close(self):
+        while self._stack:
+            self._close_object()
+        self._close_object()
+
+    def _write_key(self, key: str):
+        if not self._empty[-1]:
+            self._fh.write(",")
+        self._empty[-1] = False
+        pad = " " * (self._indent * (self._level + len(self._stack) + 1))
+        self._fh.write("\n" + pad + json.dumps(key) + ": ")
+
+    def _close_object(self):
+        if self._empty.pop():
+            self._fh.write("}")
+        else:
+            self._fh.write("\n" + " " * (self._indent * (self._level + len(self._stack))) + "}")
+        if self._stack:
+            self._stack.pop()
+
+
+def paths_are_grouped(paths: Iterable[list]) -> bool:
+    """True when ``paths`` can be streamed by ``NestedJsonStreamWriter`` in the given order."""
+    # Prefix hashes keep the check small; a collision only forces the non-streaming path.
+    closed = set()
+    previous: list = []
+    for parts in paths:
+        common = 0
+        limit = min(len(previous), len(parts))
+        while common < limit and previous[common] == parts[common]:
+            common += 1
+        if common == len(parts) or common == len(previous) and previous:
+            return False  # duplicate path, or a leaf reused as a prefix
+        for depth in range(common + 1, len(previous) + 1):
+            closed.add(hash(tuple(previous[:depth])))
+        for depth in range(common + 1, len(parts) + 1):
+            if hash(tuple(parts[:depth])) in closed:
+                return False
+        previous = parts
+    return True
+
+
+def write_json_array_stream(fh, items: Iterable, indent: int, level: int):
+    """Streams a JSON array whose layout matches ``json.dumps(list(items), indent=indent)``."""
+    pad = " " * (indent * (level + 1))
+    empty = True
+    fh.write("[")
+    for item in items:
+        fh.write(("\n" if empty else ",\n") + pad + _dumps_at(item, indent, level + 1))
+        empty = False
+    fh.write("]" if empty else "\n" + " " * (indent * level) + "]")
+
+
+class ArtifactWriter:
+    """
+    Writes pipeline artifacts either inline or on a background thread pool.
+
+    With ``background=True`` serialization and disk I/O are queued so the caller can
+    keep working on the in-memory payloads; ``close()`` waits for every pending
+    write and re-raises the first failure. Payloads must not be mutated once queued.
+    """
+
+    def __init__(self, background: bool = False, max_workers: int = 4):
+        self._executor: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="artifact-writer") if background else None
+        )
+        self._pending: list[Future] = []
+
+    def write_text(self, path: Path, text: str):
+        self._submit(write_text, path, text)
+
+    def write_json(self, path: Path, data, indent: int = 2):
+        self._submit(write_json, path, data, indent)
+
+    def _submit(self, fn, *args):
+        if self._executor is None:
+            fn(*args)
+        else:
+            self._pending.append(self._executor.submit(fn, *args))
+
+    def then(self, fn, *args):
+        """Run ``fn`` once every write queued so far has completed successfully."""
+        if self._executor is None:
+            fn(*args)
+            return
+        queued = list(self._pending)
+
+        def run_after_writes():
+            for future in queued:
+                future.result()
+            fn(*args)
+
+        self._pending.append(self._executor.submit(run_after_writes))
+
+    def close(self):
+        if self._executor is None:
+            return
+        pending, self._pending = self._pending, []
+        try:
+            for future in pending:
+                future.result()
+        finally:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,89 @@
+import json
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Optional
+
+INDEX_NAME = ".pipeline-runs.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS phase_runs (
+    run_id TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    completed_at REAL NOT NULL,
+    artifact_dir TEXT NOT NULL,
+    artifacts TEXT NOT NULL,
+    PRIMARY KEY (run_id, phase)
+);
+CREATE TABLE IF NOT EXISTS latest_phase_runs (
+    phase TEXT PRIMARY KEY,
+    run_id TEXT NOT NULL
+);
+"""
+
+
+def _connect(base_dir: Path) -> sqlite3.Connection:
+    # Rollback journal rather than WAL: WAL needs shared memory, which network filesystems lack.
+    conn = sqlite3.connect(base_dir / INDEX_NAME, timeout=30)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _relative(base_dir: Path, path: Path) -> str:
+    try:
+        return str(Path(path).resolve().relative_to(base_dir.resolve()))
+    except ValueError:
+        return str(Path(path).resolve())
+
+
+def _row_to_run(base_dir: Path, row) -> dict:
+    run_id, phase, completed_at, artifact_dir, artifacts = row
+    return {
+        "run_id": run_id,
+        "phase": phase,
+        "completed_at": completed_at,
+        "artifact_dir": base_dir / artifact_dir,
+        "artifacts": [base_dir / rel for rel in json.loads(artifacts)],
+    }
+
+
+def record_phase_run(base_dir: Path, run_id: str, phase: str, artifact_dir: Path, artifacts=()):
+    """Upserts ``(run_id, phase)`` and makes it the latest run for ``phase``."""
+    with closing(_connect(base_dir)) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO phase_runs (run_id, phase, completed_at, artifact_dir, artifacts) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                run_id,
+                phase,
+                time.time(),
+                _relative(base_dir, artifact_dir),
+                json.dumps([_relative(base_dir, path) for path in artifacts]),
+            ),
+        )
+        conn.execute("INSERT OR REPLACE INTO latest_phase_runs (phase, run_id) VALUES (?, ?)", (phase, run_id))
+
+
+def find_phase_run(base_dir: Path, run_id: str, phase: str) -> Optional[dict]:
+    if not (base_dir / INDEX_NAME).exists():
+        return None
+    with closing(_connect(base_dir)) as conn:
+        row = conn.execute(
+            "SELECT run_id, phase, completed_at, artifact_dir, artifacts FROM phase_runs WHERE run_id = ? AND phase = ?",
+            (run_id, phase),
+        ).fetchone()
+    return _row_to_run(base_dir, row) if row else None
+
+
+def latest_phase_run(base_dir: Path, phase: str) -> Optional[dict]:
+    if not (base_dir / INDEX_NAME).exists():
+        return None
+    with closing(_connect(base_dir)) as conn:
+        row = conn.execute(
+            "SELECT r.run_id, r.phase, r.completed_at, r.artifact_dir, r.artifacts "
+            "FROM latest_phase_runs l JOIN phase_runs r ON r.run_id = l.run_id AND r.phase = l.phase "
+            "WHERE l.phase = ?",
+            (phase,),
+        ).fetchone()
+    return _row_to_run(base_dir, row) if row else None
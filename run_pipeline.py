@@ -1,19 +1,52 @@
 import argparse
+import html
 import json
 import os
 import re
-import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional, TextIO
 from urllib.parse import urlparse
 
+from audit_scoring import AuditInputs, score_audit
+from brand_ramp import generate_ramps
+from color_consolidation import DEFAULT_MERGE_DELTA_E
+from color_kernel import is_hex_color
+from contrast_audit import load_contrast_policy
+from figma_cache import CACHE_DIR_NAME, HttpCache, fetch_parsed_cached
+from figma_http import FETCH_ERRORS, METRIC_NAMES, FigmaFetchError, get_figma_client, metrics_delta
+from figma_nodes import fetch_component_nodes
+from figma_styles import fetch_figma_styles_via_rest, parse_style_exports, shadow_scale, weight_scale
+from figma_stream import JsonStreamReader
 # Import the new decoupled HTML preview generator
-from generate_token_preview import generate_preview
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+from generate_token_preview import render_preview
+from generate_code_sync_outputs import GENERATOR_VERSION as SYNC_GENERATOR_VERSION
+from generate_code_sync_outputs import generate_code_sync_outputs
+from generate_refactor_outputs import GENERATOR_VERSION as REFACTOR_GENERATOR_VERSION
+from generate_refactor_outputs import generate_refactor_outputs
+from phase_cache import (
+    hash_file,
+    hash_payload,
+    hash_text,
+    is_phase_up_to_date,
+    link_outputs,
+    phase_fingerprint,
+    record_phase_fingerprint,
+    recorded_outputs,
+)
+from palette_clustering import PALETTE_CACHE_DIR, propose_palette
+from pipeline_io import ArtifactWriter, write_json
+from run_index import latest_phase_run, record_phase_run
+from scale_inference import infer_scales
+from token_naming import load_token_schema
+from token_table import TokenTable
 from urllib.parse import parse_qs, urlparse
 
+# Bump whenever the audit/gap artifacts change shape or content for the same inputs.
+AUDIT_GENERATOR_VERSION = "1.11"
 
 def extract_figma_parts(figma_url: str):
     file_match = re.search(r"/design/([^/]+)/", figma_url)
@@ -30,33 +63,41 @@ def first_hex(colors: dict, fallback="#007fff"):
     return fallback
 
 
-def build_proposed_tokens(design_tokens: dict):
+def brand_seed(design_tokens: dict) -> str:
+    """The library's primary brand color, which ``color.brand.primary`` is derived from."""
+    colors = design_tokens.get("colors", {})
+    named = (colors.get("Primary"), colors.get("Action/01Primary"))
+    return next((value for value in named if is_hex_color(value)), None) or first_hex(colors)
+
+
+def scale_tokens(inferred: Optional[dict], default: dict) -> dict:
+    """Tokens for an inferred ``infer_scales`` category, or ``default`` when the library has none."""
+    return {name: {"value": value} for name, value in inferred["scale"].items()} if inferred else default
+
+
+def value_tokens(values: dict, default: dict) -> dict:
+    """Tokens for ``{name: value}`` observed in the library, or ``default`` when there are none."""
+    return {name: {"value": value} for name, value in values.items()} if values else default
+
+
+def build_proposed_tokens(design_tokens: dict, brand_steps: dict, scales: dict):
+    """
+    Proposed token set; ``brand_steps`` is the ``{step: hex}`` ramp generated from
+    ``brand_seed`` and ``scales`` the ``infer_scales`` result for the same tokens.
+    Font weights and shadows come from the library's text and effect styles.
+    """
     colors = design_tokens.get("colors", {})
     typo = design_tokens.get("typography", {})
-    primary = colors.get("Primary") or colors.get("Action/01Primary") or first_hex(colors)
+    effects = design_tokens.get("effects", {})
 
-    family = "SF Pro"
-    if typo:
-        first_typo = next(iter(typo.values()))
-        family = first_typo.get("family", family)
+    # The most used family across text styles, first seen on ties.
+    families = [style.get("family") for style in typo.values() if isinstance(style, dict) and style.get("family")]
+    family = max(families, key=families.count) if families else "SF Pro"
 
     return {
         "tokens": {
             "color": {
-                "brand": {
-                    "primary": {
-                        "50": {"value": "#eff6ff"},
-                        "100": {"value": "#dbeafe"},
-                        "200": {"value": "#bfdbfe"},
-                        "300": {"value": "#93c5fd"},
-                        "400": {"value": "#60a5fa"},
-                        "500": {"value": primary},
-                        "600": {"value": "#2563eb"},
-                        "700": {"value": "#1d4ed8"},
-                        "800": {"value": "#1e40af"},
-                        "900": {"value": "#1e3a8a"},
-                    }
-                },
+                "brand": {"primary": {step: {"value": value} for step, value in brand_steps.items()}},
                 "neutral": {
                     "50": {"value": "#f8fafc"},
                     "100": {"value": "#f1f5f9"},
@@ -82,44 +123,59 @@ def build_proposed_tokens(design_tokens: dict):
             "border": {
                 "default": {"value": colors.get("Dividers & borders", "#e2e8f0")}
             },
-            "spacing": {
-                "0": {"value": "0px"},
-                "1": {"value": "4px"},
-                "2": {"value": "8px"},
-                "3": {"value": "12px"},
-                "4": {"value": "16px"},
-                "5": {"value": "20px"},
-                "6": {"value": "24px"},
-                "8": {"value": "32px"},
-                "10": {"value": "40px"},
-                "12": {"value": "48px"},
-            },
-            "radius": {
-                "none": {"value": "0px"},
-                "sm": {"value": "4px"},
-                "md": {"value": "8px"},
-                "lg": {"value": "12px"},
-                "xl": {"value": "16px"},
-                "full": {"value": "9999px"},
-            },
-            "font": {
-                "family": {"base": {"value": family}},
-                "size": {
-                    "sm": {"value": "14px"},
-                    "base": {"value": "16px"},
-                    "lg": {"value": "18px"},
-                    "xl": {"value": "20px"},
+            "spacing": scale_tokens(
+                scales.get("spacing"),
+                {
+                    "0": {"value": "0px"},
+                    "1": {"value": "4px"},
+                    "2": {"value": "8px"},
+                    "3": {"value": "12px"},
+                    "4": {"value": "16px"},
+                    "5": {"value": "20px"},
+                    "6": {"value": "24px"},
+                    "8": {"value": "32px"},
+                    "10": {"value": "40px"},
+                    "12": {"value": "48px"},
                 },
-                "weight": {
-                    "regular": {"value": "400"},
-                    "medium": {"value": "500"},
-                    "bold": {"value": "700"},
+            ),
+            "radius": scale_tokens(
+                scales.get("radius"),
+                {
+                    "none": {"value": "0px"},
+                    "sm": {"value": "4px"},
+                    "md": {"value": "8px"},
+                    "lg": {"value": "12px"},
+                    "xl": {"value": "16px"},
+                    "full": {"value": "9999px"},
                 },
+            ),
+            "font": {
+                "family": {"base": {"value": family}},
+                "size": scale_tokens(
+                    scales.get("font_size"),
+                    {
+                        "sm": {"value": "14px"},
+                        "base": {"value": "16px"},
+                        "lg": {"value": "18px"},
+                        "xl": {"value": "20px"},
+                    },
+                ),
+                "weight": value_tokens(
+                    weight_scale(typo),
+                    {
+                        "regular": {"value": "400"},
+                        "medium": {"value": "500"},
+                        "bold": {"value": "700"},
+                    },
+                ),
             },
-            "shadow": {
-                "sm": {"value": "0 1px 2px rgba(0,0,0,0.08)"},
-                "md": {"value": "0 4px 8px rgba(0,0,0,0.12)"},
-            },
+            "shadow": value_tokens(
+                shadow_scale(effects),
+                {
+                    "sm": {"value": "0 1px 2px rgba(0,0,0,0.08)"},
+                    "md": {"value": "0 4px 8px rgba(0,0,0,0.12)"},
+                },
+            ),
             "z": {
                 "base": {"value": "0"},
                 "dropdown": {"value": "1000"},
@@ -141,10 +197,6 @@ def build_proposed_tokens(design_tokens: dict):
     }
 
 
-def is_hex_color(value: str) -> bool:
-    return isinstance(value, str) and re.match(r"^#[0-9a-fA-F]{6}([0-9a-fA-F]{2})?$", value) is not None
-
-
 def load_local_design_tokens(base_dir: Path) -> dict:
     with (base_dir / "design-tokens.json").open("r") as f:
         return json.load(f)
@@ -159,56 +211,125 @@ def parse_figma_mcp_variables_payload(payload: dict) -> dict:
     """
     Accepts one of these payload forms:
     1) {"colors": {...}, "typography": {...}, ...} (already in design-tokens shape)
-    2) {"variables": {"token/name": "#RRGGBB", ...}}
+    2) {"variables": {"token/name": "#RRGGBB" or a number, ...}}
     3) {"collections": {...}} (figma-api-payload-like export)
+    Forms 2 and 3 may also carry ``textStyles`` / ``effectStyles`` (or ``styles``).
     Returns design-tokens-like dict.
     """
     if "colors" in payload and isinstance(payload.get("colors"), dict):
         return payload
 
-    colors = {}
-    typography = {}
-    effects = {}
-
     variables_map = payload.get("variables", {})
-    if isinstance(variables_map, dict):
-        for name, value in variables_map.items():
-            if is_hex_color(value):
-                colors[infer_color_name(name)] = value
-
     collections = payload.get("collections", {})
+    table = TokenTable()
+    rows = []
     if isinstance(collections, dict):
-        for collection in collections.values():
+        for collection_id, collection in collections.items():
+            table.add_collection(collection_id, None, collection_modes(collection.get("modes")))
             for var in collection.get("variables", []):
-                name = var.get("name")
-                values_by_mode = var.get("valuesByMode", {})
-                if not name or not isinstance(values_by_mode, dict) or not values_by_mode:
-                    continue
-                first_mode_value = next(iter(values_by_mode.values()))
-                if isinstance(first_mode_value, dict) and all(k in first_mode_value for k in ("r", "g", "b")):
-                    r = int(round(float(first_mode_value["r"]) * 255))
-                    g = int(round(float(first_mode_value["g"]) * 255))
-                    b = int(round(float(first_mode_value["b"]) * 255))
-                    a = first_mode_value.get("a", 1.0)
-                    if float(a) < 1:
-                        alpha = int(round(float(a) * 255))
-                        colors[infer_color_name(name)] = f"#{r:02x}{g:02x}{b:02x}{alpha:02x}"
-                    else:
-                        colors[infer_color_name(name)] = f"#{r:02x}{g:02x}{b:02x}"
-
-    parsed = {"colors": colors, "typography": typography, "effects": effects}
-    return parsed
-
-
-def rgba_dict_to_hex(rgba: dict) -> str:
-    r = int(round(float(rgba.get("r", 0)) * 255))
-    g = int(round(float(rgba.get("g", 0)) * 255))
-    b = int(round(float(rgba.get("b", 0)) * 255))
-    a = float(rgba.get("a", 1.0))
-    if a < 1:
-        alpha = int(round(a * 255))
-        return f"#{r:02x}{g:02x}{b:02x}{alpha:02x}"
-    return f"#{r:02x}{g:02x}{b:02x}"
+                if isinstance(var, dict):
+                    rows.append(add_mcp_variable(table, collection_id, var))
+    return mcp_tokens(
+        variables_map.items() if isinstance(variables_map, dict) else [], table, rows, parse_style_exports(payload)
+    )
+
+
+def is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def is_rgba_dict(value) -> bool:
+    return isinstance(value, dict) and all(k in value for k in ("r", "g", "b"))
+
+
+def collection_modes(modes) -> list:
+    """``(mode_id, name)`` pairs from a collection's ``modes`` list."""
+    if not isinstance(modes, list):
+        return []
+    return [(mode["modeId"], mode.get("name")) for mode in modes if isinstance(mode, dict) and mode.get("modeId")]
+
+
+def add_mcp_variable(table: TokenTable, collection_id: str, var: dict) -> int:
+    """Adds a form 3 variable with all of its modes; names are normalized as token names."""
+    values_by_mode = var.get("valuesByMode")
+    if not isinstance(values_by_mode, dict):
+        values_by_mode = {}
+    # Exports do not always carry ``resolvedType``; an RGBA value is a color either way.
+    if any(is_rgba_dict(value) for value in values_by_mode.values()):
+        resolved_type = "COLOR"
+    else:
+        resolved_type = str(var.get("resolvedType") or "").upper()
+    name = var.get("name")
+    name = infer_color_name(name) if isinstance(name, str) and name else None
+    return table.add_variable(var.get("id"), name, collection_id, resolved_type, values_by_mode)
+
+
+def mcp_tokens(variables_map: Iterable, table: TokenTable, rows: list, styles: tuple) -> dict:
+    """
+    Design-tokens dict from form 2 ``(name, value)`` pairs, the form 3 variables in
+    ``table`` and the ``(typography, effects)`` of the export's styles.
+    """
+    colors = {}
+    numbers = {}
+    for name, value in variables_map:
+        if is_hex_color(value):
+            colors[infer_color_name(name)] = value
+        elif is_number(value):
+            numbers[infer_color_name(name)] = value
+    tokens = tokens_from_table(table, rows)
+    tokens["colors"] = {**colors, **tokens["colors"]}
+    tokens["typography"], tokens["effects"] = styles
+    numbers.update(tokens.get("numbers", {}))
+    if numbers:
+        tokens["numbers"] = numbers
+    return tokens
+
+
+MCP_STREAM_PATHS = (
+    ("colors",),
+    ("variables",),
+    ("collections", "*", "variables"),
+    ("collections", "*", "modes"),
+    ("textStyles",),
+    ("effectStyles",),
+    ("styles",),
+)
+STYLE_EXPORT_KEYS = ("textStyles", "effectStyles", "styles")
+
+
+def parse_figma_mcp_variables_stream(fh: TextIO) -> dict:
+    """
+    Streaming ``parse_figma_mcp_variables_payload`` over an open JSON file.
+
+    Forms 2 and 3 are walked variable by variable into a TokenTable, so memory
+    tracks the extracted tokens rather than the export. A form 1 file is already in
+    design-tokens shape and is loaded as-is.
+    """
+    reader = JsonStreamReader(fh)
+    variables_map = []
+    table = TokenTable()
+    rows = []
+    modes = {}
+    styles = {key: [] for key in STYLE_EXPORT_KEYS}
+    for path, key, item in reader.iter_members(MCP_STREAM_PATHS):
+        if path == ("colors",):
+            break
+        if path[0] in styles:
+            styles[path[0]].append(item)
+        elif path == ("variables",):
+            if isinstance(key, str) and (is_hex_color(item) or is_number(item)):
+                variables_map.append((key, item))
+        elif isinstance(path[1], str) and isinstance(item, dict):
+            if path[2] == "modes":
+                modes.setdefault(path[1], []).append(item)
+            else:
+                rows.append(add_mcp_variable(table, path[1], item))
+    if reader.containers.get(("colors",)) == "{":
+        fh.seek(0)
+        return json.load(fh)
+    for collection_id, collection_mode_list in modes.items():
+        table.add_collection(collection_id, None, collection_modes(collection_mode_list))
+    return mcp_tokens(variables_map, table, rows, parse_style_exports(styles))
 
 
 def to_list_or_values(node):
@@ -219,84 +340,190 @@ def to_list_or_values(node):
     return []
 
 
-def extract_default_mode_by_collection(payload: dict) -> dict:
-    collection_index = {}
-    candidates = []
-    if isinstance(payload.get("meta"), dict):
-        candidates.append(payload["meta"].get("variableCollections"))
-    candidates.append(payload.get("variableCollections"))
+def rest_variable_sources(payload: dict) -> list:
+    meta = payload.get("meta") if isinstance(payload.get("meta"), dict) else {}
+    return [meta.get("variables"), payload.get("variables")]
+
 
-    for candidate in candidates:
-        for collection in to_list_or_values(candidate):
-            if not isinstance(collection, dict):
-                continue
-            collection_id = collection.get("id")
-            default_mode_id = collection.get("defaultModeId")
-            if collection_id and default_mode_id:
-                collection_index[collection_id] = default_mode_id
-    return collection_index
+def rest_collection_sources(payload: dict) -> list:
+    meta = payload.get("meta") if isinstance(payload.get("meta"), dict) else {}
+    return [meta.get("variableCollections"), payload.get("variableCollections")]
 
 
-def pick_variable_value(var_obj: dict, default_mode_by_collection: dict):
+def add_rest_collection(table: TokenTable, collection):
+    if isinstance(collection, dict) and collection.get("id"):
+        table.add_collection(
+            collection["id"], collection.get("defaultModeId"), collection_modes(collection.get("modes"))
+        )
+
+
+def add_rest_variable(table: TokenTable, var_obj: dict) -> int:
     values_by_mode = var_obj.get("valuesByMode")
-    if not isinstance(values_by_mode, dict) or not values_by_mode:
-        return None
-    preferred_mode = default_mode_by_collection.get(var_obj.get("variableCollectionId"))
-    if preferred_mode and preferred_mode in values_by_mode:
-        return values_by_mode[preferred_mode]
-    return next(iter(values_by_mode.values()))
+    return table.add_variable(
+        var_obj.get("id"),
+        var_obj.get("name"),
+        var_obj.get("variableCollectionId"),
+        str(var_obj.get("resolvedType") or var_obj.get("type") or "").upper(),
+        values_by_mode if isinstance(values_by_mode, dict) else {},
+    )
 
 
 def parse_figma_rest_variables_payload(payload: dict) -> dict:
-    colors = {}
-    variables_sources = []
-    if isinstance(payload.get("meta"), dict):
-        variables_sources.append(payload["meta"].get("variables"))
-    variables_sources.append(payload.get("variables"))
-
-    default_mode_by_collection = extract_default_mode_by_collection(payload)
-    for variables_source in variables_sources:
-        for var_obj in to_list_or_values(variables_source):
-            if not isinstance(var_obj, dict):
-                continue
-            name = var_obj.get("name")
-            if not name:
-                continue
-            resolved_type = str(var_obj.get("resolvedType") or var_obj.get("type") or "").upper()
-            value = pick_variable_value(var_obj, default_mode_by_collection)
-            if resolved_type == "COLOR" and isinstance(value, dict):
-                colors[name] = rgba_dict_to_hex(value)
-            elif isinstance(value, str) and is_hex_color(value):
-                colors[name] = value.lower()
-
-    return {"colors": colors, "typography": {}, "effects": {}}
+    table = TokenTable()
+    # Later sources win, so top-level collections override ``meta`` ones.
+    for source in rest_collection_sources(payload):
+        for collection in to_list_or_values(source):
+            add_rest_collection(table, collection)
+    rows = [
+        add_rest_variable(table, var_obj)
+        for source in rest_variable_sources(payload)
+        for var_obj in to_list_or_values(source)
+        if isinstance(var_obj, dict)
+    ]
+    return tokens_from_table(table, rows)
+
+
+def tokens_from_table(table: TokenTable, rows: list) -> dict:
+    """
+    Design-tokens dict for ``rows`` (in document order) in each collection's default mode.
+
+    Aliased tokens get their final value plus an ``aliases`` entry with the chain of
+    variable names; aliases that loop or point outside the payload are listed under
+    ``unresolved_aliases`` instead of being dropped silently. ``modes`` holds, per
+    non-default mode name (a theme or brand), the colors that differ from the default.
+    Numeric (FLOAT) variables such as spacing, radii and font sizes go under ``numbers``.
+    """
+    view = table.view()
+    colors, aliases, unresolved = view.colors(rows)
+    numbers, number_aliases = view.numbers(rows)
+    aliases.update(number_aliases)
+    modes = {}
+    for mode_name in table.mode_names():
+        mode_colors, _, _ = table.view(mode_name).colors(rows)
+        overrides = {name: value for name, value in mode_colors.items() if colors.get(name) != value}
+        if overrides:
+            modes[mode_name] = overrides
+
+    tokens = {"colors": colors, "typography": {}, "effects": {}}
+    if numbers:
+        tokens["numbers"] = numbers
+    if aliases:
+        tokens["aliases"] = aliases
+    if unresolved:
+        tokens["unresolved_aliases"] = unresolved
+    if modes:
+        tokens["modes"] = modes
+    return tokens
+
+
+REST_VARIABLE_PATHS = (("meta", "variables"), ("variables",))
+REST_COLLECTION_PATHS = (("meta", "variableCollections"), ("variableCollections",))
+
+
+def parse_figma_rest_variables_stream(fh: TextIO) -> dict:
+    """
+    Streaming ``parse_figma_rest_variables_payload`` over a JSON response.
+
+    Every mode of every variable goes straight into a columnar TokenTable as it is
+    read, so memory tracks the extracted values rather than the raw payload, in a
+    single pass whatever the order of collections and variables.
+    """
+    table = TokenTable()
+    collections = {path: [] for path in REST_COLLECTION_PATHS}
+    rows = {path: [] for path in REST_VARIABLE_PATHS}
+    for path, _, item in JsonStreamReader(fh).iter_members(REST_COLLECTION_PATHS + REST_VARIABLE_PATHS):
+        if path in collections:
+            collections[path].append(item)
+        elif isinstance(item, dict):
+            rows[path].append(add_rest_variable(table, item))
+
+    # Same precedence as the in-memory parser: ``meta`` entries first, top-level ones after.
+    for source in collections.values():
+        for collection in source:
+            add_rest_collection(table, collection)
+    return tokens_from_table(table, [row for source in rows.values() for row in source])
 
 
 def fetch_figma_variables_via_rest(
-    file_id: str, api_token: str, api_base: str = "https://api.figma.com/v1"
+    file_id: str,
+    api_token: str,
+    api_base: str = "https://api.figma.com/v1",
+    cache: Optional[HttpCache] = None,
+    allow_published_fallback: bool = False,
 ) -> tuple[Optional[dict], Optional[str]]:
+    """
+    Fetches local and published variables concurrently over a pooled keep-alive client.
+
+    Local variables win whenever they carry colors. When the local endpoint cannot be
+    read (after retries) FigmaFetchError is raised, unless ``allow_published_fallback``
+    lets published variables with colors stand in, with a warning.
+    The file's text and effect styles are fetched alongside and fill ``typography``
+    and ``effects``, and its published components fill ``components``; those
+    fetches do not fail the audit, since variables suffice for one; their errors are
+    kept under ``fetch_errors`` so the artifacts built without that data say so.
+    With a ``cache``, unchanged files are answered from disk or by a 304 revalidation.
+    Returns ``(None, None)`` when the file has no color variables.
+    """
     endpoints = [
         f"/files/{file_id}/variables/local",
         f"/files/{file_id}/variables/published",
     ]
-    api_base = api_base.rstrip("/")
-    headers = {
-        "X-Figma-Token": api_token,
-        "Accept": "application/json",
-        "User-Agent": "ds-pipeline/1.0",
-    }
+    client = get_figma_client(api_base, api_token, cache.cache_dir if cache else None)
+    before = client.metrics.snapshot()
 
-    for endpoint in endpoints:
-        url = f"{api_base}{endpoint}"
-        req = Request(url, headers=headers, method="GET")
+    def fetch(endpoint: str):
         try:
-            with urlopen(req, timeout=20) as resp:
-                payload = json.loads(resp.read().decode("utf-8"))
-                parsed = parse_figma_rest_variables_payload(payload)
-                if parsed.get("colors"):
-                    return parsed, f"figma-rest-api:{endpoint}"
-        except (HTTPError, URLError, TimeoutError, json.JSONDecodeError):
-            continue
+            parsed = fetch_parsed_cached(
+                client, cache, endpoint, parse_figma_rest_variables_stream, AUDIT_GENERATOR_VERSION
+            )
+            return parsed, None
+        except FETCH_ERRORS as exc:
+            return None, exc
+
+    def fetch_optional(fetcher):
+        try:
+            return fetcher(file_id, client, cache), None
+        except FETCH_ERRORS as exc:
+            return None, exc
+
+    with ThreadPoolExecutor(max_workers=len(endpoints) + 2) as pool:
+        pending_styles = pool.submit(fetch_optional, fetch_figma_styles_via_rest)
+        pending_components = pool.submit(fetch_optional, fetch_component_nodes)
+        results = list(pool.map(fetch, endpoints))
+        styles, styles_error = pending_styles.result()
+        components, components_error = pending_components.result()
+
+    metrics = metrics_delta(before, client.metrics.snapshot())
+    if metrics["retries"]:
+        print(
+            f"Figma REST: {metrics['requests']} requests, {metrics['throttled']} throttled, "
+            f"{metrics['retries']} retries, {metrics['rate_wait_seconds'] + metrics['backoff_seconds']:.1f}s waiting"
+        )
+
+    fetch_errors = {}
+    for error, skipped in ((styles_error, "styles"), (components_error, "components")):
+        if error is not None:
+            fetch_errors[skipped] = str(error)
+            print(f"Warning: Figma REST fetch of {skipped} failed ({error}); recorded in fetch_errors", file=sys.stderr)
+    (_, local_error), (published, _) = results
+    if local_error is not None:
+        if not (allow_published_fallback and published and published.get("colors")):
+            raise FigmaFetchError(
+                "; ".join(f"{endpoint}: {error}" for endpoint, (_, error) in zip(endpoints, results) if error)
+            ) from local_error
+        print(
+            f"Warning: Figma REST fetch of local variables failed ({local_error}); using published variables",
+            file=sys.stderr,
+        )
+    for endpoint, (parsed, _) in zip(endpoints, results):
+        if parsed and parsed.get("colors"):
+            if styles:
+                parsed = {**parsed, "typography": styles[0], "effects": styles[1]}
+            if components:
+                parsed = {**parsed, "components": components}
+            if fetch_errors:
+                parsed = {**parsed, "fetch_errors": fetch_errors}
+            return parsed, f"figma-rest-api:{endpoint}"
     return None, None
 
 
@@ -324,8 +551,8 @@ def load_figma_mcp_tokens(
         if not path.exists():
             continue
         try:
-            payload = json.loads(path.read_text())
-            parsed = parse_figma_mcp_variables_payload(payload)
+            with path.open(encoding="utf-8") as fh:
+                parsed = parse_figma_mcp_variables_stream(fh)
             if parsed.get("colors"):
                 return parsed, "figma-mcp-variables", path
         except Exception:
@@ -334,6 +561,59 @@ def load_figma_mcp_tokens(
     return None, None, None
 
 
+def phase1_dirs(base_dir: Path, run_id: str) -> list:
+    return [base_dir / "0_gap-report" / f"gap_{run_id}", base_dir / "1_audit-report" / f"audit_{run_id}"]
+
+
+def refactor_dirs(base_dir: Path, run_id: str) -> list:
+    return [base_dir / "3_refactor-output" / f"refactor_{run_id}"]
+
+
+def sync_dirs(base_dir: Path, run_id: str) -> list:
+    return [base_dir / "4_code-sync-output" / f"sync_{run_id}"]
+
+
+def reuse_latest_phase_run(base_dir: Path, phase: str, run_id: str, fingerprint: dict, run_dirs) -> Optional[str]:
+    """
+    Links the outputs of the latest recorded ``phase`` run into this run's directories
+    when that run's manifest matches ``fingerprint``, so a fresh (timestamped) run id
+    skips unchanged work too, and returns that run's id (None when nothing was reused).
+    ``run_dirs(base_dir, run_id)`` lists a run's output directories, the manifest's first.
+    Outputs carrying run metadata must be rewritten by the caller (``restamp_audit_report``).
+    """
+    previous = latest_phase_run(base_dir, phase)
+    if previous is None or previous["run_id"] == run_id:
+        return None
+    old_dirs, new_dirs = run_dirs(base_dir, previous["run_id"]), run_dirs(base_dir, run_id)
+    if not is_phase_up_to_date(old_dirs[0], fingerprint):
+        return None
+    pairs = []
+    for source in recorded_outputs(old_dirs[0]):
+        source = Path(os.path.normpath(source))
+        old_dir, new_dir = next(((o, n) for o, n in zip(old_dirs, new_dirs) if source.is_relative_to(o)), (None, None))
+        if old_dir is None:
+            return None
+        pairs.append((source, new_dir / source.relative_to(old_dir)))
+    link_outputs(pairs)
+    record_phase_fingerprint(new_dirs[0], fingerprint, [target for _, target in pairs])
+    print(f"Reusing outputs of run {previous['run_id']}")
+    return previous["run_id"]
+
+
+def restamp_audit_report(report_path: Path, reused_from: str):
+    """Gives a reused audit report this run's timestamp; the rename leaves the original run's link intact."""
+    report = load_json(report_path)
+    report["metadata"]["audit_timestamp"] = datetime.now().isoformat()
+    report["metadata"]["reused_from_run"] = reused_from
+    write_json(report_path, report)
+
+
+def read_snapshot_meta(path: Path) -> dict:
+    """A snapshot's ``meta`` object, read with the stream reader rather than loading the export."""
+    with path.open(encoding="utf-8") as fh:
+        return {key: value for _, key, value in JsonStreamReader(fh).iter_members([("meta",)])}
+
+
 def run_phase1(
     base_dir: Path,
     figma_url: str,
@@ -341,8 +621,11 @@ def run_phase1(
     figma_mcp_variables_path: Optional[str] = None,
     figma_api_token: Optional[str] = None,
     figma_api_base: str = "https://api.figma.com/v1",
+    writer: Optional[ArtifactWriter] = None,
+    force: bool = False,
+    allow_stale_fallback: bool = False,
 ):
-    fallback_tokens = load_local_design_tokens(base_dir)
+    writer = writer or ArtifactWriter()
 
     file_id, node_id = extract_figma_parts(figma_url)
     design_tokens = None
@@ -351,27 +634,100 @@ def run_phase1(
 
     # Priority: MCP source -> REST API -> local fallback
     design_tokens, source, source_path = load_figma_mcp_tokens(base_dir, file_id, node_id, figma_mcp_variables_path)
+    if figma_mcp_variables_path and source_path != Path(figma_mcp_variables_path):
+        # An explicit snapshot must be the one audited, never silently replaced by another source.
+        raise ValueError(f"No color variables could be read from {figma_mcp_variables_path}")
     if not design_tokens and figma_api_token:
-        rest_tokens, rest_source = fetch_figma_variables_via_rest(file_id, figma_api_token, figma_api_base)
+        try:
+            rest_tokens, rest_source = fetch_figma_variables_via_rest(
+                file_id,
+                figma_api_token,
+                figma_api_base,
+                HttpCache(base_dir / CACHE_DIR_NAME),
+                allow_published_fallback=allow_stale_fallback,
+            )
+        except FigmaFetchError as exc:
+            # Publishing the local snapshot after a failed fetch must be an explicit choice.
+            if not allow_stale_fallback:
+                raise
+            print(f"Warning: Figma REST fetch failed ({exc}); using design-tokens.json snapshot", file=sys.stderr)
+            rest_tokens = None
+        else:
+            if not rest_tokens and not allow_stale_fallback:
+                raise ValueError(f"Figma file {file_id} has no color variables")
         if rest_tokens:
             design_tokens = rest_tokens
             source = rest_source
             source_path = figma_api_base
     if not design_tokens:
-        design_tokens = fallback_tokens
-        source = "design-tokens.json snapshot"
         source_path = base_dir / "design-tokens.json"
+        if not source_path.exists():
+            raise FileNotFoundError(
+                f"No Figma source for {figma_url} and no local snapshot at {source_path}: pass "
+                "--figma-mcp-variables or --figma-api-token, or add design-tokens.json "
+                "(with --figma-api-token it is only used under --allow-stale-fallback)"
+            )
+        design_tokens = load_local_design_tokens(base_dir)
+        source = "design-tokens.json snapshot"
+
+    print(f"Phase 1 (Audit) source: {source} ({source_path})")
+
+    gap_dir, audit_dir = phase1_dirs(base_dir, run_id)
+    used_design_tokens_path = gap_dir / "design-tokens.used.json"
+    html_preview_out = gap_dir / "token-gap-preview.html"
+    outputs = [
+        used_design_tokens_path,
+        gap_dir / "proposed-tokens.json",
+        gap_dir / "palette-proposal.json",
+        gap_dir / "brand-ramp.json",
+        gap_dir / "scale-inference.json",
+        gap_dir / "token-gap-report.json",
+        gap_dir / "token-gap-log.json",
+        gap_dir / "token-gap-report.md",
+        html_preview_out,
+        audit_dir / "audit-report.json",
+        audit_dir / "audit-report.md",
+        audit_dir / "audit-report.html",
+    ]
+
+    contrast_policy = load_contrast_policy(base_dir)
+    token_schema = load_token_schema(base_dir)
+    fingerprint = phase_fingerprint(
+        "audit",
+        AUDIT_GENERATOR_VERSION,
+        {
+            "snapshot": hash_payload(design_tokens, indent=2),
+            "figma_url": hash_text(figma_url),
+            "source": hash_text(f"{source}|{source_path}"),
+            "wcag_profile": hash_payload(contrast_policy._asdict(), indent=2),
+            "token_schema": hash_payload(token_schema._asdict(), indent=2),
+        },
+    )
+    up_to_date = not force and is_phase_up_to_date(gap_dir, fingerprint)
+    reused_from = None
+    if not force and not up_to_date:
+        reused_from = reuse_latest_phase_run(base_dir, "audit", run_id, fingerprint, phase1_dirs)
+    if up_to_date or reused_from:
+        print("Phase 1 (Audit) inputs unchanged; reusing existing outputs (pass --force to regenerate)")
+        if reused_from:
+            restamp_audit_report(audit_dir / "audit-report.json", reused_from)
+        record_phase_run(base_dir, run_id, "audit", gap_dir, outputs)
+        proposed = load_json(gap_dir / "proposed-tokens.json")
+        return gap_dir, audit_dir, used_design_tokens_path, design_tokens, proposed
 
-    gap_dir = base_dir / "0_gap-report" / f"gap_{run_id}"
-    audit_dir = base_dir / "1_audit-report" / f"audit_{run_id}"
     gap_dir.mkdir(parents=True, exist_ok=True)
     audit_dir.mkdir(parents=True, exist_ok=True)
 
-    used_design_tokens_path = gap_dir / "design-tokens.used.json"
-    used_design_tokens_path.write_text(json.dumps(design_tokens, indent=2))
+    writer.write_json(used_design_tokens_path, design_tokens)
 
-    proposed = build_proposed_tokens(design_tokens)
-    (gap_dir / "proposed-tokens.json").write_text(json.dumps(proposed, indent=2))
+    brand_ramp = generate_ramps([brand_seed(design_tokens)], contrast_policy)[0]
+    writer.write_json(gap_dir / "brand-ramp.json", brand_ramp)
+    scales = infer_scales(design_tokens)
+    writer.write_json(gap_dir / "scale-inference.json", scales)
+    proposed = build_proposed_tokens(design_tokens, brand_ramp["steps"], scales)
+    writer.write_json(gap_dir / "proposed-tokens.json", proposed)
+    palette = propose_palette(design_tokens.get("colors", {}), cache_dir=base_dir / PALETTE_CACHE_DIR)
+    writer.write_json(gap_dir / "palette-proposal.json", palette)
 
     gap_report_json = {
         "figma_url": figma_url,
@@ -381,19 +737,23 @@ def run_phase1(
         "source_path": str(source_path) if source_path else None,
         "status": "phase1_completed",
     }
-    (gap_dir / "token-gap-report.json").write_text(json.dumps(gap_report_json, indent=2))
-    (gap_dir / "token-gap-log.json").write_text(json.dumps({"events": ["phase1_generated"]}, indent=2))
-    (gap_dir / "token-gap-report.md").write_text(
+    writer.write_json(gap_dir / "token-gap-report.json", gap_report_json)
+    writer.write_json(gap_dir / "token-gap-log.json", {"events": ["phase1_generated"]})
+    writer.write_text(
+        gap_dir / "token-gap-report.md",
         "# Token Gap Report\n\n"
         f"- Figma URL: {figma_url}\n"
         f"- File ID: {file_id}\n"
         f"- Node ID: {node_id}\n"
         f"- Source: {source}\n"
         f"- Source Path: {source_path}\n"
+        f"- Proposed Palette: {palette['palette_size']} colors for {palette['distinct_values']} distinct values"
+        f" (max ΔE_OK {palette['max_delta_e']})\n"
     )
 
-    overall_score = 62
-    ai_readiness = 58
+    scores = score_audit(AuditInputs(design_tokens, token_schema, contrast_policy))
+    summary = scores["summary"]
+    accessibility = scores["accessibility"]
     audit_json = {
         "metadata": {
             "project_name": "Webapp Design System",
@@ -404,82 +764,360 @@ def run_phase1(
             "auditor": "ds-audit-agent v1 (pipeline-local)",
             "data_source": source,
             "data_source_path": str(source_path) if source_path else None,
+            "wcag_profile": contrast_policy.profile_name,
+            "token_schema_version": token_schema.schema_name,
         },
-        "summary": {
-            "overall_score": overall_score,
-            "ai_readiness_score": ai_readiness,
-            "risk_level": "Medium",
-        },
+        "summary": summary,
+        "dimensions": scores["dimensions"],
+        "ai_readiness": scores["ai_readiness"],
+        "accessibility": accessibility,
+        "naming": scores["naming"],
     }
-    (audit_dir / "audit-report.json").write_text(json.dumps(audit_json, indent=2))
-    (audit_dir / "audit-report.md").write_text(
+    fetch_errors = design_tokens.get("fetch_errors") or {}
+    if fetch_errors:
+        audit_json["metadata"]["fetch_errors"] = fetch_errors
+    writer.write_json(audit_dir / "audit-report.json", audit_json)
+    writer.write_text(
+        audit_dir / "audit-report.md",
         "# DS Audit Report\n\n"
         f"- Figma URL: {figma_url}\n"
         f"- Data Source: {source}\n"
-        f"- Overall Score: {overall_score}/100\n"
-        f"- AI Readiness: {ai_readiness}/100\n"
+        f"- Overall Score: {summary['overall_score']}/100\n"
+        f"- AI Readiness: {summary['ai_readiness_score']}/100\n"
+        f"- Risk Level: {summary['risk_level']}\n"
+        f"- Contrast Violations: {accessibility['contrast_violations']}"
+        f" of {accessibility['pairs_checked']} pairs ({accessibility['wcag_target']})\n"
+        + "".join(f"- Fetch Error ({name}): {error}\n" for name, error in fetch_errors.items())
     )
-    (audit_dir / "audit-report.html").write_text(
+    writer.write_text(
+        audit_dir / "audit-report.html",
         "<!doctype html><html><body><h1>DS Audit Report</h1>"
         f"<p>Figma URL: {figma_url}</p>"
         f"<p>Data Source: {source}</p>"
-        f"<p>Overall Score: {overall_score}/100</p>"
-        f"<p>AI Readiness: {ai_readiness}/100</p>"
-        "</body></html>"
+        f"<p>Overall Score: {summary['overall_score']}/100</p>"
+        f"<p>AI Readiness: {summary['ai_readiness_score']}/100</p>"
+        f"<p>Risk Level: {summary['risk_level']}</p>"
+        f"<p>Contrast Violations: {accessibility['contrast_violations']}"
+        f" of {accessibility['pairs_checked']} pairs ({accessibility['wcag_target']})</p>"
+        + "".join(f"<p>Fetch Error ({name}): {html.escape(error)}</p>" for name, error in fetch_errors.items())
+        + "</body></html>"
     )
 
     # Automatically generate the HTML visual preview for the proposed tokens
-    proposed_tokens_json = gap_dir / "proposed-tokens.json"
-    html_preview_out = gap_dir / "token-gap-preview.html"
-    if proposed_tokens_json.exists():
-        generate_preview(str(proposed_tokens_json), str(html_preview_out))
+    writer.write_text(html_preview_out, render_preview(proposed))
+    print(f"Token gap preview generated at: {html_preview_out}")
+
+    writer.then(record_phase_fingerprint, gap_dir, fingerprint, outputs)
+    writer.then(record_phase_run, base_dir, run_id, "audit", gap_dir, outputs)
+
+    return gap_dir, audit_dir, used_design_tokens_path, design_tokens, proposed
 
-    return gap_dir, audit_dir, used_design_tokens_path
+
+def load_json(path: Path):
+    with path.open("r") as f:
+        return json.load(f)
 
 
-def run_phase2(base_dir: Path, run_id: str, design_tokens_path: Path):
+def run_phase2(
+    base_dir: Path,
+    run_id: str,
+    design_tokens_path: Path,
+    design_tokens: Optional[dict] = None,
+    proposed: Optional[dict] = None,
+    writer: Optional[ArtifactWriter] = None,
+    force: bool = False,
+    merge_delta_e: float = DEFAULT_MERGE_DELTA_E,
+):
+    """Returns ``(refactor_dir, outputs)``; outputs is None when the phase was skipped as up to date."""
+    writer = writer or ArtifactWriter()
     gap_dir = base_dir / "0_gap-report" / f"gap_{run_id}"
-    refactor_dir = base_dir / "3_refactor-output" / f"refactor_{run_id}"
-    subprocess.run(
-        [
-            "python3",
-            str(base_dir / "generate_refactor_outputs.py"),
-            "--design-tokens",
-            str(design_tokens_path),
-            "--proposed",
-            str(gap_dir / "proposed-tokens.json"),
-            "--out-dir",
-            str(refactor_dir),
-        ],
-        check=True,
+    (refactor_dir,) = refactor_dirs(base_dir, run_id)
+    proposed_path = gap_dir / "proposed-tokens.json"
+
+    fingerprint = phase_fingerprint(
+        "refactor",
+        REFACTOR_GENERATOR_VERSION,
+        {
+            "design_tokens": (
+                hash_payload(design_tokens, indent=2) if design_tokens is not None else hash_file(design_tokens_path)
+            ),
+            "proposed_tokens": hash_payload(proposed, indent=2) if proposed is not None else hash_file(proposed_path),
+            "merge_delta_e": hash_text(repr(merge_delta_e)),
+        },
+    )
+    if not force and (
+        is_phase_up_to_date(refactor_dir, fingerprint)
+        or reuse_latest_phase_run(base_dir, "refactor", run_id, fingerprint, refactor_dirs)
+    ):
+        print("Phase 2 (Refactor) inputs unchanged; reusing existing outputs (pass --force to regenerate)")
+        record_phase_run(base_dir, run_id, "refactor", refactor_dir, recorded_outputs(refactor_dir))
+        return refactor_dir, None
+
+    outputs = generate_refactor_outputs(
+        design_tokens if design_tokens is not None else load_json(design_tokens_path),
+        proposed if proposed is not None else load_json(proposed_path),
+        refactor_dir,
+        writer,
+        merge_delta_e,
     )
-    return refactor_dir
+    artifacts = [refactor_dir / name for name in outputs]
+    writer.then(record_phase_fingerprint, refactor_dir, fingerprint, artifacts)
+    writer.then(record_phase_run, base_dir, run_id, "refactor", refactor_dir, artifacts)
+    print(f"Generated refactor outputs in: {refactor_dir}")
+    return refactor_dir, outputs
 
 
-def run_phase3(base_dir: Path, run_id: str):
-    refactor_dir = base_dir / "3_refactor-output" / f"refactor_{run_id}"
-    sync_dir = base_dir / "4_code-sync-output" / f"sync_{run_id}"
-    subprocess.run(
-        [
-            "python3",
-            str(base_dir / "generate_code_sync_outputs.py"),
-            "--input",
-            str(refactor_dir / "figma-sync-tokens.json"),
-            "--dark",
-            str(refactor_dir / "dark-mode-tokens.json"),
-            "--out-dir",
-            str(sync_dir),
-        ],
-        check=True,
+def run_phase3(
+    base_dir: Path,
+    run_id: str,
+    sync_tokens: Optional[dict] = None,
+    dark_tokens: Optional[dict] = None,
+    force: bool = False,
+):
+    (refactor_dir,) = refactor_dirs(base_dir, run_id)
+    (sync_dir,) = sync_dirs(base_dir, run_id)
+    sync_tokens_path = refactor_dir / "figma-sync-tokens.json"
+    dark_tokens_path = refactor_dir / "dark-mode-tokens.json"
+
+    fingerprint = phase_fingerprint(
+        "sync",
+        SYNC_GENERATOR_VERSION,
+        {
+            "figma_sync_tokens": (
+                hash_payload(sync_tokens, indent=4) if sync_tokens is not None else hash_file(sync_tokens_path)
+            ),
+            "dark_mode_tokens": (
+                hash_payload(dark_tokens, indent=4) if dark_tokens is not None else hash_file(dark_tokens_path)
+            ),
+        },
     )
+    if not force and (
+        is_phase_up_to_date(sync_dir, fingerprint)
+        or reuse_latest_phase_run(base_dir, "sync", run_id, fingerprint, sync_dirs)
+    ):
+        print("Phase 3 (Code Sync) inputs unchanged; reusing existing outputs (pass --force to regenerate)")
+        record_phase_run(base_dir, run_id, "sync", sync_dir, recorded_outputs(sync_dir))
+        return sync_dir
+
+    result = generate_code_sync_outputs(
+        sync_tokens if sync_tokens is not None else load_json(sync_tokens_path),
+        dark_tokens if dark_tokens is not None else load_json(dark_tokens_path),
+        sync_dir,
+    )
+    record_phase_fingerprint(sync_dir, fingerprint, result["artifacts"].values())
+    record_phase_run(base_dir, run_id, "sync", sync_dir, result["artifacts"].values())
+    print(f"Generated code-sync outputs in: {sync_dir}")
     return sync_dir
 
 
+def claim_timestamped_dir(parent: Path, prefix: str) -> str:
+    """
+    Creates ``parent/<prefix><ts>`` exclusively and returns the id part, appending
+    ``_2``, ``_3``, ... when another process already claimed the same second.
+    """
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    parent.mkdir(parents=True, exist_ok=True)
+    attempt = 1
+    while True:
+        claimed_id = stamp if attempt == 1 else f"{stamp}_{attempt}"
+        try:
+            (parent / f"{prefix}{claimed_id}").mkdir()
+            return claimed_id
+        except FileExistsError:
+            attempt += 1
+
+
+def reserve_run_id(base_dir: Path) -> str:
+    """Default timestamp run id; parallel audits started in the same second get distinct ids."""
+    return claim_timestamped_dir(base_dir / "0_gap-report", "gap_")
+
+
+def load_batch_manifest(manifest_path: Path) -> list:
+    """
+    Reads a batch manifest: a JSON list, or a text file with one entry per line
+    (blank lines and ``#`` comments ignored). Entries are Figma URLs, snapshot file
+    paths (relative to the manifest), or objects with ``figma_url`` and/or ``snapshot``.
+    """
+    raw = manifest_path.read_text()
+    if manifest_path.suffix == ".json":
+        items = json.loads(raw)
+    else:
+        items = [line.strip() for line in raw.splitlines() if line.strip() and not line.strip().startswith("#")]
+
+    entries = []
+    for item in items:
+        if isinstance(item, str):
+            item = {"figma_url": item} if re.match(r"^https?://", item) else {"snapshot": item}
+        snapshot = item.get("snapshot")
+        if snapshot and not Path(snapshot).is_absolute():
+            snapshot = str(manifest_path.parent / snapshot)
+        entries.append({"figma_url": item.get("figma_url"), "snapshot": snapshot})
+    return entries
+
+
+def audit_batch_entry(
+    base_dir: Path,
+    entry: dict,
+    run_id: str,
+    figma_api_token: Optional[str],
+    figma_api_base: str,
+    force: bool,
+    allow_stale_fallback: bool = False,
+) -> dict:
+    """Process-pool worker: runs Phase 1 for one manifest entry and reports its scores or error."""
+    started = time.perf_counter()
+    figma_url = entry.get("figma_url")
+    result = {"run_id": run_id, "figma_url": figma_url, "snapshot": entry.get("snapshot")}
+    client = get_figma_client(figma_api_base, figma_api_token, base_dir / CACHE_DIR_NAME) if figma_api_token else None
+    before = client.metrics.snapshot() if client else None
+    try:
+        if not figma_url and entry.get("snapshot"):
+            meta = read_snapshot_meta(Path(entry["snapshot"]))
+            figma_url = meta.get("figma_url") or f"snapshot://{entry['snapshot']}"
+            result["figma_url"] = figma_url
+        _, audit_dir, _, _, _ = run_phase1(
+            base_dir,
+            figma_url,
+            run_id,
+            entry.get("snapshot"),
+            figma_api_token,
+            figma_api_base,
+            force=force,
+            allow_stale_fallback=allow_stale_fallback,
+        )
+        summary = load_json(audit_dir / "audit-report.json").get("summary", {})
+        result.update(status="ok", audit_dir=str(audit_dir), **summary)
+    except Exception as exc:
+        result.update(status="failed", error=f"{type(exc).__name__}: {exc}")
+    if client:
+        result["rest_metrics"] = metrics_delta(before, client.metrics.snapshot())
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def run_batch_audit(
+    base_dir: Path,
+    entries: list,
+    workers: int,
+    figma_api_token: Optional[str] = None,
+    figma_api_base: str = "https://api.figma.com/v1",
+    force: bool = False,
+    allow_stale_fallback: bool = False,
+):
+    """Runs Phase 1 for every manifest entry on a process pool and writes a roll-up summary."""
+    batch_id = claim_timestamped_dir(base_dir / "1_audit-report", "batch_")
+    batch_dir = base_dir / "1_audit-report" / f"batch_{batch_id}"
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                audit_batch_entry,
+                base_dir,
+                entry,
+                f"{batch_id}_{index:04d}",
+                figma_api_token,
+                figma_api_base,
+                force,
+                allow_stale_fallback,
+            ): entry
+            for index, entry in enumerate(entries, start=1)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            results.append(result)
+            label = result.get("figma_url") or result.get("snapshot")
+            if result["status"] == "ok":
+                print(f"[{done}/{len(entries)}] ok     {label} score={result.get('overall_score')}")
+            else:
+                print(f"[{done}/{len(entries)}] failed {label} {result['error']}")
+
+    results.sort(key=lambda r: r["run_id"])
+    scores = [r["overall_score"] for r in results if r["status"] == "ok" and "overall_score" in r]
+    rest_metrics = {
+        name: round(sum(r.get("rest_metrics", {}).get(name, 0) for r in results), 3) for name in METRIC_NAMES
+    }
+    summary = {
+        "batch_id": batch_id,
+        "files": len(results),
+        "succeeded": sum(1 for r in results if r["status"] == "ok"),
+        "failed": sum(1 for r in results if r["status"] != "ok"),
+        "overall_score": {
+            "mean": round(sum(scores) / len(scores), 2) if scores else None,
+            "min": min(scores) if scores else None,
+            "max": max(scores) if scores else None,
+        },
+        "rest_metrics": rest_metrics,
+        "results": results,
+    }
+    write_json(batch_dir / "batch-summary.json", summary)
+    if rest_metrics["requests"]:
+        print(
+            f"Figma REST: {rest_metrics['requests']} requests, {rest_metrics['throttled']} throttled, "
+            f"{rest_metrics['retries']} retries"
+        )
+    return batch_dir, summary
+
+
 def require_gate(ok: bool, gate_name: str):
     if not ok:
         raise RuntimeError(f"Gate check failed: {gate_name}. Pass explicit approval flag to continue.")
 
 
+def run_all(
+    base_dir: Path,
+    figma_url: str,
+    run_id: str,
+    figma_mcp_variables_path: Optional[str] = None,
+    figma_api_token: Optional[str] = None,
+    figma_api_base: str = "https://api.figma.com/v1",
+    approve_refactor: bool = False,
+    approve_sync: bool = False,
+    force: bool = False,
+    allow_stale_fallback: bool = False,
+    merge_delta_e: float = DEFAULT_MERGE_DELTA_E,
+):
+    """
+    Run audit, refactor and sync in one process.
+
+    Token payloads are handed from phase to phase in memory; disk artifacts are
+    written on a background pool and flushed before returning (or before a gate
+    failure is raised, so the reviewed outputs are always on disk).
+    """
+    with ArtifactWriter(background=True) as writer:
+        gap_dir, audit_dir, used_design_tokens_path, design_tokens, proposed = run_phase1(
+            base_dir,
+            figma_url,
+            run_id,
+            figma_mcp_variables_path,
+            figma_api_token,
+            figma_api_base,
+            writer=writer,
+            force=force,
+            allow_stale_fallback=allow_stale_fallback,
+        )
+        require_gate(approve_refactor, "phase1_review (--approve-refactor)")
+        refactor_dir, refactor_outputs = run_phase2(
+            base_dir,
+            run_id,
+            used_design_tokens_path,
+            design_tokens,
+            proposed,
+            writer=writer,
+            force=force,
+            merge_delta_e=merge_delta_e,
+        )
+        require_gate(approve_sync, "phase2_review (--approve-sync)")
+        sync_dir = run_phase3(
+            base_dir,
+            run_id,
+            refactor_outputs["figma-sync-tokens.json"] if refactor_outputs else None,
+            refactor_outputs["dark-mode-tokens.json"] if refactor_outputs else None,
+            force=force,
+        )
+    return gap_dir, audit_dir, refactor_dir, sync_dir
+
+
 def main():
     parser = argparse.ArgumentParser(description="AI Design System Governance Pipeline")
     subparsers = parser.add_subparsers(dest="command", required=True, help="Pipeline phase to execute")
@@ -503,40 +1141,154 @@ def main():
         help="Figma REST API base URL (default: https://api.figma.com/v1).",
     )
     parser_audit.add_argument("--run-id", default=None, help="Run identifier; default timestamp")
+    parser_audit.add_argument("--force", action="store_true", help="Regenerate outputs even if inputs are unchanged")
+    parser_audit.add_argument(
+        "--allow-stale-fallback",
+        action="store_true",
+        help=(
+            "Use published variables or the local design-tokens.json snapshot if the Figma REST fetch fails "
+            "(default: fail)"
+        ),
+    )
+
+    # Command: all (Phase 1 -> 2 -> 3 in one process)
+    parser_all = subparsers.add_parser("all", help="Run audit, refactor and sync in one process")
+    parser_all.add_argument("--figma-url", required=True, help="Figma URL (stored in metadata)")
+    parser_all.add_argument(
+        "--figma-mcp-variables",
+        default=None,
+        help="Optional JSON file path exported from Figma MCP",
+    )
+    parser_all.add_argument(
+        "--figma-api-token",
+        default=None,
+        help="Optional Figma REST API token",
+    )
+    parser_all.add_argument(
+        "--figma-api-base",
+        default="https://api.figma.com/v1",
+        help="Figma REST API base URL (default: https://api.figma.com/v1).",
+    )
+    parser_all.add_argument("--run-id", default=None, help="Run identifier; default timestamp")
+    parser_all.add_argument(
+        "--approve-refactor", action="store_true", help="Approve the Phase 1 -> Phase 2 gate without review"
+    )
+    parser_all.add_argument(
+        "--approve-sync", action="store_true", help="Approve the Phase 2 -> Phase 3 gate without review"
+    )
+    parser_all.add_argument("--force", action="store_true", help="Regenerate outputs even if inputs are unchanged")
+    parser_all.add_argument(
+        "--allow-stale-fallback",
+        action="store_true",
+        help=(
+            "Use published variables or the local design-tokens.json snapshot if the Figma REST fetch fails "
+            "(default: fail)"
+        ),
+    )
+    parser_all.add_argument(
+        "--merge-delta-e",
+        type=float,
+        default=DEFAULT_MERGE_DELTA_E,
+        help=f"OKLab distance under which colors are planned for merging (default: {DEFAULT_MERGE_DELTA_E})",
+    )
+
+    # Command: batch (Phase 1 for many files)
+    parser_batch = subparsers.add_parser("batch", help="Run Phase 1 for every entry of a manifest on a process pool")
+    parser_batch.add_argument(
+        "--manifest",
+        required=True,
+        help="JSON list or text file (one per line) of Figma URLs and/or MCP snapshot paths",
+    )
+    parser_batch.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Process pool size")
+    parser_batch.add_argument("--figma-api-token", default=None, help="Optional Figma REST API token")
+    parser_batch.add_argument(
+        "--figma-api-base",
+        default="https://api.figma.com/v1",
+        help="Figma REST API base URL (default: https://api.figma.com/v1).",
+    )
+    parser_batch.add_argument("--force", action="store_true", help="Regenerate outputs even if inputs are unchanged")
+    parser_batch.add_argument(
+        "--allow-stale-fallback",
+        action="store_true",
+        help=(
+            "Use published variables or the local design-tokens.json snapshot if the Figma REST fetch fails "
+            "(default: fail)"
+        ),
+    )
 
     # Command: refactor (Phase 2)
     parser_refactor = subparsers.add_parser("refactor", help="Run Phase 2: Refactor (Consolidation & Remediation)")
     parser_refactor.add_argument("--run-id", required=True, help="Run identifier from a previous audit phase")
+    parser_refactor.add_argument(
+        "--force", action="store_true", help="Regenerate outputs even if inputs are unchanged"
+    )
+    parser_refactor.add_argument(
+        "--merge-delta-e",
+        type=float,
+        default=DEFAULT_MERGE_DELTA_E,
+        help=f"OKLab distance under which colors are planned for merging (default: {DEFAULT_MERGE_DELTA_E})",
+    )
 
     # Command: sync (Phase 3)
     parser_sync = subparsers.add_parser("sync", help="Run Phase 3: Code Sync (Implementation)")
     parser_sync.add_argument("--run-id", required=True, help="Run identifier from a previous refactor phase")
+    parser_sync.add_argument("--force", action="store_true", help="Regenerate outputs even if inputs are unchanged")
 
     args = parser.parse_args()
 
     base_dir = Path(__file__).resolve().parent
 
-    if args.command == "audit":
-        run_id = args.run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
-        config_path = base_dir / "pipeline-config.json"
+    if args.command in ("audit", "all"):
+        run_id = args.run_id or reserve_run_id(base_dir)
+        # Run-scoped so concurrent runs in one workspace never overwrite each other's config.
+        config_path = base_dir / "0_gap-report" / f"gap_{run_id}" / "pipeline-config.json"
         config = {
             "run_id": run_id,
             "figma_url": args.figma_url,
             "figma_mcp_variables": args.figma_mcp_variables,
             "figma_api_token_provided": bool(args.figma_api_token or os.getenv("FIGMA_ACCESS_TOKEN")),
             "figma_api_base": args.figma_api_base,
-            "pipeline": ["phase1_analysis"],
+            "pipeline": (
+                ["phase1_analysis"]
+                if args.command == "audit"
+                else ["phase1_analysis", "phase2_refactor", "phase3_code_sync"]
+            ),
         }
-        config_path.write_text(json.dumps(config, indent=2))
+        write_json(config_path, config)
 
+    if args.command == "all":
         api_token = args.figma_api_token or os.getenv("FIGMA_ACCESS_TOKEN")
-        gap_dir, audit_dir, used_design_tokens_path = run_phase1(
+        gap_dir, audit_dir, refactor_dir, sync_dir = run_all(
             base_dir,
             args.figma_url,
             run_id,
             args.figma_mcp_variables,
             api_token,
             args.figma_api_base,
+            approve_refactor=args.approve_refactor,
+            approve_sync=args.approve_sync,
+            force=args.force,
+            allow_stale_fallback=args.allow_stale_fallback,
+            merge_delta_e=args.merge_delta_e,
+        )
+        print("Phases 1-3 (Audit, Refactor, Code Sync) complete")
+        print(f"Run ID: {run_id}")
+        print(f"Gap Report: {gap_dir}")
+        print(f"Audit Report: {audit_dir}")
+        print(f"Refactor Output: {refactor_dir}")
+        print(f"Code Sync Output: {sync_dir}")
+
+    elif args.command == "audit":
+        api_token = args.figma_api_token or os.getenv("FIGMA_ACCESS_TOKEN")
+        gap_dir, audit_dir, used_design_tokens_path, _, _ = run_phase1(
+            base_dir,
+            args.figma_url,
+            run_id,
+            args.figma_mcp_variables,
+            api_token,
+            args.figma_api_base,
+            force=args.force,
+            allow_stale_fallback=args.allow_stale_fallback,
         )
         print("Phase 1 (Audit) complete")
         print(f"Run ID: {run_id}")
@@ -544,13 +1296,32 @@ def main():
         print(f"Audit Report: {audit_dir}")
         print("To proceed to Phase 2, review the outputs and run: python run_pipeline.py refactor --run-id " + run_id)
 
+    elif args.command == "batch":
+        entries = load_batch_manifest(Path(args.manifest))
+        batch_dir, summary = run_batch_audit(
+            base_dir,
+            entries,
+            args.workers,
+            args.figma_api_token or os.getenv("FIGMA_ACCESS_TOKEN"),
+            args.figma_api_base,
+            args.force,
+            args.allow_stale_fallback,
+        )
+        print("Batch audit complete")
+        print(f"Files: {summary['files']}, succeeded: {summary['succeeded']}, failed: {summary['failed']}")
+        print(f"Summary: {batch_dir / 'batch-summary.json'}")
+        if summary["failed"]:
+            raise SystemExit(1)
+
     elif args.command == "refactor":
         run_id = args.run_id
         used_design_tokens_path = base_dir / "0_gap-report" / f"gap_{run_id}" / "design-tokens.used.json"
         if not used_design_tokens_path.exists():
             raise FileNotFoundError(f"Missing required input for refactor: {used_design_tokens_path}. Did you run 'audit' first?")
             
-        refactor_dir = run_phase2(base_dir, run_id, used_design_tokens_path)
+        refactor_dir, _ = run_phase2(
+            base_dir, run_id, used_design_tokens_path, force=args.force, merge_delta_e=args.merge_delta_e
+        )
         print("Phase 2 (Refactor) complete")
         print(f"Refactor Output: {refactor_dir}")
         print("To proceed to Phase 3, confirm the outputs and run: python run_pipeline.py sync --run-id " + run_id)
@@ -561,7 +1332,7 @@ def main():
         if not (refactor_dir / "figma-sync-tokens.json").exists():
             raise FileNotFoundError(f"Missing required input for code sync. Did you run 'refactor' first for run-id {run_id}?")
             
-        sync_dir = run_phase3(base_dir, run_id)
+        sync_dir = run_phase3(base_dir, run_id, force=args.force)
         print("Phase 3 (Code Sync) complete")
         print(f"Code Sync Output: {sync_dir}")
 
@@ -0,0 +1,254 @@
+import math
+import re
+from typing import Optional
+
+# Name words that place a numeric token in a scale; font sizes also need a "size" word.
+SPACING_WORDS = frozenset("spacing space gap padding margin inset gutter".split())
+RADIUS_WORDS = frozenset("radius radii corner corners rounded rounding".split())
+FONT_WORDS = frozenset("font text type typography heading body caption display".split())
+
+# Base units tried, largest first; a unit must cover this share of token uses.
+BASE_UNITS = (8, 6, 5, 4, 3, 2, 1, 0.5)
+BASE_UNIT_COVERAGE = 0.8
+# Values are compared at this many decimal places, so 7.999999 counts as 8.
+PRECISION = 3
+# Radii from PILL_RADIUS up are "fully rounded" (pills), not a scale step, whether
+# the library spells that 500, 999 or 9999; they all map to FULL_RADIUS.
+PILL_RADIUS = 500
+FULL_RADIUS = 9999
+
+# Classic modular type scales; the largest ratio that fits wins.
+MODULAR_RATIOS = (
+    ("golden-ratio", 1.618),
+    ("perfect-fifth", 1.5),
+    ("augmented-fourth", 1.414),
+    ("perfect-fourth", 1.333),
+    ("major-third", 1.25),
+    ("minor-third", 1.2),
+    ("major-second", 1.125),
+    ("minor-second", 1.067),
+)
+# A ratio fits when sizes sit, on average, within this relative distance of its steps.
+MODULAR_TOLERANCE = 0.04
+# Any ratio fits a single size; this one is proposed then.
+DEFAULT_RATIO = "major-third"
+# Where the base (body) size of a type scale is looked for first.
+BODY_SIZE_RANGE = (12, 20)
+# Steps around the base a proposed type scale always has: caption, body, subtitle, title, display.
+MIN_TYPE_STEPS = (-1, 3)
+
+RADIUS_NAMES = ("sm", "md", "lg", "xl")
+
+
+def _words(name: str) -> set:
+    words = set(re.findall(r"[a-z]+", re.sub(r"(?<=[a-z])(?=[A-Z])", " ", name).lower()))
+    return words | {word[:-1] for word in words if word.endswith("s")}
+
+
+def classify(name: str) -> Optional[str]:
+    """``spacing``, ``radius`` or ``font_size`` for a numeric token name, or None."""
+    words = _words(name)
+    if words & RADIUS_WORDS:
+        return "radius"
+    if "size" in words and words & FONT_WORDS or "fontsize" in words:
+        return "font_size"
+    if words & SPACING_WORDS:
+        return "spacing"
+    return None
+
+
+def _histogram(values: list) -> dict:
+    counts = {}
+    for value in values:
+        value = round(float(value), PRECISION)
+        counts[value] = counts.get(value, 0) + 1
+    return counts
+
+
+def _is_multiple(value: float, unit: float) -> bool:
+    return abs(value / unit - round(value / unit)) < 1e-6
+
+
+def base_unit(histogram: dict) -> tuple:
+    """
+    ``(unit, gcd, coverage)``: the largest unit most uses are multiples of.
+
+    ``gcd`` is the exact greatest common divisor of the values at PRECISION decimal
+    places (None when all are zero), so 2.5, 5 and 7.5 give 2.5; it is also tried as
+    a unit when it is not one of BASE_UNITS and lies within their range.
+    """
+    scale = 10**PRECISION
+    gcd = math.gcd(*(round(abs(value) * scale) for value in histogram)) / scale
+    gcd = (int(gcd) if gcd == int(gcd) else gcd) or None
+    in_range = gcd and BASE_UNITS[-1] <= gcd <= 2 * BASE_UNITS[0]
+    candidates = sorted(set(BASE_UNITS) | ({gcd} if in_range else set()), reverse=True)
+    uses = sum(count for value, count in histogram.items() if value)
+    best = (0.0, BASE_UNITS[-1])
+    for unit in candidates:
+        covered = sum(count for value, count in histogram.items() if value and _is_multiple(value, unit))
+        coverage = covered / uses if uses else 1.0
+        if coverage >= BASE_UNIT_COVERAGE:
+            return unit, gcd, round(coverage, 3)
+        best = max(best, (coverage, unit))
+    return best[1], gcd, round(best[0], 3)
+
+
+def fit_modular_scale(histogram: dict) -> tuple:
+    """
+    ``(base, ratio name, ratio, error)`` of the modular scale best describing ``histogram``.
+
+    The base is the most used size in BODY_SIZE_RANGE (else overall); the ratio is
+    the largest of MODULAR_RATIOS whose steps the sizes sit within MODULAR_TOLERANCE
+    of on average (use-weighted, in log space), or the closest fit when none does;
+    DEFAULT_RATIO when there is only one size to go by.
+    """
+    sizes = {value: count for value, count in histogram.items() if value > 0}
+    body = {value: count for value, count in sizes.items() if BODY_SIZE_RANGE[0] <= value <= BODY_SIZE_RANGE[1]}
+    base = max(body or sizes, key=lambda value: ((body or sizes)[value], -abs(value - 16), -value))
+    if len(sizes) < 2:
+        return base, DEFAULT_RATIO, dict(MODULAR_RATIOS)[DEFAULT_RATIO], 0.0
+    uses = sum(sizes.values())
+    fits = []
+    for name, ratio in MODULAR_RATIOS:
+        step = math.log(ratio)
+        error = sum(
+            count * abs(math.log(value / base) / step - round(math.log(value / base) / step)) * step
+            for value, count in sizes.items()
+        ) / uses
+        if error <= math.log(1 + MODULAR_TOLERANCE):
+            return base, name, ratio, round(error, 4)
+        fits.append((error, name, ratio))
+    error, name, ratio = min(fits)
+    return base, name, ratio, round(error, 4)
+
+
+def _size_name(step: int) -> str:
+    """Tailwind-style names around ``base``: sm, xs, 2xs ... below and lg, xl, 2xl ... above."""
+    if step == 0:
+        return "base"
+    if step in (-1, 1):
+        return "sm" if step < 0 else "lg"
+    size = "xs" if step < 0 else "xl"
+    return size if abs(step) == 2 else f"{abs(step) - 1}{size}"
+
+
+def _px(value: float) -> str:
+    return f"{value:g}px"
+
+
+def _snap(value: float, unit: float) -> float:
+    """The nearest multiple of ``unit``, never rounding a non-zero value down to zero."""
+    snapped = round(value / unit) * unit
+    return round(float(snapped if snapped or not value else math.copysign(unit, value)), PRECISION)
+
+
+def _mapping(named: dict, snapped: dict, tokens: dict) -> dict:
+    """Each token's value, the step it lands on in the proposed scale and the change."""
+    by_value = {}
+    for name, value in named.items():
+        by_value.setdefault(value, name)
+    mapping = {}
+    for name, value in tokens.items():
+        to = snapped[round(float(value), PRECISION)]
+        mapping[name] = {"from": value, "to": to, "step": by_value[to], "delta": round(to - value, PRECISION)}
+    return mapping
+
+
+def infer_spacing(tokens: dict) -> dict:
+    histogram = _histogram(tokens.values())
+    unit, gcd, coverage = base_unit(histogram)
+    snapped = {value: _snap(value, unit) for value in histogram}
+    named = {f"{value / unit:g}": value for value in sorted(set(snapped.values()))}
+    return {
+        "base_unit": unit,
+        "gcd": gcd,
+        "base_unit_coverage": coverage,
+        "scale": {name: _px(value) for name, value in named.items()},
+        "mapping": _mapping(named, snapped, tokens),
+    }
+
+
+def _snap_radius(value: float, unit: float) -> float:
+    """Pills become FULL_RADIUS and negative radii, which CSS rejects, become 0."""
+    if value >= PILL_RADIUS:
+        return FULL_RADIUS
+    return _snap(value, unit) if value > 0 else 0.0
+
+
+def infer_radius(tokens: dict) -> dict:
+    histogram = _histogram(tokens.values())
+    unit, gcd, coverage = base_unit({value: count for value, count in histogram.items() if 0 < value < PILL_RADIUS})
+    snapped = {value: _snap_radius(value, unit) for value in histogram}
+    sized = sorted({value for value in snapped.values() if 0 < value < FULL_RADIUS})
+    names = RADIUS_NAMES + tuple(f"{n}xl" for n in range(2, len(sized) - len(RADIUS_NAMES) + 2))
+    named = {"none": 0.0} if 0.0 in snapped.values() else {}
+    named.update(zip(names, sized))
+    if FULL_RADIUS in snapped.values():
+        named["full"] = FULL_RADIUS
+    return {
+        "base_unit": unit,
+        "gcd": gcd,
+        "base_unit_coverage": coverage,
+        "scale": {name: _px(value) for name, value in named.items()},
+        "mapping": _mapping(named, snapped, tokens),
+    }
+
+
+def infer_font_sizes(tokens: dict) -> dict:
+    histogram = _histogram(tokens.values())
+    base, ratio_name, ratio, error = fit_modular_scale(histogram)
+    step = math.log(ratio)
+    positions = {value: round(math.log(value / base) / step) for value in histogram}
+    span = range(min(MIN_TYPE_STEPS[0], *positions.values()), max(MIN_TYPE_STEPS[1], *positions.values()) + 1)
+    sizes = {position: round(base * ratio**position) for position in span}
+    named = {}
+    for position, size in sizes.items():
+        # Small sizes on small ratios can round onto the same pixel; the first name keeps it.
+        if size not in named.values():
+            named[_size_name(position)] = size
+    return {
+        "base_size": base,
+        "ratio_name": ratio_name,
+        "ratio": ratio,
+        "fit_error": error,
+        "scale": {name: _px(value) for name, value in named.items()},
+        "mapping": _mapping(named, {value: sizes[position] for value, position in positions.items()}, tokens),
+    }
+
+
+INFERENCE = (("spacing", infer_spacing), ("radius", infer_radius), ("font_size", infer_font_sizes))
+
+
+def infer_scales(design_tokens: dict) -> dict:
+    """
+    Spacing, radius and font-size scales inferred from a library's numeric tokens.
+
+    Numeric variables are sorted into categories by name (typography styles add
+    their sizes as font sizes) and each category is histogrammed in one pass.
+    Spacing and radii get the largest base unit that most values are multiples
+    of; font sizes the modular scale that fits them. Only distinct values are
+    examined after that, so the cost is linear in the number of tokens. Each
+    category reports its proposed scale and where every token lands on it;
+    categories with no tokens are left out.
+    """
+    by_category = {key: {} for key, _ in INFERENCE}
+    unclassified = 0
+    for name, value in design_tokens.get("numbers", {}).items():
+        category = classify(name)
+        if category is None or category == "font_size" and value <= 0:
+            unclassified += 1
+        else:
+            by_category[category][name] = value
+    for name, style in design_tokens.get("typography", {}).items():
+        size = style.get("size") if isinstance(style, dict) else None
+        if isinstance(size, (int, float)) and not isinstance(size, bool) and size > 0:
+            by_category["font_size"].setdefault(f"typography/{name}", size)
+
+    result = {
+        "numbers_analyzed": len(design_tokens.get("numbers", {})),
+        "unclassified": unclassified,
+    }
+    for key, infer in INFERENCE:
+        if by_category[key]:
+            result[key] = {"tokens": len(by_category[key]), **infer(by_category[key])}
+    return result
@@ -0,0 +1,124 @@
+import gzip
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from figma_http import FigmaHttpClient, RetryPolicy, TokenBucket  # noqa: E402
+
+API_PREFIX = "/v1"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        with self.server.lock:
+            self.server.requests.append(self.path)
+            self.server.request_headers.append(dict(self.headers))
+        route = self.server.routes.get(url.path.removeprefix(API_PREFIX))
+        status, headers, body = route(parse_qs(url.query)) if route else (404, {}, {"status": 404})
+        body = json.dumps(body).encode("utf-8")
+        headers = {"Content-Type": "application/json", **headers}
+        if self.server.gzip and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        # Drop the keep-alive connection without announcing it, as an idle timeout would.
+        self.close_connection = self.server.drop_connections
+
+
+class MockFigmaServer(ThreadingHTTPServer):
+    """
+    Figma REST stand-in on a local port. ``routes`` maps an API path (without the
+    query) to ``handler(query) -> (status, headers, json_body)``; every request path
+    and every accepted connection is recorded.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.lock = threading.Lock()
+        self.routes = {}
+        self.requests = []
+        self.request_headers = []
+        self.connections = 0
+        self.gzip = False
+        self.drop_connections = False
+
+    @property
+    def api_base(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}{API_PREFIX}"
+
+    def json_route(self, path: str, body, status: int = 200, headers=None):
+        self.routes[path] = lambda query: (status, headers or {}, body)
+
+
+def variables_payload(colors: dict) -> dict:
+    """``/variables/*`` response with one COLOR variable per ``{name: (r, g, b)}`` entry."""
+    variables = {
+        f"VariableID:{index}": {
+            "id": f"VariableID:{index}",
+            "name": name,
+            "variableCollectionId": "C1",
+            "resolvedType": "COLOR",
+            "valuesByMode": {"M1": {"r": r, "g": g, "b": b, "a": 1}},
+        }
+        for index, (name, (r, g, b)) in enumerate(colors.items())
+    }
+    collections = {"C1": {"id": "C1", "defaultModeId": "M1", "modes": [{"modeId": "M1", "name": "Light"}]}}
+    return {"meta": {"variables": variables, "variableCollections": collections}}
+
+
+def empty_library_routes(server: MockFigmaServer, file_id: str):
+    """Routes for a file without styles or components, so only variables matter."""
+    server.json_route(f"/files/{file_id}", {"version": "1"})
+    server.json_route(f"/files/{file_id}/styles", {"meta": {"styles": []}})
+    server.json_route(f"/files/{file_id}/component_sets", {"meta": {"component_sets": []}})
+    server.json_route(f"/files/{file_id}/components", {"meta": {"components": []}})
+
+
+@pytest.fixture
+def figma_server():
+    server = MockFigmaServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def figma_client(figma_server):
+    client = FigmaHttpClient(
+        figma_server.api_base, "test-token", bucket=TokenBucket(1000, 1000), retry=RetryPolicy(base_delay=0.0)
+    )
+    yield client
+    client.close()
+
+
+@pytest.fixture(autouse=True)
+def fast_rate_limit(monkeypatch):
+    # Clients built by get_figma_client must not be held to the real API's budget.
+    monkeypatch.setenv("FIGMA_REST_RATE_LIMIT", "60000")
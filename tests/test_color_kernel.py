@@ -0,0 +1,100 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+import color_kernel  # noqa: E402
+from color_kernel import (  # noqa: E402
+    composite_over,
+    contrast_matrix,
+    figma_to_hex,
+    figma_to_rgba8,
+    format_hex,
+    gamut_map_oklch,
+    oklch_to_rgb8,
+    pack_unit_channels,
+    pairs_below,
+    parse_hex,
+    rgba8_to_oklch,
+    rows,
+    to_unit,
+)
+
+HEX = ["#1f6feb", "#FFF", "abc", "#00000080", "#12345678", "#ff0000", "#7f7f7f"]
+FIGMA = [
+    {"r": 0.5, "g": 0.25, "b": 1.0},
+    {"r": 0.1216, "g": 0.4353, "b": 0.9216, "a": 1},
+    {"r": 0, "g": 0, "b": 0, "a": 0.5},
+    {"r": 1.2, "g": -0.1, "b": 0.998, "a": 0.25},
+    {"g": 1},
+]
+# In gamut, chroma far outside sRGB, lightness outside 0-1, black and grey.
+OKLCH = [(0.7, 0.1, 250.0), (0.95, 0.4, 30.0), (0.5, 0.37, 145.0), (1.2, 0.05, 90.0), (-0.1, 0.2, 0.0), (0.6, 0.0, 0.0)]
+
+
+def pure_python(monkeypatch, compute):
+    """``compute()`` with NumPy hidden from color_kernel, as on an install without it."""
+    with monkeypatch.context() as patched:
+        patched.setattr(color_kernel, "np", None)
+        return compute()
+
+
+def flat(batch) -> list:
+    return [c for row in rows(batch) for c in row]
+
+
+def lch_rows(batch) -> list:
+    """OKLCH rows with the hue zeroed where chroma is round-off, as for white and greys."""
+    return [(L, C, h if C > 1e-6 else 0.0) for L, C, h in rows(batch)]
+
+
+def test_hex_batches_match_across_backends(monkeypatch):
+    def compute():
+        rgba8 = parse_hex(HEX)
+        return rgba8, format_hex(rgba8), format_hex(rgba8, True), composite_over(rgba8), rgba8_to_oklch(rgba8)
+
+    fast, pure = compute(), pure_python(monkeypatch, compute)
+
+    assert rows(fast[0]) == rows(pure[0])
+    assert fast[1:3] == pure[1:3]
+    assert fast[2][3] == "#00000080"
+    assert rows(fast[3]) == rows(pure[3])
+    assert flat(lch_rows(fast[4])) == pytest.approx(flat(lch_rows(pure[4])), abs=1e-9)
+
+
+def test_figma_batches_match_across_backends(monkeypatch):
+    def compute():
+        channels = [float(c.get(k, default)) for c in FIGMA for k, default in (("r", 0), ("g", 0), ("b", 0), ("a", 1))]
+        return figma_to_rgba8(FIGMA), figma_to_hex(FIGMA), pack_unit_channels(channels)
+
+    fast, pure = compute(), pure_python(monkeypatch, compute)
+
+    # 0.5 * 255 rounds half to even on both paths.
+    expected = [[128, 64, 255, 255], [31, 111, 235, 255], [0, 0, 0, 128], [255, 0, 254, 64], [0, 255, 0, 255]]
+    assert rows(fast[0]) == rows(pure[0]) == expected
+    assert fast[1] == pure[1]
+    assert fast[2] == pure[2]
+
+
+def test_oklch_batches_match_across_backends(monkeypatch):
+    def compute():
+        mapped = gamut_map_oklch(OKLCH)
+        return mapped, oklch_to_rgb8(mapped), oklch_to_rgb8(OKLCH)
+
+    fast, pure = compute(), pure_python(monkeypatch, compute)
+
+    assert flat(lch_rows(fast[0])) == pytest.approx(flat(lch_rows(pure[0])), abs=1e-9)
+    assert rows(fast[1]) == rows(pure[1])
+    assert rows(fast[2]) == rows(pure[2])
+
+
+def test_contrast_batches_match_across_backends(monkeypatch):
+    def compute():
+        unit = to_unit(parse_hex(HEX))
+        ratios = contrast_matrix(unit, [row[:3] for row in rows(unit)[:3]])
+        return ratios, pairs_below(ratios, [4.5] * len(HEX), 5)
+
+    fast, pure = compute(), pure_python(monkeypatch, compute)
+
+    assert flat(fast[0]) == pytest.approx(flat(pure[0]), abs=1e-12)
+    assert fast[1][0] == pure[1][0]
+    assert [cell[:2] for cell in fast[1][1]] == [cell[:2] for cell in pure[1][1]]
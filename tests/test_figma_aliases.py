@@ -0,0 +1,94 @@
+from figma_aliases import AliasResolver, ResolvedVariable, VariableRecord
+
+
+def alias(var_id: str) -> dict:
+    return {"type": "VARIABLE_ALIAS", "id": var_id}
+
+
+# "primitives" has Light/Dark modes; "semantic" has its own Compact/Comfortable modes.
+DEFAULT_MODES = {"primitives": "light", "semantic": "compact"}
+VARIABLES = {
+    "blue-500": VariableRecord("blue/500", "primitives", {"light": "#1f6feb", "dark": "#388bfd"}),
+    "blue-300": VariableRecord("blue/300", "primitives", {"light": "#79c0ff", "dark": "#a5d6ff"}),
+    "brand": VariableRecord("brand/primary", "primitives", {"light": alias("blue-500"), "dark": alias("blue-300")}),
+    "accent": VariableRecord("accent", "semantic", {"compact": alias("brand"), "comfortable": alias("blue-300")}),
+    # Only a dark value, so the collection default (light) cannot be used.
+    "night": VariableRecord("night", "primitives", {"dark": "#0d1117"}),
+    "surface": VariableRecord("surface", "semantic", {"compact": alias("night")}),
+}
+
+
+def resolver(variables: dict) -> AliasResolver:
+    return AliasResolver(variables, DEFAULT_MODES)
+
+
+def test_aliases_keep_the_mode_within_a_collection():
+    aliases = resolver(VARIABLES)
+
+    assert aliases.resolve("brand", "light") == ResolvedVariable("#1f6feb", ("brand/primary", "blue/500"))
+    assert aliases.resolve("brand", "dark") == ResolvedVariable("#a5d6ff", ("brand/primary", "blue/300"))
+    # No mode, or one the variable does not have, means its collection's default.
+    assert aliases.resolve("brand").value == "#1f6feb"
+    assert aliases.resolve("brand", "comfortable").value == "#1f6feb"
+
+
+def test_cross_collection_aliases_continue_in_the_target_default_mode():
+    aliases = resolver(VARIABLES)
+
+    assert aliases.resolve("accent", "compact") == ResolvedVariable("#1f6feb", ("accent", "brand/primary", "blue/500"))
+    assert aliases.resolve("accent", "comfortable") == ResolvedVariable("#79c0ff", ("accent", "blue/300"))
+    # A target without its default mode falls back to its first mode.
+    assert aliases.resolve("surface", "compact") == ResolvedVariable("#0d1117", ("surface", "night"))
+
+
+def test_cycles_are_reported_once_and_never_resolve():
+    variables = {
+        "a": VariableRecord("a", "primitives", {"light": alias("b")}),
+        "b": VariableRecord("b", "primitives", {"light": alias("c")}),
+        "c": VariableRecord("c", "primitives", {"light": alias("a")}),
+        "into-cycle": VariableRecord("into-cycle", "primitives", {"light": alias("b")}),
+        "self": VariableRecord("self", "primitives", {"light": alias("self")}),
+    }
+    aliases = resolver(variables)
+
+    assert aliases.resolve("into-cycle", "light") == ResolvedVariable(None, ("into-cycle", "b", "c", "a", "b"), "cycle")
+    for var_id in ("a", "b", "c"):
+        assert aliases.resolve(var_id, "light").error == "cycle"
+    assert aliases.resolve("self", "light") == ResolvedVariable(None, ("self", "self"), "cycle")
+    assert aliases.cycles == [("b", "c", "a"), ("self",)]
+
+
+def test_cycles_across_collections_and_modes():
+    variables = {
+        **VARIABLES,
+        # Dark "loop" reaches "echo", whose alias back lands in loop's default (light) mode.
+        "loop": VariableRecord("loop", "primitives", {"light": alias("echo"), "dark": alias("echo")}),
+        "echo": VariableRecord("echo", "semantic", {"compact": alias("loop")}),
+    }
+    aliases = resolver(variables)
+
+    assert aliases.resolve("loop", "dark") == ResolvedVariable(None, ("loop", "echo", "loop", "echo"), "cycle")
+    assert aliases.cycles == [("echo", "loop")]
+    assert aliases.resolve("loop", "light").error == "cycle"
+    assert aliases.resolve("brand", "dark").value == "#a5d6ff"
+
+
+def test_missing_targets_are_named():
+    variables = {**VARIABLES, "broken": VariableRecord("broken", "primitives", {"light": alias("VariableID:9")})}
+    aliases = resolver(variables)
+
+    missing = ResolvedVariable(None, ("broken", "VariableID:9"), "missing:VariableID:9")
+    assert aliases.resolve("broken", "light") == missing
+    assert aliases.resolve("VariableID:9").error == "missing:VariableID:9"
+
+
+def test_long_chains_resolve_without_recursion():
+    count = 50_000
+    variables = {f"v{n}": VariableRecord(f"v{n}", "primitives", {"light": alias(f"v{n + 1}")}) for n in range(count)}
+    variables[f"v{count}"] = VariableRecord("end", "primitives", {"light": 4})
+    aliases = resolver(variables)
+
+    resolved = aliases.resolve("v0", "light")
+    assert resolved.value == 4
+    assert len(resolved.chain) == count + 1
+    assert aliases.resolve(f"v{count // 2}", "light").value == 4
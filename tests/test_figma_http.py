@@ -0,0 +1,62 @@
+import io
+import json
+
+import pytest
+
+from figma_cache import fetch_parsed_cached
+from figma_http import FETCH_ERRORS
+from figma_stream import JsonStreamReader
+
+
+def test_requests_reuse_one_keep_alive_connection(figma_server, figma_client):
+    figma_server.json_route("/files/F1", {"version": "1"})
+
+    for _ in range(5):
+        assert figma_client.get_json("/files/F1") == {"version": "1"}
+
+    assert len(figma_server.requests) == 5
+    assert figma_server.connections == 1
+
+
+def test_gzip_responses_are_requested_and_decoded(figma_server, figma_client):
+    figma_server.gzip = True
+    figma_server.json_route("/files/F1/variables/local", {"meta": {"variables": {}}})
+
+    assert figma_client.get_json("/files/F1/variables/local") == {"meta": {"variables": {}}}
+    sink = io.BytesIO()
+    response = figma_client.get("/files/F1/variables/local", sink=sink)
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert json.loads(sink.getvalue()) == {"meta": {"variables": {}}}
+    assert all(headers["Accept-Encoding"] == "gzip" for headers in figma_server.request_headers)
+
+
+def test_stale_keep_alive_connection_is_replaced_without_a_retry(figma_server, figma_client):
+    figma_server.drop_connections = True
+    figma_server.json_route("/files/F1", {"version": "1"})
+
+    for _ in range(3):
+        assert figma_client.get_json("/files/F1") == {"version": "1"}
+
+    # Each pooled connection was closed by the server after one response and redialled in _send.
+    assert figma_server.connections == 3
+    metrics = figma_client.metrics.snapshot()
+    assert metrics["requests"] == 3
+    assert metrics["retries"] == 0
+    assert metrics["transport_errors"] == 0
+
+
+def test_parser_bugs_are_not_fetch_errors(figma_server, figma_client):
+    figma_server.json_route("/files/F1", {"version": "1"})
+
+    def parse(fh):
+        return int(json.load(fh)["version"] + "x")
+
+    with pytest.raises(ValueError) as raised:
+        fetch_parsed_cached(figma_client, None, "/files/F1", parse, "1")
+    assert not isinstance(raised.value, FETCH_ERRORS)
+
+
+def test_malformed_response_bodies_are_fetch_errors():
+    with pytest.raises(FETCH_ERRORS):
+        list(JsonStreamReader(io.StringIO('{"meta": {"variables": {"a": 1')).iter_members([("meta", "variables")]))
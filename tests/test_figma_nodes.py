@@ -0,0 +1,115 @@
+import threading
+from urllib.parse import quote
+
+from figma_cache import HttpCache
+from figma_http import TokenBucket
+from figma_nodes import NODE_CHUNK_SIZE, NODE_FETCH_WORKERS, NODE_IDS_MAX_CHARS, chunk_node_ids, fetch_component_nodes
+
+FILE_ID = "F1"
+
+
+class CountingBucket(TokenBucket):
+    def __init__(self):
+        super().__init__(1000, 1000)
+        self.taken = 0
+        self._count_lock = threading.Lock()
+
+    def acquire(self) -> float:
+        with self._count_lock:
+            self.taken += 1
+        return super().acquire()
+
+
+def component_set(node_id: str) -> dict:
+    return {
+        "id": node_id,
+        "type": "COMPONENT_SET",
+        "name": f"Button {node_id}",
+        "children": [
+            {"id": f"{node_id}-{state}", "type": "COMPONENT", "name": f"State={state}", "children": []}
+            for state in ("Default", "Hover")
+        ],
+    }
+
+
+def library_routes(server, node_ids: list, version: list, on_nodes=None):
+    """A library of one component set per id; ``version[0]`` is the file's current version."""
+    server.routes[f"/files/{FILE_ID}"] = lambda query: (200, {}, {"version": version[0]})
+    listing = [{"node_id": node_id, "name": f"Button {node_id}"} for node_id in node_ids]
+    server.json_route(f"/files/{FILE_ID}/component_sets", {"meta": {"component_sets": listing}})
+    server.json_route(f"/files/{FILE_ID}/components", {"meta": {"components": []}})
+
+    def nodes(query):
+        if on_nodes:
+            on_nodes()
+        ids = query["ids"][0].split(",")
+        return 200, {}, {"nodes": {node_id: {"document": component_set(node_id)} for node_id in ids}}
+
+    server.routes[f"/files/{FILE_ID}/nodes"] = nodes
+
+
+def node_requests(server) -> list:
+    return [path for path in server.requests if "/nodes?" in path]
+
+
+def test_chunks_respect_the_id_count_and_url_length():
+    assert [len(chunk) for chunk in chunk_node_ids(f"1:{n}" for n in range(250))] == [100, 100, 50]
+
+    # Instance ids are long; the URL cap splits them well before the count does.
+    long_ids = [f"I{n}:1;" + ";".join(f"{n}:{k}" for k in range(40)) for n in range(60)]
+    chunks = chunk_node_ids(long_ids + long_ids[:5])
+    assert sorted(node_id for chunk in chunks for node_id in chunk) == sorted(long_ids)
+    assert len(chunks) > 1
+    assert all(len(quote(",".join(chunk), safe=",:")) <= NODE_IDS_MAX_CHARS for chunk in chunks)
+
+
+def test_component_nodes_are_fetched_in_capped_chunks(figma_server, figma_client, tmp_path):
+    node_ids = [f"10:{n}" for n in range(2 * NODE_CHUNK_SIZE + 30)]
+    library_routes(figma_server, node_ids, ["7"])
+
+    components = fetch_component_nodes(FILE_ID, figma_client, HttpCache(tmp_path))
+
+    assert len(components) == len(node_ids)
+    requested = []
+    for path in node_requests(figma_server):
+        ids = path.split("ids=")[1].split("&")[0]
+        assert len(ids) <= NODE_IDS_MAX_CHARS
+        requested.append(ids.split(","))
+    # Chunks are requested concurrently, so they may arrive in any order.
+    assert sorted(len(chunk) for chunk in requested) == [30, NODE_CHUNK_SIZE, NODE_CHUNK_SIZE]
+    assert sorted(node_id for chunk in requested for node_id in chunk) == sorted(node_ids)
+
+
+def test_chunks_run_concurrently_on_the_shared_bucket(figma_server, figma_client, tmp_path):
+    node_ids = [f"10:{n}" for n in range(NODE_FETCH_WORKERS * NODE_CHUNK_SIZE)]
+    # Every chunk request waits until all of them are in flight at once.
+    all_in_flight = threading.Barrier(NODE_FETCH_WORKERS, timeout=5)
+    library_routes(figma_server, node_ids, ["7"], on_nodes=all_in_flight.wait)
+    figma_client.bucket = CountingBucket()
+
+    components = fetch_component_nodes(FILE_ID, figma_client, HttpCache(tmp_path))
+
+    assert not all_in_flight.broken
+    assert len(components) == len(node_ids)
+    assert len(node_requests(figma_server)) == NODE_FETCH_WORKERS
+    assert figma_client.bucket.taken == len(figma_server.requests)
+
+
+def test_version_pinned_nodes_are_served_from_cache_until_the_file_changes(figma_server, figma_client, tmp_path):
+    node_ids = [f"10:{n}" for n in range(3)]
+    version = ["7"]
+    library_routes(figma_server, node_ids, version)
+    # No TTL: every unpinned request is revalidated with the server.
+    cache = HttpCache(tmp_path, ttl_seconds=0)
+
+    first = fetch_component_nodes(FILE_ID, figma_client, cache)
+    assert node_requests(figma_server) == [f"/v1/files/{FILE_ID}/nodes?ids=10:0,10:1,10:2&depth=2&version=7"]
+
+    figma_server.requests.clear()
+    assert fetch_component_nodes(FILE_ID, figma_client, cache) == first
+    assert figma_server.requests and not node_requests(figma_server)
+
+    version[0] = "8"
+    figma_server.requests.clear()
+    fetch_component_nodes(FILE_ID, figma_client, cache)
+    assert [path.rsplit("=", 1)[1] for path in node_requests(figma_server)] == ["8"]
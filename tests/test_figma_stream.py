@@ -0,0 +1,95 @@
+import io
+import json
+
+import pytest
+
+from figma_stream import JsonStreamReader
+
+DOCUMENT = {
+    "skipped": {
+        "rows": [[n, -n / 8, {"id": f"row-{n}"}] for n in range(20)],
+        "text": 'quote " backslash \\ slash / tab \t é 😀',
+        "number": -1.5e-3,
+    },
+    "meta": {
+        "variables": {
+            'v"1': {
+                "name": "é 😀 \n line",
+                "values": [1, -0.0, 1e21, 2.5e-7, 12345678901234567890, True, False, None],
+            },
+            "v\\2": [[1, [2, [3, []]]], [], [{}]],
+            "v3": "😀 \u0000 \u001f",
+            "v4": 1234567890.125,
+        },
+        "sets": [[], {"k": [0.5, -17]}, "x", 42, None],
+    },
+    "tail": 123456789,
+}
+# Compact and indented, with non-ASCII text both escaped (surrogate pairs) and raw.
+ENCODINGS = [
+    json.dumps(DOCUMENT),
+    json.dumps(DOCUMENT, ensure_ascii=False),
+    json.dumps(DOCUMENT, indent=2, ensure_ascii=False),
+]
+# Small chunks put every read boundary inside some string, escape and number.
+CHUNK_SIZES = [1, 2, 3, 5, 7, 64, 1 << 20]
+
+
+def read_members(text: str, patterns, chunk_size: int):
+    reader = JsonStreamReader(io.StringIO(text), chunk_size=chunk_size)
+    return list(reader.iter_members(patterns)), reader.containers
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("text", ENCODINGS)
+def test_members_match_json_load(text, chunk_size):
+    loaded = json.load(io.StringIO(text))
+    variables = loaded["meta"]["variables"]
+    sets = loaded["meta"]["sets"]
+
+    members, containers = read_members(text, [("meta", "variables"), ("meta", "sets")], chunk_size)
+
+    assert members == [(("meta", "variables"), key, value) for key, value in variables.items()] + [
+        (("meta", "sets"), index, value) for index, value in enumerate(sets)
+    ]
+    assert containers == {("meta", "variables"): "{", ("meta", "sets"): "["}
+    # Escaped and astral characters decode exactly as json.load decodes them.
+    assert list(variables) == ['v"1', "v\\2", "v3", "v4"]
+    assert members[2][2] == "\U0001f600 \x00 \x1f"
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_wildcards_descend_into_nested_arrays(chunk_size):
+    text = ENCODINGS[0]
+    rows = json.load(io.StringIO(text))["skipped"]["rows"]
+
+    members, containers = read_members(text, [("skipped", "rows", "*")], chunk_size)
+
+    assert members == [
+        (("skipped", "rows", n), index, value) for n, row in enumerate(rows) for index, value in enumerate(row)
+    ]
+    assert set(containers.values()) == {"["}
+
+
+@pytest.mark.parametrize("text", ["[1, 2.5e3, -0]", '"not a container"', "-12.75e-2", "true"])
+def test_top_level_values_without_matching_members(text):
+    members, _ = read_members(text, [("meta",)], chunk_size=2)
+    assert members == []
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+def test_truncated_documents_raise_like_json_load(chunk_size):
+    text = ENCODINGS[0]
+    for end in range(len(text)):
+        with pytest.raises(json.JSONDecodeError):
+            json.loads(text[:end])
+        with pytest.raises(json.JSONDecodeError):
+            read_members(text[:end], [("meta", "variables")], chunk_size)
+
+
+@pytest.mark.parametrize("text", ['{"a": [1 2]}', '{"a" 1}', '{"a": tru}', '{"a": "\\x"}', '{"a": 1,}'])
+def test_malformed_documents_raise_like_json_load(text):
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(text)
+    with pytest.raises(json.JSONDecodeError):
+        read_members(text, [("a",)], chunk_size=2)
@@ -0,0 +1,21 @@
+import json
+
+from generate_refactor_outputs import generate_refactor_outputs
+
+
+def test_component_artifacts_stay_lists_when_the_component_fetch_failed(tmp_path, capsys):
+    design_tokens = {"colors": {"brand/500": "#ff0000"}, "fetch_errors": {"components": "HTTP 403 for /components"}}
+
+    generate_refactor_outputs(design_tokens, {"tokens": {}}, tmp_path)
+
+    assert json.loads((tmp_path / "variant-gaps.json").read_text()) == []
+    assert json.loads((tmp_path / "auto-layout-fixes.json").read_text()) == []
+    assert "HTTP 403 for /components" in capsys.readouterr().err
+
+
+def test_variables_only_tokens_have_no_component_findings(tmp_path, capsys):
+    generate_refactor_outputs({"colors": {"brand/500": "#ff0000"}}, {"tokens": {}}, tmp_path)
+
+    assert json.loads((tmp_path / "variant-gaps.json").read_text()) == []
+    assert json.loads((tmp_path / "auto-layout-fixes.json").read_text()) == []
+    assert capsys.readouterr().err == ""
@@ -0,0 +1,29 @@
+import os
+
+import palette_clustering
+from palette_clustering import propose_palette
+
+
+def test_palette_cache_evicts_least_recently_used_entries(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "palettes"
+    libraries = [{"brand": f"#{n:02x}4080", "text": "#111111"} for n in range(6)]
+    propose_palette(libraries[0], cache_dir=cache_dir)
+    entry_size = next(cache_dir.glob("*.json")).stat().st_size
+    monkeypatch.setattr(palette_clustering, "PALETTE_CACHE_MAX_BYTES", 3 * entry_size)
+
+    hashes = []
+    for age, colors in enumerate(libraries):
+        hashes.append(propose_palette(colors, cache_dir=cache_dir)["input_hash"])
+        for n, input_hash in enumerate(hashes):
+            path = cache_dir / f"{input_hash}.json"
+            if path.exists():
+                # Older libraries were used longer ago; mtimes stand in for the clock.
+                os.utime(path, (1_000_000 + n, 1_000_000 + n))
+    # A cache hit refreshes the entry, so it outlives entries written after it.
+    propose_palette(libraries[3], cache_dir=cache_dir)
+    propose_palette({"brand": "#ff0000"}, cache_dir=cache_dir)
+
+    kept = {path.stem for path in cache_dir.glob("*.json")}
+    assert len(kept) <= 3
+    assert hashes[3] in kept
+    assert hashes[0] not in kept
@@ -0,0 +1,14 @@
+import os
+
+from pipeline_io import write_json
+
+
+def test_artifacts_get_the_umask_mode_and_leave_no_temp_files(tmp_path):
+    previous = os.umask(0o027)
+    try:
+        write_json(tmp_path / "out.json", {"a": 1})
+    finally:
+        os.umask(previous)
+
+    assert (tmp_path / "out.json").stat().st_mode & 0o777 == 0o640
+    assert [p.name for p in tmp_path.iterdir()] == ["out.json"]
@@ -0,0 +1,138 @@
+import json
+import threading
+
+import pytest
+
+from conftest import empty_library_routes, variables_payload
+from figma_http import FigmaFetchError
+from run_pipeline import fetch_figma_variables_via_rest, run_phase1
+
+FILE_ID = "F1"
+FIGMA_URL = f"https://www.figma.com/design/{FILE_ID}/Library?node-id=1-2"
+THROTTLED = (429, {"Retry-After": "0"}, {"status": 429, "err": "Rate limit exceeded"})
+
+
+def test_throttled_local_variables_fail_instead_of_using_empty_published(figma_server):
+    empty_library_routes(figma_server, FILE_ID)
+    figma_server.routes[f"/files/{FILE_ID}/variables/local"] = lambda query: THROTTLED
+    figma_server.json_route(f"/files/{FILE_ID}/variables/published", variables_payload({}))
+
+    with pytest.raises(FigmaFetchError, match="variables/local"):
+        fetch_figma_variables_via_rest(FILE_ID, "token-429", figma_server.api_base)
+
+
+def test_throttled_local_variables_fail_the_audit_without_fallback(figma_server, tmp_path):
+    empty_library_routes(figma_server, FILE_ID)
+    figma_server.routes[f"/files/{FILE_ID}/variables/local"] = lambda query: THROTTLED
+    figma_server.json_route(f"/files/{FILE_ID}/variables/published", variables_payload({}))
+    (tmp_path / "design-tokens.json").write_text(json.dumps({"colors": {"stale": "#000000"}}))
+
+    with pytest.raises(FigmaFetchError):
+        run_phase1(tmp_path, FIGMA_URL, "r1", figma_api_token="token-audit", figma_api_base=figma_server.api_base)
+    assert not (tmp_path / "1_audit-report").exists()
+
+
+def test_published_variables_need_the_fallback_opt_in(figma_server):
+    empty_library_routes(figma_server, FILE_ID)
+    figma_server.routes[f"/files/{FILE_ID}/variables/local"] = lambda query: THROTTLED
+    figma_server.json_route(f"/files/{FILE_ID}/variables/published", variables_payload({"brand/500": (0, 0, 1)}))
+
+    with pytest.raises(FigmaFetchError):
+        fetch_figma_variables_via_rest(FILE_ID, "token-strict", figma_server.api_base)
+    tokens, source = fetch_figma_variables_via_rest(
+        FILE_ID, "token-opt-in", figma_server.api_base, allow_published_fallback=True
+    )
+    assert source == f"figma-rest-api:/files/{FILE_ID}/variables/published"
+    assert tokens["colors"] == {"brand/500": "#0000ff"}
+
+
+def test_local_and_published_variables_are_fetched_concurrently(figma_server):
+    empty_library_routes(figma_server, FILE_ID)
+    # Each endpoint answers only once the other one is in flight too.
+    both_in_flight = threading.Barrier(2, timeout=5)
+
+    def variables(colors):
+        def route(query):
+            both_in_flight.wait()
+            return 200, {}, variables_payload(colors)
+
+        return route
+
+    figma_server.routes[f"/files/{FILE_ID}/variables/local"] = variables({"brand/500": (1, 0, 0)})
+    figma_server.routes[f"/files/{FILE_ID}/variables/published"] = variables({"brand/500": (0, 0, 1)})
+
+    tokens, source = fetch_figma_variables_via_rest(FILE_ID, "token-concurrent", figma_server.api_base)
+
+    assert not both_in_flight.broken
+    assert source == f"figma-rest-api:/files/{FILE_ID}/variables/local"
+    assert tokens["colors"] == {"brand/500": "#ff0000"}
+
+
+def test_published_variables_are_used_when_local_ones_have_no_colors(figma_server):
+    empty_library_routes(figma_server, FILE_ID)
+    figma_server.json_route(f"/files/{FILE_ID}/variables/local", variables_payload({}))
+    figma_server.json_route(f"/files/{FILE_ID}/variables/published", variables_payload({"brand/500": (0, 0, 1)}))
+
+    tokens, source = fetch_figma_variables_via_rest(FILE_ID, "token-published", figma_server.api_base)
+
+    assert source == f"figma-rest-api:/files/{FILE_ID}/variables/published"
+    assert tokens["colors"] == {"brand/500": "#0000ff"}
+
+
+def test_failed_component_fetch_is_recorded(figma_server):
+    empty_library_routes(figma_server, FILE_ID)
+    figma_server.json_route(f"/files/{FILE_ID}/component_sets", {"status": 403, "err": "Forbidden"}, status=403)
+    figma_server.json_route(f"/files/{FILE_ID}/variables/local", variables_payload({"brand/500": (1, 0, 0)}))
+    figma_server.json_route(f"/files/{FILE_ID}/variables/published", variables_payload({}))
+
+    tokens, _ = fetch_figma_variables_via_rest(FILE_ID, "token-components", figma_server.api_base)
+
+    assert "components" not in tokens
+    assert "HTTP 403" in tokens["fetch_errors"]["components"]
+
+
+def test_rest_audit_runs_without_a_local_snapshot(figma_server, tmp_path):
+    empty_library_routes(figma_server, FILE_ID)
+    figma_server.json_route(f"/files/{FILE_ID}/variables/local", variables_payload({"brand/500": (1, 0, 0)}))
+    figma_server.json_route(f"/files/{FILE_ID}/variables/published", variables_payload({}))
+
+    _, audit_dir, _, design_tokens, _ = run_phase1(
+        tmp_path, FIGMA_URL, "r1", figma_api_token="token-no-snapshot", figma_api_base=figma_server.api_base
+    )
+
+    assert design_tokens["colors"] == {"brand/500": "#ff0000"}
+    assert (audit_dir / "audit-report.json").exists()
+
+
+def test_missing_local_snapshot_names_the_fallback_flag(tmp_path):
+    with pytest.raises(FileNotFoundError, match="--allow-stale-fallback"):
+        run_phase1(tmp_path, FIGMA_URL, "r1")
+
+
+def test_failed_component_fetch_is_reported_in_the_audit(figma_server, tmp_path):
+    empty_library_routes(figma_server, FILE_ID)
+    figma_server.json_route(f"/files/{FILE_ID}/component_sets", {"status": 403, "err": "Forbidden"}, status=403)
+    figma_server.json_route(f"/files/{FILE_ID}/variables/local", variables_payload({"brand/500": (1, 0, 0)}))
+    figma_server.json_route(f"/files/{FILE_ID}/variables/published", variables_payload({}))
+
+    _, audit_dir, _, _, _ = run_phase1(
+        tmp_path, FIGMA_URL, "r1", figma_api_token="token-audit-403", figma_api_base=figma_server.api_base
+    )
+
+    report = json.loads((audit_dir / "audit-report.json").read_text())
+    assert "HTTP 403" in report["metadata"]["fetch_errors"]["components"]
+    assert "Fetch Error (components): HTTP 403" in (audit_dir / "audit-report.md").read_text()
+
+
+def test_new_run_reuses_unchanged_audit_outputs_with_its_own_metadata(tmp_path):
+    (tmp_path / "design-tokens.json").write_text(json.dumps({"colors": {"brand/500": "#ff0000"}}))
+    gap_1, audit_1, _, _, _ = run_phase1(tmp_path, FIGMA_URL, "run1")
+    first_report = (audit_1 / "audit-report.json").read_text()
+
+    gap_2, audit_2, _, _, _ = run_phase1(tmp_path, FIGMA_URL, "run2")
+
+    assert (gap_2 / "proposed-tokens.json").stat().st_ino == (gap_1 / "proposed-tokens.json").stat().st_ino
+    assert (audit_1 / "audit-report.json").read_text() == first_report
+    metadata = json.loads((audit_2 / "audit-report.json").read_text())["metadata"]
+    assert metadata["reused_from_run"] == "run1"
+    assert metadata["audit_timestamp"] != json.loads(first_report)["metadata"]["audit_timestamp"]
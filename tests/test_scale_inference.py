@@ -0,0 +1,90 @@
+import pytest
+
+from scale_inference import FULL_RADIUS, base_unit, infer_font_sizes, infer_radius, infer_scales, infer_spacing
+
+
+def steps(result: dict) -> dict:
+    return {name: (entry["to"], entry["step"]) for name, entry in result["mapping"].items()}
+
+
+def test_non_integer_units_are_detected_exactly():
+    spacing = infer_spacing({"xs": 2.5, "sm": 5, "md": 7.5, "lg": 10, "xl": 15})
+
+    assert (spacing["base_unit"], spacing["gcd"], spacing["base_unit_coverage"]) == (2.5, 2.5, 1.0)
+    assert spacing["scale"] == {"1": "2.5px", "2": "5px", "3": "7.5px", "4": "10px", "6": "15px"}
+    # Float noise is rounded away before the GCD is taken.
+    assert base_unit({7.9999999: 1, 16.0: 2})[:2] == (8, 8)
+    # A GCD below the smallest base unit is reported but not proposed.
+    assert base_unit({0.25: 1, 0.75: 1, 1.0: 1})[:2] == (1, 0.25)
+
+
+def test_integer_spacing_keeps_the_largest_covering_unit():
+    spacing = infer_spacing({"a": 4, "b": 8, "c": 16, "d": 24, "e": 32, "f": 3})
+
+    assert (spacing["base_unit"], spacing["gcd"], spacing["base_unit_coverage"]) == (4, 1, 0.833)
+    assert steps(spacing)["f"] == (4.0, "1")
+
+
+def test_negative_spacing_gets_negative_steps():
+    spacing = infer_spacing({"pull": -8, "nudge": -3, "none": 0, "gap": 8, "section": 16, "page": 32})
+
+    assert spacing["base_unit"] == 8
+    assert steps(spacing) == {
+        "pull": (-8.0, "-1"),
+        "nudge": (-8.0, "-1"),
+        "none": (0.0, "0"),
+        "gap": (8.0, "1"),
+        "section": (16.0, "2"),
+        "page": (32.0, "4"),
+    }
+    # Snapping never rounds a non-zero offset to zero, in either direction.
+    assert steps(infer_spacing({"hairline": -0.2, "gap": 8}))["hairline"] == (-8.0, "-1")
+
+
+@pytest.mark.parametrize("pill", [500, 999, 1000, 9999, 99999])
+def test_pill_radii_are_fully_rounded_and_left_out_of_the_unit(pill):
+    radius = infer_radius({"none": 0, "sm": 4, "md": 8, "lg": 12, "pill": pill})
+
+    assert (radius["base_unit"], radius["gcd"]) == (4, 4)
+    assert radius["scale"] == {"none": "0px", "sm": "4px", "md": "8px", "lg": "12px", "full": f"{FULL_RADIUS}px"}
+    assert steps(radius)["pill"] == (FULL_RADIUS, "full")
+
+
+def test_negative_radii_become_none():
+    radius = infer_radius({"broken": -4, "sm": 6, "md": 12})
+
+    assert radius["base_unit"] == 6
+    assert steps(radius) == {"broken": (0.0, "none"), "sm": (6.0, "sm"), "md": (12.0, "md")}
+
+
+def test_non_integer_font_sizes_land_on_the_fitted_scale():
+    sizes = infer_font_sizes({"caption": 12.8, "body": 16, "subtitle": 20, "title": 25, "display": 31.25})
+
+    assert (sizes["base_size"], sizes["ratio_name"], sizes["fit_error"]) == (16.0, "major-third", 0.0)
+    assert steps(sizes) == {
+        "caption": (13, "sm"),
+        "body": (16, "base"),
+        "subtitle": (20, "lg"),
+        "title": (25, "xl"),
+        "display": (31, "2xl"),
+    }
+
+
+def test_tokens_are_classified_by_name():
+    scales = infer_scales(
+        {
+            "numbers": {
+                "spacing/4": 16,
+                "space-negative": -4,
+                "radius/pill": 999,
+                "font/size/body": 16,
+                "font/size/broken": -1,
+                "opacity/disabled": 0.4,
+            },
+            "typography": {"Heading/H1": {"size": 31.25}},
+        }
+    )
+
+    assert (scales["numbers_analyzed"], scales["unclassified"]) == (6, 2)
+    assert (scales["spacing"]["tokens"], scales["radius"]["tokens"], scales["font_size"]["tokens"]) == (2, 1, 2)
+    assert scales["radius"]["scale"] == {"full": f"{FULL_RADIUS}px"}
@@ -0,0 +1,233 @@
+import json
+import re
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+TOKEN_SCHEMA_PATH = Path(".agent") / "skills" / "ds-audit-agent" / "ai-token-schema-simple-v1.json"
+
+# Group separators other tools use (Figma's "/" above all) where the schema wants its own.
+SEPARATORS = "./_\\"
+# What duplicate detection ignores: case, and how words are joined.
+_JOINERS = re.compile(r"[\s/._\\-]+")
+
+
+class TokenSchema(NamedTuple):
+    schema_name: str = "ai_token_schema_simple_v1"
+    categories: tuple = ("color", "font", "spacing", "radius", "border", "shadow", "opacity")
+    separator: str = "."
+    lowercase_required: bool = True
+    no_spaces_allowed: bool = True
+    hard_code_warning_percent: float = 15.0
+
+
+def load_token_schema(base_dir: Path) -> TokenSchema:
+    """The workspace's token schema profile, or the simple flat schema when it has none."""
+    path = base_dir / TOKEN_SCHEMA_PATH
+    if not path.exists():
+        return TokenSchema()
+    with path.open("r") as f:
+        profile = json.load(f)
+    defaults = TokenSchema()
+    naming = profile.get("naming_convention", {})
+    rules = profile.get("rules", {})
+    return TokenSchema(
+        schema_name=profile.get("schema_name", defaults.schema_name),
+        categories=tuple(profile.get("categories", defaults.categories)),
+        separator=naming.get("separator", defaults.separator),
+        lowercase_required=bool(naming.get("lowercase_required", defaults.lowercase_required)),
+        no_spaces_allowed=bool(naming.get("no_spaces_allowed", defaults.no_spaces_allowed)),
+        hard_code_warning_percent=float(
+            rules.get("hard_code_warning_threshold_percent", defaults.hard_code_warning_percent)
+        ),
+    )
+
+
+class NamingViolation(NamedTuple):
+    name: str
+    rule: str  # "whitespace", "uppercase", "separator", "category", "characters" or "structure"
+    detail: str
+    suggestion: Optional[str] = None
+
+
+class CategoryTrie:
+    """Allowed categories by character, so a name's category is found in one scan of its head."""
+
+    _END = ""
+
+    def __init__(self, categories: Iterable[str]):
+        self._root: dict = {}
+        for category in categories:
+            node = self._root
+            for char in category.lower():
+                node = node.setdefault(char, {})
+            node[self._END] = category
+
+    def longest_prefix(self, text: str) -> Optional[str]:
+        """The longest category ``text`` starts with, compared case-insensitively."""
+        node = self._root
+        found = None
+        for char in text.lower():
+            node = node.get(char)
+            if node is None:
+                break
+            found = node.get(self._END, found)
+        return found
+
+
+class NamingRules:
+    """
+    The schema's naming convention compiled once: a category trie and regexes.
+
+    A conforming name is ``category<sep>role[<sep>scale]`` with every segment made
+    of letters, digits and inner hyphens (lowercase when the schema asks for it).
+    """
+
+    def __init__(self, schema: TokenSchema):
+        self.schema = schema
+        self.trie = CategoryTrie(schema.categories)
+        sep = re.escape(schema.separator)
+        segment = r"[a-z0-9]+(?:-[a-z0-9]+)*" if schema.lowercase_required else r"[A-Za-z0-9]+(?:-[A-Za-z0-9]+)*"
+        categories = "|".join(re.escape(category) for category in sorted(schema.categories, key=len, reverse=True))
+        self.segment = re.compile(segment)
+        # One regex for every conforming name, anchored per line so a whole batch is scanned in a single call.
+        self.valid_lines = re.compile(rf"^(?:{categories}){sep}{segment}(?:{sep}{segment})?$", re.M)
+        self.whitespace = re.compile(r"\s")
+        self.uppercase = re.compile(r"[A-Z]")
+        self.bad_characters = re.compile(r"[^A-Za-z0-9\s" + re.escape(SEPARATORS) + r"-]")
+        self.camel_boundary = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+        # Splits a name into its logical segments whatever separators it uses.
+        self.splitter = re.compile(r"[\s" + re.escape(SEPARATORS) + r"]+")
+        self.categories = frozenset(category.lower() for category in schema.categories)
+
+    def conforming(self, names: list) -> set:
+        """The names in ``names`` that break no rule, found in one regex pass over all of them."""
+        return set(self.valid_lines.findall("\n".join(names)))
+
+    def suggest(self, name: str, category_hint: Optional[str]) -> Optional[str]:
+        """A conforming spelling of ``name``, prefixing ``category_hint`` when no category is present."""
+        sep = self.schema.separator
+        words = self.camel_boundary.sub(" ", name)
+        words = self.bad_characters.sub(" ", words)
+        parts = ["-".join(p for p in part.split("-") if p) for part in self.splitter.split(words.lower())]
+        parts = [part for part in parts if part]
+        if not parts:
+            return None
+        if parts[0] not in self.categories:
+            if category_hint is None:
+                return None
+            parts.insert(0, category_hint)
+        # Anything past role and scale is folded into the role.
+        if len(parts) > 3:
+            parts = [parts[0], "-".join(parts[1:-1]), parts[-1]]
+        if len(parts) < 2:
+            return None
+        return sep.join(parts)
+
+    def check(self, name: str, category_hint: Optional[str] = None) -> list:
+        """Every rule ``name`` breaks, each as a NamingViolation."""
+        schema = self.schema
+        sep = schema.separator
+        violations = []
+        suggestion = self.suggest(name, category_hint)
+
+        def violate(rule: str, detail: str):
+            violations.append(NamingViolation(name, rule, detail, suggestion))
+
+        if schema.no_spaces_allowed and self.whitespace.search(name):
+            violate("whitespace", "contains spaces")
+        if schema.lowercase_required and self.uppercase.search(name):
+            violate("uppercase", "contains uppercase letters")
+        foreign = [char for char in SEPARATORS if char != sep and char in name]
+        if foreign:
+            violate("separator", f"uses {' '.join(foreign)} instead of {sep!r}")
+        if self.bad_characters.search(name):
+            violate("characters", "contains characters other than letters, digits and hyphens")
+        segments = self.splitter.split(name.strip())
+        if segments[0].lower() not in self.categories:
+            category = self.trie.longest_prefix(segments[0])
+            if category is not None:
+                violate("separator", f"category {category!r} is not followed by {sep!r}")
+            else:
+                violate("category", f"does not start with one of: {', '.join(schema.categories)}")
+        if not 2 <= len(segments) <= 3:
+            violate("structure", f"has {len(segments)} segment(s); expected category{sep}role[{sep}scale]")
+        elif not violations and not self.valid_lines.fullmatch(name):
+            violate("structure", f"has an empty or malformed segment; expected category{sep}role[{sep}scale]")
+        return violations
+
+
+class NamingReport(NamedTuple):
+    names: int
+    conforming: int
+    violations: list  # NamingViolation records, in the order names were first checked
+    duplicates: list  # groups of names that collide once case and separators are normalized
+
+    @property
+    def match_rate_percent(self) -> float:
+        return round(100.0 * self.conforming / self.names, 1) if self.names else 100.0
+
+    def by_rule(self) -> dict:
+        counts = {}
+        for violation in self.violations:
+            counts[violation.rule] = counts.get(violation.rule, 0) + 1
+        return counts
+
+
+class NamingChecker:
+    """
+    Checks token names against NamingRules and keeps the per-name results.
+
+    ``check`` validates a whole set; ``update`` afterwards re-checks only the names
+    that were added, renamed or removed, so a commit touching a handful of tokens
+    costs a handful of checks however large the library is.
+    """
+
+    def __init__(self, rules: NamingRules):
+        self.rules = rules
+        self._results: dict = {}  # name -> tuple of NamingViolations (empty when conforming)
+        self._normalized: dict = {}  # normalized name -> names that spell it
+
+    def _normalize(self, name: str) -> str:
+        return _JOINERS.sub(self.rules.schema.separator, name.lower())
+
+    def _add(self, names: list, category_hints: dict):
+        conforming = self.rules.conforming(names)
+        for name in names:
+            self._results[name] = () if name in conforming else tuple(self.rules.check(name, category_hints.get(name)))
+            self._normalized.setdefault(self._normalize(name), set()).add(name)
+
+    def _remove(self, name: str):
+        if self._results.pop(name, None) is None:
+            return
+        key = self._normalize(name)
+        spellings = self._normalized.get(key)
+        if spellings is not None:
+            spellings.discard(name)
+            if not spellings:
+                del self._normalized[key]
+
+    def check(self, names: Iterable[str], category_hints: Optional[dict] = None) -> NamingReport:
+        """
+        Validates ``names`` from scratch. ``category_hints`` maps a name to the
+        schema category its token belongs to, used to suggest a conforming name.
+        """
+        self._results = {}
+        self._normalized = {}
+        self._add(list(dict.fromkeys(names)), category_hints or {})
+        return self.report()
+
+    def update(
+        self, changed: Iterable[str] = (), removed: Iterable[str] = (), category_hints: Optional[dict] = None
+    ) -> NamingReport:
+        """Re-checks ``changed`` names (new or renamed) and forgets ``removed`` ones."""
+        for name in removed:
+            self._remove(name)
+        changed = [name for name in dict.fromkeys(changed) if name not in self._results]
+        self._add(changed, category_hints or {})
+        return self.report()
+
+    def report(self) -> NamingReport:
+        violations = [violation for result in self._results.values() for violation in result]
+        conforming = sum(1 for result in self._results.values() if not result)
+        duplicates = [sorted(spellings) for spellings in self._normalized.values() if len(spellings) > 1]
+        return NamingReport(len(self._results), conforming, violations, sorted(duplicates))
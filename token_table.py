@@ -0,0 +1,365 @@
+from array import array
+from collections.abc import Mapping
+from enum import IntEnum
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from color_kernel import (
+    format_hex,
+    hex_to_rgba8,
+    is_hex_color,
+    pack_rgba8,
+    pack_unit_channels,
+    unpack_words,
+    word_to_hex,
+)
+from figma_aliases import AliasResolver, ResolvedVariable, VariableRecord, is_variable_alias
+
+
+class TokenType(IntEnum):
+    """A variable's ``resolvedType``."""
+
+    UNKNOWN = 0
+    COLOR = 1
+    FLOAT = 2
+    STRING = 3
+    BOOLEAN = 4
+
+
+class CellKind(IntEnum):
+    """What one (variable, mode) cell holds; decides how its ``cell_word`` is read."""
+
+    NONE = 0
+    COLOR = 1  # word: packed 0xRRGGBBAA
+    NUMBER = 2  # word: index into ``numbers``
+    STRING = 3  # word: string pool index
+    BOOLEAN = 4  # word: 0 or 1
+    ALIAS = 5  # word: string pool index of the target variable id
+
+
+# Set on a COLOR cell whose hex form spells out the alpha byte (``#rrggbbaa``).
+HEX_ALPHA_FLAG = 0x80
+
+# Figma float colors are quantized this many at a time, bounding the staging memory.
+COLOR_BATCH_SIZE = 1 << 16
+
+
+class StringPool:
+    """Interned strings addressed by index; index 0 stands for ``None``."""
+
+    def __init__(self):
+        self._values: list = [None]
+        self._index: dict = {}
+
+    def intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self._values)
+            self._values.append(value)
+        return index
+
+    def find(self, value: str) -> Optional[int]:
+        return self._index.get(value)
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        return self._values[index]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class Collection(NamedTuple):
+    default_mode: int  # string pool index, 0 when unknown
+    modes: tuple  # (mode id index, mode name index) pairs
+
+
+class TokenTable:
+    """
+    Every mode of every variable in flat, typed columns.
+
+    Variables are rows (``var_*`` columns); their per-mode values are contiguous
+    cells (``cell_*`` columns, ``cell_start``/``cell_count`` per row). Ids, names,
+    modes and strings are interned into one StringPool and colors are packed as
+    uint32 RGBA, so a large library costs a few bytes per cell instead of a dict
+    per value. Phases read it through ``TokenView``s that pick one mode per
+    collection and resolve aliases on demand.
+    """
+
+    def __init__(self):
+        self.strings = StringPool()
+        self.var_id = array("I")
+        self.var_name = array("I")
+        self.var_collection = array("I")
+        self.var_type = array("B")
+        self.cell_start = array("I")
+        self.cell_count = array("H")
+        self.cell_mode = array("I")
+        self.cell_kind = array("B")
+        self.cell_word = array("I")
+        self.numbers = array("d")
+        self.collections: dict = {}
+        self._rows_by_id: dict = {}
+        # Figma float colors are quantized in batches: their cells and raw channels.
+        self._pending_cells = array("I")
+        self._pending_channels = array("d")
+
+    def __len__(self) -> int:
+        return len(self.var_id)
+
+    def add_collection(self, collection_id: str, default_mode_id: Optional[str], modes: Iterable = ()):
+        """``modes`` are ``(mode_id, mode_name)`` pairs, in the collection's order."""
+        intern = self.strings.intern
+        self.collections[intern(collection_id)] = Collection(
+            intern(default_mode_id), tuple((intern(mode_id), intern(name)) for mode_id, name in modes)
+        )
+
+    def add_variable(
+        self,
+        var_id: Optional[str],
+        name: Optional[str],
+        collection_id: Optional[str],
+        resolved_type: str,
+        values_by_mode: dict,
+    ) -> int:
+        """Appends one variable with all of its modes; returns its row."""
+        intern = self.strings.intern
+        row = len(self.var_id)
+        id_index = intern(var_id)
+        if id_index:
+            self._rows_by_id[id_index] = row
+        token_type = TokenType.__members__.get(resolved_type, TokenType.UNKNOWN)
+        self.var_id.append(id_index)
+        self.var_name.append(intern(name))
+        self.var_collection.append(intern(collection_id))
+        self.var_type.append(token_type)
+        self.cell_start.append(len(self.cell_kind))
+        self.cell_count.append(len(values_by_mode))
+        encode = self._encode
+        for mode_id, value in values_by_mode.items():
+            kind, word = encode(value, token_type)
+            self.cell_mode.append(intern(mode_id))
+            self.cell_kind.append(kind)
+            self.cell_word.append(word)
+        if len(self._pending_cells) >= COLOR_BATCH_SIZE:
+            self._flush()
+        return row
+
+    def _encode(self, value, token_type: TokenType) -> tuple:
+        if isinstance(value, dict):
+            if is_variable_alias(value):
+                return CellKind.ALIAS, self.strings.intern(value["id"])
+            if token_type != TokenType.COLOR:
+                return CellKind.NONE, 0
+            get = value.get
+            self._pending_cells.append(len(self.cell_kind))
+            self._pending_channels.extend(
+                (float(get("r", 0)), float(get("g", 0)), float(get("b", 0)), float(get("a", 1.0)))
+            )
+            return (CellKind.COLOR | HEX_ALPHA_FLAG if self._pending_channels[-1] < 1 else CellKind.COLOR), 0
+        if isinstance(value, bool):
+            return CellKind.BOOLEAN, int(value)
+        if isinstance(value, (int, float)):
+            self.numbers.append(value)
+            return CellKind.NUMBER, len(self.numbers) - 1
+        if isinstance(value, str):
+            if is_hex_color(value):
+                return CellKind.COLOR | (HEX_ALPHA_FLAG if len(value) == 9 else 0), pack_rgba8(hex_to_rgba8(value))
+            return CellKind.STRING, self.strings.intern(value)
+        return CellKind.NONE, 0
+
+    def _flush(self):
+        """Packs the colors added since the last flush, all in one kernel call."""
+        if not self._pending_cells:
+            return
+        cell_word = self.cell_word
+        for cell, word in zip(self._pending_cells, pack_unit_channels(self._pending_channels)):
+            cell_word[cell] = word
+        self._pending_cells = array("I")
+        self._pending_channels = array("d")
+
+    def decode_cell(self, cell: int):
+        """The cell as a plain value: hex for colors, an alias dict for aliases."""
+        self._flush()
+        kind = self.cell_kind[cell]
+        word = self.cell_word[cell]
+        base = kind & ~HEX_ALPHA_FLAG
+        if base == CellKind.COLOR:
+            return word_to_hex(word, bool(kind & HEX_ALPHA_FLAG))
+        if base == CellKind.NUMBER:
+            return self.numbers[word]
+        if base == CellKind.STRING:
+            return self.strings[word]
+        if base == CellKind.BOOLEAN:
+            return bool(word)
+        if base == CellKind.ALIAS:
+            return {"type": "VARIABLE_ALIAS", "id": self.strings[word]}
+        return None
+
+    def row_key(self, row: int):
+        """Key of ``row`` in ``variables()``: its id, or a placeholder for id-less variables."""
+        id_index = self.var_id[row]
+        return self.strings[id_index] if id_index else ("#", row)
+
+    def row_of(self, key) -> Optional[int]:
+        if isinstance(key, tuple):
+            return key[1]
+        id_index = self.strings.find(key)
+        return self._rows_by_id.get(id_index) if id_index else None
+
+    def name(self, row: int) -> Optional[str]:
+        return self.strings[self.var_name[row]]
+
+    def collection_id(self, row: int) -> Optional[str]:
+        return self.strings[self.var_collection[row]]
+
+    def values_by_mode(self, row: int) -> dict:
+        start = self.cell_start[row]
+        return {
+            self.strings[self.cell_mode[cell]]: self.decode_cell(cell)
+            for cell in range(start, start + self.cell_count[row])
+        }
+
+    def variables(self) -> Mapping:
+        self._flush()
+        return _TableVariables(self)
+
+    def default_modes(self) -> dict:
+        return {
+            self.strings[collection]: self.strings[info.default_mode]
+            for collection, info in self.collections.items()
+            if info.default_mode
+        }
+
+    def mode_names(self) -> list:
+        """Names of every non-default mode, in first-seen order."""
+        names = {}
+        for info in self.collections.values():
+            for mode, name in info.modes:
+                if mode != info.default_mode and name:
+                    names.setdefault(self.strings[name], None)
+        return list(names)
+
+    def view(self, mode_name: Optional[str] = None) -> "TokenView":
+        """
+        Default modes everywhere, except that collections with a mode called
+        ``mode_name`` use that one (a theme or brand across collections).
+        """
+        self._flush()
+        selection = self.default_modes()
+        if mode_name is not None:
+            for collection, info in self.collections.items():
+                for mode, name in info.modes:
+                    if self.strings[name] == mode_name:
+                        selection[self.strings[collection]] = self.strings[mode]
+        return TokenView(self, selection)
+
+
+class _TableVariables(Mapping):
+    """VariableRecords decoded on demand, so AliasResolver can walk the table directly."""
+
+    def __init__(self, table: TokenTable):
+        self._table = table
+
+    def __getitem__(self, key) -> VariableRecord:
+        row = self._table.row_of(key)
+        if row is None:
+            raise KeyError(key)
+        return VariableRecord(self._table.name(row), self._table.collection_id(row), self._table.values_by_mode(row))
+
+    def __iter__(self) -> Iterator:
+        return (self._table.row_key(row) for row in range(len(self._table)))
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+
+class TokenView:
+    """One mode per collection over a TokenTable, with memoized alias resolution."""
+
+    def __init__(self, table: TokenTable, selection: dict):
+        self.table = table
+        self.selection = selection
+        self.resolver = AliasResolver(table.variables(), selection)
+        intern = table.strings.find
+        self._selected = {intern(c): intern(m) for c, m in selection.items() if intern(c) and intern(m)}
+
+    def cell(self, row: int) -> Optional[int]:
+        """The row's cell in the selected mode: its collection's pick, else its first mode."""
+        table = self.table
+        start = table.cell_start[row]
+        count = table.cell_count[row]
+        if not count:
+            return None
+        mode = self._selected.get(table.var_collection[row])
+        if mode:
+            for cell in range(start, start + count):
+                if table.cell_mode[cell] == mode:
+                    return cell
+        return start
+
+    def resolve(self, row: int) -> ResolvedVariable:
+        return self.resolver.resolve(self.table.row_key(row))
+
+    def colors(self, rows: Iterable[int]) -> tuple:
+        """
+        ``(colors, aliases, unresolved)`` for ``rows``, keyed by variable name.
+
+        ``aliases`` maps aliased colors to their chain of variable names;
+        ``unresolved`` lists aliases that loop or leave the table.
+        """
+        entries = []  # (name, hex or index into the batch below)
+        words = array("I")
+        alpha_flags = []
+        aliases = {}
+        unresolved = {}
+        table = self.table
+        for row in rows:
+            name = table.name(row)
+            cell = self.cell(row)
+            if not name or cell is None:
+                continue
+            kind = table.cell_kind[cell]
+            if kind & ~HEX_ALPHA_FLAG == CellKind.COLOR:
+                entries.append((name, len(words)))
+                words.append(table.cell_word[cell])
+                alpha_flags.append(bool(kind & HEX_ALPHA_FLAG))
+            elif kind == CellKind.ALIAS:
+                resolved = self.resolve(row)
+                if resolved.error:
+                    unresolved[name] = {"error": resolved.error, "chain": list(resolved.chain)}
+                elif is_hex_color(resolved.value):
+                    entries.append((name, resolved.value))
+                    aliases[name] = list(resolved.chain)
+
+        # Direct colors are formatted in one batch; dict order still follows ``rows``.
+        hexes = format_hex(unpack_words(words), alpha_flags)
+        colors = {}
+        for name, value in entries:
+            colors[name] = hexes[value] if isinstance(value, int) else value
+        return colors, aliases, unresolved
+
+    def numbers(self, rows: Iterable[int]) -> tuple:
+        """
+        ``(numbers, aliases)`` for the numeric (FLOAT) variables among ``rows``, keyed by name.
+
+        Aliases are resolved like in ``colors``, which already lists the ones that fail.
+        """
+        numbers = {}
+        aliases = {}
+        table = self.table
+        for row in rows:
+            name = table.name(row)
+            cell = self.cell(row)
+            if not name or cell is None:
+                continue
+            kind = table.cell_kind[cell]
+            if kind == CellKind.NUMBER:
+                numbers[name] = table.numbers[table.cell_word[cell]]
+            elif kind == CellKind.ALIAS and table.var_type[row] in (TokenType.FLOAT, TokenType.UNKNOWN):
+                resolved = self.resolve(row)
+                value = resolved.value
+                if not resolved.error and isinstance(value, (int, float)) and not isinstance(value, bool):
+                    numbers[name] = value
+                    aliases[name] = list(resolved.chain)
+        return numbers, aliases